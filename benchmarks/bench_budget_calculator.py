@@ -0,0 +1,99 @@
+"""Local budget calculator (`runtime.budget`): cost of a scenario sweep in-process.
+
+Times `allocate()` (NumPy, every (headcount, contingency rate) pair at once)
+against the same allocation written as a Python loop over scenarios, for grids
+of increasing size up to the tool's `MAX_SCENARIOS`, and the full function
+tool call the agent makes (argument validation, allocation and the markdown
+table) through `FunctionTool.invoke()`.
+
+For comparison, a hosted code interpreter call is a remote round trip of
+seconds; `--sandbox-ms` only labels that in the output, it is not measured.
+
+    python3 benchmarks/bench_budget_calculator.py
+    python3 benchmarks/bench_budget_calculator.py --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.budget import DEFAULT_COSTS, MAX_SCENARIOS, allocate, budget_calculator_tool  # noqa: E402
+
+GRIDS = ((1, 1), (10, 4), (25, 10), (50, 10))
+
+
+def _loop(headcounts: list[int], rates: list[float]) -> list[dict[str, float]]:
+    c = DEFAULT_COSTS
+    rows = []
+    for h in headcounts:
+        for r in rates:
+            venue = c.venue_fixed + c.venue_per_person * h
+            catering = c.catering_per_person * h
+            staffing = math.ceil(h / c.guests_per_staff) * c.staff_hourly_rate * c.event_hours
+            subtotal = venue + catering + c.av_fixed + staffing
+            total = subtotal * (1 + r)
+            rows.append({"total": round(total, 2), "per_person": round(total / h, 2)})
+    return rows
+
+
+def _best_us(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e6
+
+
+async def _tool_us(headcounts: list[int], rates: list[float], repeat: int) -> float:
+    tool = budget_calculator_tool()
+    arguments = {"headcounts": headcounts, "contingency_rates": rates, "budget": 15000.0}
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await tool.invoke(arguments=arguments)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions per measurement (best is kept).")
+    parser.add_argument("--sandbox-ms", type=float, default=3000.0, help="Code interpreter round trip to print alongside.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    allocate([50], [0.1])  # import NumPy before timing
+    rows = []
+    for n_heads, n_rates in GRIDS:
+        headcounts = list(range(20, 20 + 5 * n_heads, 5))
+        rates = [round(0.05 + 0.01 * i, 2) for i in range(n_rates)]
+        assert n_heads * n_rates <= MAX_SCENARIOS
+        rows.append(
+            {
+                "scenarios": n_heads * n_rates,
+                "numpy_us": round(_best_us(lambda: allocate(headcounts, rates), args.repeat), 1),
+                "python_loop_us": round(_best_us(lambda: _loop(headcounts, rates), args.repeat), 1),
+                "tool_call_us": round(await _tool_us(headcounts, rates, args.repeat), 1),
+            }
+        )
+
+    print(f"Budget allocation, best of {args.repeat} (code interpreter round trip for scale: ~{args.sandbox_ms:g} ms)")
+    print(f"  {'scenarios':>9} {'numpy us':>10} {'loop us':>10} {'tool call us':>13}")
+    for r in rows:
+        print(f"  {r['scenarios']:>9} {r['numpy_us']:>10.1f} {r['python_loop_us']:>10.1f} {r['tool_call_us']:>13.1f}")
+
+    if args.output:
+        result = {"benchmark": "budget_calculator", "repeat": args.repeat, "grids": rows}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
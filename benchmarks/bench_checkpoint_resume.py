@@ -0,0 +1,177 @@
+"""Checkpoint/resume drill: inject failures into the event-planning workflow and resume.
+
+For every executor of the chosen topology, a run on
+`runtime.stub_client.StubChatClient` is made to fail at that executor (the
+stub raises a 429-style error after its first-token delay), then resumed from
+the last checkpoint with `runtime.checkpoints.RunCheckpoints`. The drill checks
+that:
+
+- the resumed run only calls the model for the executors after the last
+  checkpoint (in the parallel topology venue and catering share a superstep,
+  so a failure in one re-runs both);
+- every executor's result is available after the resume (earlier ones from
+  `completed.json`, later ones from the resumed run);
+- the run directory is removed once the run succeeds.
+
+It also reports the model calls saved versus restarting from scratch and the
+cost of checkpointing (wall time with and without a checkpoint store at zero
+model latency). No Azure access:
+
+    python3 benchmarks/bench_checkpoint_resume.py
+    python3 benchmarks/bench_checkpoint_resume.py --topology parallel --latency fixed:200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.checkpoints import RunCheckpoints  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.workflows import CHAIN, JOIN_EXECUTOR_ID, TOPOLOGIES, build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+# Supersteps per topology: a checkpoint is written after each one, so a failure
+# re-runs every agent of the superstep it happened in.
+SUPERSTEPS = {
+    "chain": [[name] for name in AGENTS],
+    "parallel": [["coordinator"], ["venue", "catering"], ["budget_analyst"], ["booking"]],
+}
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+class InjectedFailure(Exception):
+    """Stand-in for a 429 / timeout from the model endpoint."""
+
+
+def _workflow(client: StubChatClient, topology: str):
+    coordinator, venue, catering, budget_analyst, booking = (
+        client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist.") for name in AGENTS
+    )
+    return build_event_planning_workflow(coordinator, [venue, catering], budget_analyst, booking, topology=topology)
+
+
+def _fail_at(target: str, armed: dict[str, bool]):
+    def fault(index, messages, options):
+        if armed["on"] and str(options.get("instructions", "")).startswith(f"{target}:"):
+            armed["on"] = False
+            return InjectedFailure(f"429 Too Many Requests (injected at {target})")
+        return None
+
+    return fault
+
+
+async def _drive(checkpoints: RunCheckpoints, workflow) -> None:
+    events = await checkpoints.run(workflow, PROMPT)
+    async for event in events:
+        if event.type == "executor_completed" and event.executor_id and event.executor_id != JOIN_EXECUTOR_ID:
+            checkpoints.record(event.executor_id, str(event.executor_id))
+
+
+async def _drill(target: str, topology: str, latency: str, root: Path) -> dict:
+    armed = {"on": True}
+    client = StubChatClient(latency=latency, reply_tokens=20, fault=_fail_at(target, armed))
+
+    checkpoints = RunCheckpoints(PROMPT, topology=topology, root=root)
+    checkpoints.reset()
+    try:
+        await _drive(checkpoints, _workflow(client, topology))
+        raise AssertionError(f"run did not fail at {target}")
+    except InjectedFailure:
+        pass
+    calls_first = client.calls
+    finished_before = sorted(checkpoints.completed)
+
+    resumed = RunCheckpoints(PROMPT, topology=topology, root=root)
+    t0 = time.perf_counter()
+    await _drive(resumed, _workflow(client, topology))
+    resume_ms = (time.perf_counter() - t0) * 1000.0
+    calls_resume = client.calls - calls_first
+
+    missing = [name for name in AGENTS if name not in resumed.completed]
+    steps = SUPERSTEPS[topology]
+    failed_step = next(i for i, step in enumerate(steps) if target in step)
+    expected_calls = sum(len(step) for step in steps[failed_step:])
+    # Nothing to resume from when the very first superstep failed.
+    expected_resume = failed_step > 0
+    ok = (resumed.resumed_from is not None) == expected_resume and not missing and calls_resume == expected_calls
+    resumed.finish()
+    return {
+        "fail_at": target,
+        "finished_before_failure": finished_before,
+        "calls_first_attempt": calls_first,
+        "calls_on_resume": calls_resume,
+        "expected_calls_on_resume": expected_calls,
+        "calls_saved_vs_restart": len(AGENTS) - calls_resume,
+        "resume_ms": round(resume_ms, 1),
+        "missing_results": missing,
+        "cleaned_up": not resumed.directory.exists(),
+        "ok": ok and not resumed.directory.exists(),
+    }
+
+
+async def _overhead(topology: str, root: Path, runs: int) -> dict:
+    client = StubChatClient(reply_tokens=20)
+    plain = with_store = 0.0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        async for _ in _workflow(client, topology).run(PROMPT, stream=True):
+            pass
+        plain += time.perf_counter() - t0
+
+        checkpoints = RunCheckpoints(PROMPT, topology=topology, root=root)
+        t0 = time.perf_counter()
+        await _drive(checkpoints, _workflow(client, topology))
+        with_store += time.perf_counter() - t0
+        checkpoints.finish()
+    return {
+        "runs": runs,
+        "plain_ms": round(plain / runs * 1000.0, 2),
+        "checkpointed_ms": round(with_store / runs * 1000.0, 2),
+        "overhead_ms": round((with_store - plain) / runs * 1000.0, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=CHAIN, help="Workflow shape to drill.")
+    parser.add_argument("--latency", default="fixed:20", help="Stub time to first token (runtime.synthetic.LatencyModel spec).")
+    parser.add_argument("--overhead-runs", type=int, default=10, help="Runs used to measure checkpoint overhead.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        drills = [await _drill(target, args.topology, args.latency, root) for target in AGENTS]
+        overhead = await _overhead(args.topology, root, args.overhead_runs)
+
+    print(f"Checkpoint/resume drill ({args.topology}, latency {args.latency})")
+    print(f"  {'fail at':<16} {'done before':>11} {'resume calls':>13} {'saved':>6} {'resume ms':>10}  result")
+    for d in drills:
+        status = "ok" if d["ok"] else (
+            f"FAILED (expected {d['expected_calls_on_resume']} call(s), missing {d['missing_results']})"
+        )
+        print(
+            f"  {d['fail_at']:<16} {len(d['finished_before_failure']):>11} {d['calls_on_resume']:>13} "
+            f"{d['calls_saved_vs_restart']:>6} {d['resume_ms']:>10.1f}  {status}"
+        )
+    print(
+        f"\n  checkpoint overhead: {overhead['overhead_ms']:.2f} ms per run "
+        f"({overhead['plain_ms']:.2f} ms plain vs {overhead['checkpointed_ms']:.2f} ms checkpointed, zero model latency)"
+    )
+
+    if args.output:
+        result = {"benchmark": "checkpoint_resume", "topology": args.topology, "drills": drills, "overhead": overhead}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+    if not all(d["ok"] for d in drills):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""Cold-import benchmark: per-module `.env` bootstrap vs the shared `runtime` loader.
+
+Before `src/runtime/`, every demo and DevUI entity ran its own
+`dotenv_values(_DOTENV_PATH)` fill-only loop at import time. A DevUI process
+that discovers both entities (plus `demo6_devui.py`) therefore parsed `.env`
+several times. This script measures both strategies in fresh interpreters so
+each sample is a true cold start.
+
+Run (from the repository root):
+    python3 benchmarks/bench_cold_import.py
+    python3 benchmarks/bench_cold_import.py --modules 3 --runs 30
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_SRC_DIR = _REPO_ROOT / "src"
+_ENV_EXAMPLE = _REPO_ROOT / ".env.example"
+
+# Both snippets pre-import what every demo already has loaded by the time config
+# is read (agent_framework pulls in dataclasses/pydantic; dotenv was a top-level import),
+# so the timings isolate the bootstrap itself.
+_PRELUDE = """
+import dataclasses, os, sys, time
+import dotenv
+"""
+
+# The exact bootstrap that used to be pasted at the top of each module.
+_LEGACY_SNIPPET = _PRELUDE + """
+t0 = time.perf_counter()
+from dotenv import dotenv_values
+for _ in range({modules}):
+    _dotenv = dotenv_values({dotenv_path!r})
+    for _k, _v in _dotenv.items():
+        if _v is None:
+            continue
+        _existing = os.getenv(_k)
+        if _existing is None or not _existing.strip():
+            os.environ[_k] = _v
+    for _name in ("FOUNDRY_PROJECT_ENDPOINT", "FOUNDRY_MODEL"):
+        if not (os.getenv(_name) or "").strip():
+            raise RuntimeError(_name)
+print(time.perf_counter() - t0)
+"""
+
+_RUNTIME_SNIPPET = _PRELUDE + """
+from pathlib import Path
+t0 = time.perf_counter()
+sys.path.insert(0, {src_dir!r})
+import runtime.config as _rc
+_rc.DOTENV_PATH = Path({dotenv_path!r})
+from runtime import FOUNDRY_REQUIRED, get_config
+for _ in range({modules}):
+    get_config().validate(*FOUNDRY_REQUIRED)
+print(time.perf_counter() - t0)
+"""
+
+
+def _write_synthetic_dotenv(directory: Path) -> Path:
+    """Write a `.env` with every key from `.env.example` set to a dummy value."""
+
+    keys: list[str] = []
+    for line in _ENV_EXAMPLE.read_text(encoding="utf-8").splitlines():
+        line = line.strip().lstrip("#").strip()
+        if "=" in line and line.split("=", 1)[0].isupper():
+            keys.append(line.split("=", 1)[0].strip())
+    path = directory / ".env"
+    path.write_text(
+        "".join(f"{key}=https://bench.invalid/{key.lower()}\n" for key in keys),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _child_env(dotenv_path: Path) -> dict[str, str]:
+    # Remove the keys the `.env` provides so the fill-only loop really fills them.
+    from dotenv import dotenv_values
+
+    env = dict(os.environ)
+    for key in dotenv_values(dotenv_path):
+        env.pop(key, None)
+    return env
+
+
+def _sample(code: str, env: dict[str, str], runs: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]) * 1000.0)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    p90 = sorted(samples)[max(0, int(len(samples) * 0.9) - 1)]
+    print(f"{label:<34} median={median:8.3f} ms  p90={p90:8.3f} ms  min={min(samples):8.3f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--modules",
+        type=int,
+        default=3,
+        help="How many modules bootstrap config in one process (DevUI: 2 entities + demo6).",
+    )
+    parser.add_argument("--runs", type=int, default=20, help="Fresh interpreters per strategy.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dotenv_path = _write_synthetic_dotenv(Path(tmp))
+        env = _child_env(dotenv_path)
+        fmt = {"modules": args.modules, "dotenv_path": str(dotenv_path), "src_dir": str(_SRC_DIR)}
+
+        print("=" * 80)
+        print(f"Cold-import config bootstrap ({args.modules} modules/process, {args.runs} runs)")
+        print("=" * 80)
+        legacy = _report("per-module dotenv_values loop", _sample(_LEGACY_SNIPPET.format(**fmt), env, args.runs))
+        shared = _report("runtime.get_config() (shared)", _sample(_RUNTIME_SNIPPET.format(**fmt), env, args.runs))
+        print(f"\nspeedup: {legacy / shared:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
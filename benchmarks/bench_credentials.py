@@ -0,0 +1,291 @@
+"""Shared Azure CLI credential (`runtime.credentials`): `az` calls and token latency with a fake CLI.
+
+Puts a fake `az` on PATH (it sleeps `--az-ms`, counts its invocations and
+prints a token the way `az account get-access-token --output json` does) and
+drives the real `azure.identity` credentials behind `SharedAzureCliCredential`
+and `SharedSyncAzureCliCredential`. For each of them it checks that:
+
+- `--callers` concurrent `get_token` calls on a cold cache start one `az`;
+- a cached token that expired is refreshed by exactly one `az` call, however
+  many callers ask at once; a stale one (inside the refresh window) is served
+  from cache while one background call refreshes it;
+- when `az` fails (not logged in), every concurrent caller gets
+  `CredentialUnavailableError` from a single call, and a failing background
+  refresh keeps serving the cached token.
+
+A failed check exits non-zero. It also reports cold-start and cached
+`get_token` latency.
+
+    python3 benchmarks/bench_credentials.py
+    python3 benchmarks/bench_credentials.py --callers 50 --az-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from azure.core.exceptions import ClientAuthenticationError  # noqa: E402
+
+from runtime.credentials import (  # noqa: E402
+    DEFAULT_REFRESH_WINDOW_SECONDS,
+    SharedAzureCliCredential,
+    SharedSyncAzureCliCredential,
+    TokenCache,
+    _CachedToken,
+    _key,
+)
+
+SCOPE = "https://ai.azure.com/.default"
+
+# Appends a line per call to FAKE_AZ_CALLS, then answers like `az account get-access-token`.
+FAKE_AZ = """#!{python}
+import json, os, sys, time
+with open(os.environ["FAKE_AZ_CALLS"], "a") as calls:
+    calls.write("call\\n")
+time.sleep(float(os.environ.get("FAKE_AZ_MS", "0")) / 1000.0)
+if os.environ.get("FAKE_AZ_FAIL"):
+    sys.stderr.write("ERROR: Please run 'az login' to setup account.\\n")
+    sys.exit(1)
+expires = int(time.time()) + 3600
+print(json.dumps({{"accessToken": "token-%d" % time.time_ns(), "expires_on": expires, "tokenType": "Bearer"}}))
+"""
+
+
+class FakeAz:
+    """A fake `az` in a temporary directory at the front of PATH."""
+
+    def __init__(self, directory: Path, az_ms: float) -> None:
+        self.calls_file = directory / "calls"
+        script = directory / "az"
+        script.write_text(FAKE_AZ.format(python=sys.executable), encoding="utf-8")
+        script.chmod(0o755)
+        os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ['PATH']}"
+        os.environ["FAKE_AZ_CALLS"] = str(self.calls_file)
+        os.environ["FAKE_AZ_MS"] = str(az_ms)
+        self.failing(False)
+
+    @property
+    def calls(self) -> int:
+        try:
+            return len(self.calls_file.read_text(encoding="utf-8").splitlines())
+        except FileNotFoundError:
+            return 0
+
+    def reset(self) -> None:
+        self.calls_file.unlink(missing_ok=True)
+
+    def failing(self, fail: bool) -> None:
+        if fail:
+            os.environ["FAKE_AZ_FAIL"] = "1"
+        else:
+            os.environ.pop("FAKE_AZ_FAIL", None)
+
+
+def _check(failures: list[str], label: str, ok: bool, detail: str) -> None:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}: {detail}")
+    if not ok:
+        failures.append(label)
+
+
+def _seed(cache: TokenCache, seconds_left: float) -> None:
+    cache.put(_key((SCOPE,), None), _CachedToken("cached", int(time.time() + seconds_left)))
+
+
+def _ms(samples: list[float]) -> float:
+    return round(statistics.median(samples) * 1000.0, 3)
+
+
+async def _wait_for_calls(az: FakeAz, expected: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while az.calls < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+
+
+async def _check_async(az: FakeAz, callers: int, failures: list[str]) -> dict[str, float]:
+    print("SharedAzureCliCredential (async)")
+
+    az.reset()
+    cache = TokenCache()
+    credential = SharedAzureCliCredential(cache=cache)
+    async with credential:
+        t0 = time.perf_counter()
+        tokens = await asyncio.gather(*(credential.get_token(SCOPE) for _ in range(callers)))
+        cold = time.perf_counter() - t0
+        _check(failures, "cold start", az.calls == 1 and len({t.token for t in tokens}) == 1,
+               f"{callers} concurrent callers, {az.calls} az call(s)")
+        hits = []
+        for _ in range(1000):
+            t0 = time.perf_counter()
+            await credential.get_token(SCOPE)
+            hits.append(time.perf_counter() - t0)
+
+    az.reset()
+    cache = TokenCache()
+    _seed(cache, 10)
+    async with SharedAzureCliCredential(cache=cache) as credential:
+        tokens = await asyncio.gather(*(credential.get_token(SCOPE) for _ in range(callers)))
+        _check(failures, "expired token", az.calls == 1 and all(t.token != "cached" for t in tokens),
+               f"{az.calls} az call(s), callers got the new token")
+
+    az.reset()
+    cache = TokenCache()
+    _seed(cache, DEFAULT_REFRESH_WINDOW_SECONDS / 2)
+    async with SharedAzureCliCredential(cache=cache) as credential:
+        tokens = await asyncio.gather(*(credential.get_token(SCOPE) for _ in range(callers)))
+        served = all(t.token == "cached" for t in tokens)
+        deadline = time.monotonic() + 10.0
+        while cache.get(_key((SCOPE,), None)).token == "cached" and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        refreshed = cache.get(_key((SCOPE,), None))
+        _check(failures, "stale token", served and az.calls == 1 and refreshed.token != "cached",
+               f"served from cache, {az.calls} background az call(s)")
+
+    az.reset()
+    az.failing(True)
+    try:
+        async with SharedAzureCliCredential(cache=TokenCache()) as credential:
+            results = await asyncio.gather(*(credential.get_token(SCOPE) for _ in range(callers)), return_exceptions=True)
+            raised = all(isinstance(r, ClientAuthenticationError) for r in results)
+            _check(failures, "az fails, cold", raised and az.calls == 1,
+                   f"{sum(isinstance(r, ClientAuthenticationError) for r in results)}/{callers} callers raised "
+                   f"{type(results[0]).__name__}, {az.calls} az call(s)")
+
+        az.reset()
+        cache = TokenCache()
+        _seed(cache, DEFAULT_REFRESH_WINDOW_SECONDS / 2)
+        async with SharedAzureCliCredential(cache=cache) as credential:
+            first = await credential.get_token(SCOPE)
+            await _wait_for_calls(az, 1)
+            while credential._inflight:  # the failed background refresh
+                await asyncio.sleep(0.02)
+            second = await credential.get_token(SCOPE)
+            _check(failures, "az fails, stale", first.token == second.token == "cached" and az.calls == 1,
+                   f"cached token kept after {az.calls} failed background call(s)")
+    finally:
+        az.failing(False)
+    return {"cold_ms": round(cold * 1000.0, 1), "cached_p50_ms": _ms(hits)}
+
+
+def _concurrently(callers: int, fn) -> list:
+    results: list = [None] * callers
+    barrier = threading.Barrier(callers)
+
+    def run(i: int) -> None:
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as ex:  # noqa: BLE001 - reported by the check
+            results[i] = ex
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _check_sync(az: FakeAz, callers: int, failures: list[str]) -> dict[str, float]:
+    print("SharedSyncAzureCliCredential (threads)")
+
+    az.reset()
+    credential = SharedSyncAzureCliCredential(cache=TokenCache())
+    t0 = time.perf_counter()
+    tokens = _concurrently(callers, lambda: credential.get_token(SCOPE))
+    cold = time.perf_counter() - t0
+    _check(failures, "cold start", az.calls == 1 and len({getattr(t, "token", t) for t in tokens}) == 1,
+           f"{callers} concurrent callers, {az.calls} az call(s)")
+    hits = []
+    for _ in range(1000):
+        t0 = time.perf_counter()
+        credential.get_token(SCOPE)
+        hits.append(time.perf_counter() - t0)
+    credential.close()
+
+    az.reset()
+    cache = TokenCache()
+    _seed(cache, 10)
+    credential = SharedSyncAzureCliCredential(cache=cache)
+    tokens = _concurrently(callers, lambda: credential.get_token(SCOPE))
+    _check(failures, "expired token", az.calls == 1 and all(getattr(t, "token", "cached") != "cached" for t in tokens),
+           f"{az.calls} az call(s), callers got the new token")
+
+    az.reset()
+    cache = TokenCache()
+    _seed(cache, DEFAULT_REFRESH_WINDOW_SECONDS / 2)
+    credential = SharedSyncAzureCliCredential(cache=cache)
+    tokens = _concurrently(callers, lambda: credential.get_token(SCOPE))
+    served = all(getattr(t, "token", None) == "cached" for t in tokens)
+    deadline = time.monotonic() + 10.0
+    while cache.get(_key((SCOPE,), None)).token == "cached" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    _check(failures, "stale token", served and az.calls == 1 and cache.get(_key((SCOPE,), None)).token != "cached",
+           f"served from cache, {az.calls} background az call(s)")
+
+    az.reset()
+    az.failing(True)
+    try:
+        credential = SharedSyncAzureCliCredential(cache=TokenCache())
+        results = _concurrently(callers, lambda: credential.get_token(SCOPE))
+        raised = sum(isinstance(r, ClientAuthenticationError) for r in results)
+        _check(failures, "az fails, cold", raised == callers and az.calls == 1,
+               f"{raised}/{callers} callers raised {type(results[0]).__name__}, {az.calls} az call(s)")
+
+        az.reset()
+        cache = TokenCache()
+        _seed(cache, DEFAULT_REFRESH_WINDOW_SECONDS / 2)
+        credential = SharedSyncAzureCliCredential(cache=cache)
+        first = credential.get_token(SCOPE)
+        deadline = time.monotonic() + 10.0
+        while (az.calls < 1 or credential._background) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        second = credential.get_token(SCOPE)
+        _check(failures, "az fails, stale", first.token == second.token == "cached" and az.calls == 1,
+               f"cached token kept after {az.calls} failed background call(s)")
+    finally:
+        az.failing(False)
+    return {"cold_ms": round(cold * 1000.0, 1), "cached_p50_ms": _ms(hits)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=20, help="Concurrent get_token callers per check.")
+    parser.add_argument("--az-ms", type=float, default=300.0, help="How long the fake `az` takes per call.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    # azure.identity logs every failed `az` call; the checks report them instead.
+    logging.getLogger("azure.identity").setLevel(logging.ERROR + 1)
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as directory:
+        az = FakeAz(Path(directory), args.az_ms)
+        rows = {
+            "async": await _check_async(az, args.callers, failures),
+            "sync": await asyncio.to_thread(_check_sync, az, args.callers, failures),
+        }
+
+    print(f"\nget_token latency ({args.callers} callers, fake az {args.az_ms:g} ms)")
+    print(f"  {'credential':<10} {'cold ms':>9} {'cached p50 ms':>14}")
+    for name, r in rows.items():
+        print(f"  {name:<10} {r['cold_ms']:>9.1f} {r['cached_p50_ms']:>14.3f}")
+
+    if args.output:
+        result = {"benchmark": "credentials", "callers": args.callers, "az_ms": args.az_ms, "credentials": rows}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+    if failures:
+        raise SystemExit(f"Failed checks: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+"""Endpoint DNS pre-check (`runtime.dns`): lookups, caching and coalescing with a stub resolver.
+
+Backs `EndpointResolver` with a stub `getaddrinfo` that takes `--lookup-ms`,
+counts its calls and fails for one host, and with a manual clock so the TTLs
+can be stepped over without waiting. It checks that:
+
+- `--callers` concurrent lookups of one host make one `getaddrinfo` call;
+- lookups within the TTL are answered from cache, and the first one after it
+  queries again;
+- a failure reaches every concurrent caller from one call, is cached for the
+  negative TTL (callers keep getting `OSError` without a new call), and is
+  retried once the negative TTL is over;
+- `resolve_sync` and `check_endpoint_dns` share the same cache.
+
+A failed check exits non-zero. It also reports cold and cached lookup latency.
+
+    python3 benchmarks/bench_dns.py
+    python3 benchmarks/bench_dns.py --callers 100 --lookup-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.dns import EndpointResolver, check_endpoint_dns, get_resolver, set_resolver  # noqa: E402
+
+HOST = "example-project.services.ai.azure.com"
+MISSING = "missing-project.services.ai.azure.com"
+ADDRESS = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("203.0.113.10", 443))]
+TTL = 300.0
+NEGATIVE_TTL = 30.0
+
+
+class Clock:
+    """Manual monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class StubResolver:
+    """`getaddrinfo` stand-in: answers `HOST`, fails `MISSING`, counts calls per host."""
+
+    def __init__(self, lookup_ms: float) -> None:
+        self.delay = lookup_ms / 1000.0
+        self.calls: dict[str, int] = {}
+
+    def _answer(self, host: str) -> list:
+        self.calls[host] = self.calls.get(host, 0) + 1
+        if host == MISSING:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return list(ADDRESS)
+
+    async def __call__(self, host: str, port: int) -> list:
+        await asyncio.sleep(self.delay)
+        return self._answer(host)
+
+    def sync(self, host: str, port: int) -> list:
+        time.sleep(self.delay)
+        return self._answer(host)
+
+
+def _check(failures: list[str], label: str, ok: bool, detail: str) -> None:
+    print(f"  [{'ok' if ok else 'FAIL'}] {label}: {detail}")
+    if not ok:
+        failures.append(label)
+
+
+async def _lookups(resolver: EndpointResolver, host: str, callers: int) -> list:
+    return await asyncio.gather(*(resolver.resolve(host) for _ in range(callers)), return_exceptions=True)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=20, help="Concurrent lookups per check.")
+    parser.add_argument("--lookup-ms", type=float, default=50.0, help="How long the stub getaddrinfo takes.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    clock = Clock()
+    stub = StubResolver(args.lookup_ms)
+    resolver = EndpointResolver(
+        ttl=TTL, negative_ttl=NEGATIVE_TTL, getaddrinfo=stub, getaddrinfo_sync=stub.sync, clock=clock
+    )
+    failures: list[str] = []
+    print(f"EndpointResolver (ttl {TTL:g}s, negative ttl {NEGATIVE_TTL:g}s, stub lookup {args.lookup_ms:g} ms)")
+
+    t0 = time.perf_counter()
+    results = await _lookups(resolver, HOST, args.callers)
+    cold_ms = (time.perf_counter() - t0) * 1000.0
+    _check(failures, "coalesced", stub.calls.get(HOST) == 1 and all(r == ADDRESS for r in results),
+           f"{args.callers} concurrent lookups, {stub.calls.get(HOST)} getaddrinfo call(s)")
+
+    clock.advance(TTL - 1)
+    hits = []
+    for _ in range(1000):
+        t0 = time.perf_counter()
+        await resolver.resolve(HOST)
+        hits.append(time.perf_counter() - t0)
+    _check(failures, "cached within ttl", stub.calls[HOST] == 1, f"1000 lookups, {stub.calls[HOST] - 1} new call(s)")
+
+    clock.advance(1)
+    await _lookups(resolver, HOST, args.callers)
+    _check(failures, "expired after ttl", stub.calls[HOST] == 2,
+           f"{args.callers} concurrent lookups, {stub.calls[HOST] - 1} new call(s)")
+
+    results = await _lookups(resolver, MISSING, args.callers)
+    raised = sum(isinstance(r, OSError) for r in results)
+    _check(failures, "failure coalesced", raised == args.callers and stub.calls.get(MISSING) == 1,
+           f"{raised}/{args.callers} lookups raised {type(results[0]).__name__}, {stub.calls.get(MISSING)} call(s)")
+
+    clock.advance(NEGATIVE_TTL - 1)
+    results = await _lookups(resolver, MISSING, args.callers)
+    raised = sum(isinstance(r, OSError) for r in results)
+    _check(failures, "failure cached", raised == args.callers and stub.calls[MISSING] == 1,
+           f"{raised}/{args.callers} raised within the negative ttl, {stub.calls[MISSING] - 1} new call(s)")
+
+    clock.advance(1)
+    await _lookups(resolver, MISSING, args.callers)
+    _check(failures, "failure retried", stub.calls[MISSING] == 2,
+           f"after the negative ttl, {stub.calls[MISSING] - 1} new call(s)")
+
+    calls = sum(stub.calls.values())
+    await asyncio.to_thread(resolver.resolve_sync, HOST)
+    previous = get_resolver()
+    set_resolver(resolver)
+    try:
+        await check_endpoint_dns(f"https://{HOST}/api/projects/demo")
+        try:
+            await check_endpoint_dns(f"https://{MISSING}/api/projects/demo")
+            missing_error = None
+        except RuntimeError as ex:
+            missing_error = ex
+    finally:
+        set_resolver(previous)
+    _check(failures, "shared cache", sum(stub.calls.values()) == calls and missing_error is not None,
+           f"resolve_sync and check_endpoint_dns made {sum(stub.calls.values()) - calls} call(s); "
+           f"missing host raised {type(missing_error).__name__}")
+
+    cached_us = round(statistics.median(hits) * 1e6, 2)
+    print(f"\n  cold lookup ({args.callers} callers): {cold_ms:.1f} ms; cached lookup p50: {cached_us:.2f} us")
+    print(f"  resolver: {resolver.hits} hit(s), {resolver.misses} miss(es)")
+
+    if args.output:
+        result = {
+            "benchmark": "dns",
+            "callers": args.callers,
+            "lookup_ms": args.lookup_ms,
+            "cold_ms": round(cold_ms, 1),
+            "cached_p50_us": cached_us,
+            "getaddrinfo_calls": stub.calls,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+    if failures:
+        raise SystemExit(f"Failed checks: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
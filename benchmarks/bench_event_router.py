@@ -0,0 +1,206 @@
+"""Per-event overhead of `runtime.event_router.EventRouter` at high token rates.
+
+Two parts, neither needs Azure or a workflow:
+
+1. Dispatch cost. A synthetic stream of `--events` events (token-level
+   `output` events from a few executors with a control event every
+   `--control-every`) goes through Demo 5's old `if event.type == ...` chain
+   and through the router: plain dispatch, size-coalesced batches, and the
+   bounded-queue pump. Every mode reads the same async iterator, as a
+   workflow stream is read. Reports ns per event and sink calls.
+2. Slow sink. `--tokens` tokens arrive at `--rate` tokens/s while every sink
+   call costs `--sink-ms` (a console or socket write). Reports wall time, sink
+   calls, the deepest queue, the time the producer was held back, and drops
+   with `drop_when_full`.
+
+    python3 benchmarks/bench_event_router.py
+    python3 benchmarks/bench_event_router.py --events 500000 --rate 20000 --sink-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.event_router import EventRouter  # noqa: E402
+
+
+class Token(NamedTuple):
+    text: str
+
+
+class Event(NamedTuple):
+    type: str
+    executor_id: str | None
+    data: object
+
+
+CONTROL = ("executor_invoked", "executor_completed", "superstep_started", "superstep_completed")
+
+
+def _stream(count: int, control_every: int) -> list[Event]:
+    events = []
+    for i in range(count):
+        executor = f"agent_{(i // 500) % 5}"
+        if control_every and i % control_every == 0:
+            events.append(Event(CONTROL[(i // control_every) % len(CONTROL)], executor, None))
+        else:
+            events.append(Event("output", executor, Token("tok ")))
+    return events
+
+
+async def _aiter(events: list[Event]):
+    for event in events:
+        yield event
+
+
+async def _if_chain(events: list[Event], sink) -> None:
+    # The shape of Demo 5's loop before the router.
+    completed = {}
+    last = None
+    async for event in _aiter(events):
+        if event.type == "data" and isinstance(event.data, str):
+            sink(event)
+        elif event.type == "data":
+            if event.executor_id != last:
+                last = event.executor_id
+        elif event.type == "executor_bypassed":
+            sink(event)
+        elif event.type == "executor_completed":
+            completed[event.executor_id] = event.data
+        elif event.type == "output":
+            sink(event)
+
+
+def _router(sink, **kwargs) -> EventRouter:
+    router = EventRouter(**kwargs)
+    completed = {}
+    router.on("data", sink, payload=str)
+    router.on("executor_bypassed", sink)
+    router.on("executor_completed", lambda event: completed.__setitem__(event.executor_id, event.data))
+    router.on("output", sink)
+    return router
+
+
+async def _dispatch_cost(events: list[Event], batch: int, repeat: int) -> list[dict]:
+    rows = []
+
+    async def case(label: str, run) -> None:
+        best = float("inf")
+        calls = 0
+        for _ in range(repeat):
+            counter = [0]
+
+            def sink(item, counter=counter) -> None:
+                counter[0] += 1
+
+            t0 = time.perf_counter()
+            await run(sink)
+            best = min(best, time.perf_counter() - t0)
+            calls = counter[0]
+        rows.append({"mode": label, "ns_per_event": round(best / len(events) * 1e9, 1), "sink_calls": calls})
+
+    await case("if/elif chain", lambda sink: _if_chain(events, sink))
+    await case("router", lambda sink: _router(sink).run(_aiter(events)))
+    await case(
+        f"router, batch {batch}",
+        lambda sink: _router(sink, coalesce=("output",), max_batch=batch).run(_aiter(events)),
+    )
+    await case(
+        f"router, batch {batch}, queue",
+        lambda sink: _router(sink, coalesce=("output",), max_batch=batch, queue_size=256).run(_aiter(events)),
+    )
+    return rows
+
+
+async def _paced(tokens: int, rate: float):
+    # Bursts of tokens every millisecond at `rate` tokens/s, like a fast model stream.
+    per_ms = max(1, int(rate / 1000))
+    start = time.perf_counter()
+    for i in range(tokens):
+        if i and i % per_ms == 0:
+            delay = start + i / rate - time.perf_counter()
+            await asyncio.sleep(max(0.0, delay))
+        yield Event("output", "booking", Token("tok "))
+    yield Event("executor_completed", "booking", None)
+
+
+async def _slow_sink(tokens: int, rate: float, sink_ms: float, window_ms: float, batch: int) -> list[dict]:
+    rows = []
+
+    async def case(label: str, **kwargs) -> None:
+        calls = [0]
+
+        async def sink(item) -> None:
+            calls[0] += 1
+            await asyncio.sleep(sink_ms / 1000.0)
+
+        router = EventRouter(**kwargs)
+        router.on("output", sink)
+        router.on("executor_completed", sink)
+        t0 = time.perf_counter()
+        stats = await router.run(_paced(tokens, rate))
+        rows.append(
+            {
+                "mode": label,
+                "wall_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+                "sink_calls": calls[0],
+                **stats.snapshot(),
+            }
+        )
+
+    await case("per event", queue_size=256)
+    await case(f"window {window_ms:g} ms", coalesce=("output",), window_ms=window_ms, max_batch=batch, queue_size=256)
+    await case("per event, drop when full", queue_size=256, coalesce=("output",), max_batch=1, drop_when_full=True)
+    return rows
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000, help="Synthetic events for the dispatch-cost part.")
+    parser.add_argument("--control-every", type=int, default=100, help="One control event per this many events.")
+    parser.add_argument("--batch", type=int, default=64, help="Coalesced batch size.")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repeats for the dispatch-cost part.")
+    parser.add_argument("--tokens", type=int, default=3000, help="Tokens streamed in the slow-sink part.")
+    parser.add_argument("--rate", type=float, default=10_000, help="Token rate (tokens/s) in the slow-sink part.")
+    parser.add_argument("--sink-ms", type=float, default=1.0, help="Cost of one sink call (ms).")
+    parser.add_argument("--window-ms", type=float, default=50.0, help="Coalescing window in the slow-sink part.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    events = _stream(args.events, args.control_every)
+    cost = await _dispatch_cost(events, args.batch, args.repeat)
+    print(f"Dispatch cost ({args.events} events, one control event per {args.control_every}, best of {args.repeat})")
+    print(f"  {'mode':<28} {'ns/event':>9} {'sink calls':>11}")
+    for r in cost:
+        print(f"  {r['mode']:<28} {r['ns_per_event']:>9.1f} {r['sink_calls']:>11}")
+
+    slow = await _slow_sink(args.tokens, args.rate, args.sink_ms, args.window_ms, args.batch)
+    print(f"\nSlow sink ({args.tokens} tokens at {args.rate:g} tokens/s, {args.sink_ms:g} ms per sink call, queue 256)")
+    print(f"  {'mode':<28} {'wall ms':>9} {'sink calls':>11} {'max depth':>10} {'blocked ms':>11} {'dropped':>8}")
+    for r in slow:
+        print(
+            f"  {r['mode']:<28} {r['wall_ms']:>9.1f} {r['sink_calls']:>11} {r['max_queue_depth']:>10} "
+            f"{r['blocked_ms']:>11.1f} {r['dropped']:>8}"
+        )
+    stream_ms = args.tokens / args.rate * 1000.0
+    print(f"\n  the stream itself takes ~{stream_ms:.0f} ms; anything above that is the sink holding the workflow back")
+
+    if args.output:
+        result = {
+            "benchmark": "event_router",
+            "events": args.events,
+            "dispatch": cost,
+            "slow_sink": {"tokens": args.tokens, "rate": args.rate, "sink_ms": args.sink_ms, "modes": slow},
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
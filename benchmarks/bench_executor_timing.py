@@ -0,0 +1,127 @@
+"""Per-executor timing (`runtime.executor_timing`): telling slow tools from slow models.
+
+Runs Demo 5's workflow on `runtime.stub_client.StubChatClient` with every
+agent streaming (`stream_agents=True`). Each agent gets its own stub client:
+
+- `venue` waits `--tool-ms` before its first token, as a hosted search or MCP
+  call would, then streams at the normal rate;
+- `budget_analyst` starts as fast as the others but streams at
+  `--slow-tokens-per-sec`, as a slow model would;
+- the rest use `--latency` and `--tokens-per-sec`.
+
+The timing table should show venue's delay in TTFT and budget_analyst's in
+the streaming duration. Also reports what `RunTimer.observe()` adds per event.
+
+    python3 benchmarks/bench_executor_timing.py
+    python3 benchmarks/bench_executor_timing.py --runs 10 --topology parallel --tool-ms 1500
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.executor_timing import RunTimer, TimingStats  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.workflows import build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+def _agents(args: argparse.Namespace) -> list:
+    agents = []
+    for name in AGENTS:
+        latency = f"fixed:{args.tool_ms}" if name == "venue" else args.latency
+        rate = args.slow_tokens_per_sec if name == "budget_analyst" else args.tokens_per_sec
+        client = StubChatClient(latency=latency, tokens_per_sec=rate, reply_tokens=args.reply_tokens)
+        agents.append(client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist."))
+    return agents
+
+
+async def _run(args: argparse.Namespace, stats: TimingStats | None) -> tuple[float, int]:
+    agents = _agents(args)
+    workflow = build_event_planning_workflow(
+        agents[0], agents[1:3], agents[3], agents[4], topology=args.topology, stream_agents=True
+    )
+    events = workflow.run(PROMPT, stream=True)
+    if stats is not None:
+        events = RunTimer(stats, executors=AGENTS).observe(events)
+    count = 0
+    t0 = time.perf_counter()
+    async for _ in events:
+        count += 1
+    return (time.perf_counter() - t0) * 1000.0, count
+
+
+class _Event:
+    __slots__ = ("type", "executor_id", "data")
+
+    def __init__(self, type: str, executor_id: str, data: object) -> None:
+        self.type = type
+        self.executor_id = executor_id
+        self.data = data
+
+
+async def _overhead(count: int) -> float:
+    # ns per event RunTimer adds on top of iterating the same async generator.
+    events = [_Event("executor_invoked", "venue", None)]
+    events += [_Event("output", "venue", "tok ") for _ in range(count)]
+    events.append(_Event("executor_completed", "venue", ["done"]))
+
+    async def stream():
+        for event in events:
+            yield event
+
+    async def drain(iterable) -> float:
+        t0 = time.perf_counter()
+        async for _ in iterable:
+            pass
+        return time.perf_counter() - t0
+
+    plain = min([await drain(stream()) for _ in range(3)])
+    timed = min([await drain(RunTimer(TimingStats(), executors=AGENTS).observe(stream())) for _ in range(3)])
+    return max(0.0, timed - plain) / len(events) * 1e9
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Workflow runs.")
+    parser.add_argument("--topology", choices=("chain", "parallel"), default="chain")
+    parser.add_argument("--latency", default="lognormal:150:0.2", help="Stub time to first token (runtime.synthetic.LatencyModel spec).")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0, help="Stub streaming rate.")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Tokens per reply.")
+    parser.add_argument("--tool-ms", type=float, default=800.0, help="venue's delay before its first token (a slow tool).")
+    parser.add_argument("--slow-tokens-per-sec", type=float, default=60.0, help="budget_analyst's streaming rate (a slow model).")
+    parser.add_argument("--events", type=int, default=100_000, help="Synthetic events for the overhead measurement.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    stats = TimingStats()
+    walls = []
+    for _ in range(args.runs):
+        wall, events = await _run(args, stats)
+        walls.append(wall)
+    print(f"{args.runs} {args.topology} runs, {events} events per run, p50 wall {sorted(walls)[len(walls) // 2]:.0f} ms\n")
+    print(stats.format_table())
+    overhead = await _overhead(args.events)
+    print(f"\nRunTimer overhead: {overhead:.0f} ns per event")
+
+    if args.output:
+        result = {
+            "benchmark": "executor_timing",
+            "topology": args.topology,
+            "runs": args.runs,
+            "timing": stats.snapshot(),
+            "overhead_ns_per_event": round(overhead, 1),
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+"""HTTP pool benchmark: per-client connection pools vs the shared `PooledTransport`.
+
+A local HTTPS server (self-signed certificate) stands in for the Foundry
+`/openai/v1` endpoint and answers Chat Completions requests after a fixed
+delay. `--agents` agents each send `--requests` calls through the real
+`AsyncOpenAI` client, all agents at once (or one after another with
+`--chain`, like the Demo 5 workflow), in three setups:
+
+- fresh       a new client (and TLS connection) per call, like code that opens
+              a fresh session for every request;
+- per-client  one client per agent, like each demo / agent building its own
+              `FoundryChatClient`;
+- pooled      every agent shares one `PooledTransport`, like `runtime.get_project_client()`.
+
+The server counts accepted TLS connections, so the handshakes saved are
+reported next to wall time and per-call latency. No Azure access is needed:
+    python3 benchmarks/bench_http_pool.py --agents 5 --requests 20
+"""
+
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import json
+import ssl
+import statistics
+import sys
+import tempfile
+import time
+import weakref
+from pathlib import Path
+
+import httpx
+from aiohttp import web
+from openai import AsyncOpenAI
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime import PooledTransport, PoolSettings  # noqa: E402
+
+
+def _write_self_signed_cert(directory: Path) -> tuple[Path, Path]:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.DNSName("localhost"), x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_path, key_path
+
+
+class _StandInServer:
+    """Minimal HTTPS `/openai/v1/chat/completions` endpoint that counts connections."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000.0
+        self.connections = 0
+        self._seen: weakref.WeakSet = weakref.WeakSet()
+        self._runner: web.AppRunner | None = None
+        self.port = 0
+
+    async def _chat(self, request: web.Request) -> web.Response:
+        transport = request.transport
+        if transport is not None and transport not in self._seen:
+            self._seen.add(transport)
+            self.connections += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        return web.json_response(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "bench-model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "ok"},
+                    }
+                ],
+                "usage": {"prompt_tokens": 8, "completion_tokens": 1, "total_tokens": 9},
+            }
+        )
+
+    async def start(self, cert: Path, key: Path) -> None:
+        app = web.Application()
+        app.router.add_post("/openai/v1/chat/completions", self._chat)
+        ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ctx.load_cert_chain(cert, key)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0, ssl_context=ctx)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def _call(client: AsyncOpenAI, latencies: list[float]) -> None:
+    start = time.perf_counter()
+    await client.chat.completions.create(
+        model="bench-model",
+        messages=[{"role": "user", "content": "ping"}],
+    )
+    latencies.append(time.perf_counter() - start)
+
+
+def _openai(base_url: str, http_client: httpx.AsyncClient) -> AsyncOpenAI:
+    return AsyncOpenAI(base_url=base_url, api_key="bench", http_client=http_client, max_retries=0)
+
+
+async def _run_mode(mode: str, server: _StandInServer, ctx: ssl.SSLContext, args: argparse.Namespace) -> dict:
+    base_url = f"https://127.0.0.1:{server.port}/openai/v1"
+    latencies: list[float] = []
+    shared: httpx.AsyncClient | None = None
+    if mode == "pooled":
+        settings = PoolSettings(max_connections=args.pool_size, max_per_host=args.per_host)
+        shared = httpx.AsyncClient(transport=PooledTransport(settings, verify=ctx))
+
+    async def agent() -> None:
+        if mode == "fresh":
+            for _ in range(args.requests):
+                async with httpx.AsyncClient(verify=ctx) as http_client:
+                    await _call(_openai(base_url, http_client), latencies)
+            return
+        if mode == "per-client":
+            async with httpx.AsyncClient(verify=ctx) as http_client:
+                client = _openai(base_url, http_client)
+                for _ in range(args.requests):
+                    await _call(client, latencies)
+            return
+        client = _openai(base_url, shared)  # type: ignore[arg-type]
+        for _ in range(args.requests):
+            await _call(client, latencies)
+
+    before = server.connections
+    start = time.perf_counter()
+    if args.chain:
+        for _ in range(args.agents):
+            await agent()
+    else:
+        await asyncio.gather(*(agent() for _ in range(args.agents)))
+    wall = time.perf_counter() - start
+    if shared is not None:
+        await shared.aclose()
+
+    latencies.sort()
+    return {
+        "wall_s": wall,
+        "calls": len(latencies),
+        "connections": server.connections - before,
+        "p50_ms": statistics.median(latencies) * 1000.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000.0,
+        "calls_per_s": len(latencies) / wall,
+    }
+
+
+async def _bench(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _write_self_signed_cert(Path(tmp))
+        server = _StandInServer(args.latency_ms)
+        await server.start(cert, key)
+        client_ctx = ssl.create_default_context(cafile=str(cert))
+        try:
+            results = {}
+            for mode in args.modes:
+                runs = [await _run_mode(mode, server, client_ctx, args) for _ in range(args.runs)]
+                best = min(runs, key=lambda r: r["wall_s"])
+                results[mode] = best
+            return results
+        finally:
+            await server.stop()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=5, help="Concurrent agents (Demo 5 builds five).")
+    parser.add_argument("--requests", type=int, default=20, help="Sequential calls per agent.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Server-side delay per call.")
+    parser.add_argument("--pool-size", type=int, default=100, help="PooledTransport total connections.")
+    parser.add_argument("--per-host", type=int, default=20, help="PooledTransport per-host limit.")
+    parser.add_argument("--chain", action="store_true", help="Run agents one after another instead of at once.")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per mode (fastest is reported).")
+    parser.add_argument(
+        "--modes", nargs="*", default=["fresh", "per-client", "pooled"], help="Subset of setups to run."
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    args = parser.parse_args()
+
+    results = await _bench(args)
+
+    print("=" * 80)
+    layout = "chained" if args.chain else "concurrent"
+    print(
+        f"HTTPS stand-in: {args.agents} {layout} agents x {args.requests} calls, "
+        f"{args.latency_ms:.0f} ms server latency"
+    )
+    print("=" * 80)
+    print(f"{'mode':<12} {'wall s':>8} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'TLS conns':>10}")
+    for mode, res in results.items():
+        print(
+            f"{mode:<12} {res['wall_s']:8.2f} {res['calls_per_s']:9.1f} "
+            f"{res['p50_ms']:8.1f} {res['p95_ms']:8.1f} {res['connections']:10d}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
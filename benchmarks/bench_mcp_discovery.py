@@ -0,0 +1,125 @@
+"""MCP discovery cache (`runtime.mcp_discovery`): time for an agent's MCP tool to connect.
+
+Connects `--agents` `PooledMCPStdioTool`s in turn to one prewarmed Python MCP
+server with `--tools` tools (so spawning is not part of the measurement), as
+agent builds in the coordinator's process do, in three modes:
+
+- listing: `MCP_DISCOVERY_CACHE=0`, each connect lists the tools (with the
+  framework's ping per page) and builds its function tools from the reply;
+- disk: cache on, in-memory copy dropped before each connect, as in a new
+  process that finds the file from an earlier run;
+- memory: cache on, the listing parsed once and shared by every agent.
+
+Reports p50 / mean connect time per mode; the first cached connect (the miss
+that writes the file) is reported separately.
+
+    python3 benchmarks/bench_mcp_discovery.py
+    python3 benchmarks/bench_mcp_discovery.py --tools 100 --agents 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime import reset_config  # noqa: E402
+from runtime.mcp_discovery import discovery_cache_from_config  # noqa: E402
+from runtime.mcp_pool import McpPoolSettings, McpServerPool, PooledMCPStdioTool, ServerKey  # noqa: E402
+
+# An MCP server with `count` similar tools (FastMCP in mcp 1.x, MCPServer in 2.x).
+PYTHON_SERVER = """
+import sys
+try:
+    from mcp.server.fastmcp import FastMCP as Server
+except ImportError:
+    from mcp.server.mcpserver import MCPServer as Server
+server = Server("catalog")
+
+def make(i):
+    def tool(city: str, headcount: int, date: str, budget: float = 0.0, notes: str = "") -> str:
+        return f"tool {i}: {city}"
+    return tool
+
+for i in range(int(sys.argv[1])):
+    server.add_tool(make(i), name=f"lookup_{i}", description=f"Look up catalog section {i} for an event.")
+
+server.run()
+"""
+
+
+def _tool(key: ServerKey, pool: McpServerPool) -> PooledMCPStdioTool:
+    return PooledMCPStdioTool(name="catalog", command=key.command, args=list(key.args), load_prompts=False, pool=pool)
+
+
+async def _connect(key: ServerKey, pool: McpServerPool) -> float:
+    tool = _tool(key, pool)
+    t0 = time.perf_counter()
+    async with tool:
+        elapsed = (time.perf_counter() - t0) * 1000.0
+        assert tool.functions
+    return elapsed
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {"p50_ms": round(statistics.median(samples), 2), "mean_ms": round(statistics.fmean(samples), 2)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, default=40, help="Tools the server lists.")
+    parser.add_argument("--agents", type=int, default=20, help="Connects per mode.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    key = ServerKey(sys.executable, ("-c", PYTHON_SERVER, str(args.tools)))
+    pool = McpServerPool(McpPoolSettings())
+    await pool.warm(key)
+    rows: dict[str, dict[str, float]] = {}
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ["MCP_DISCOVERY_CACHE_DIR"] = directory
+            os.environ["MCP_DISCOVERY_CACHE"] = "0"
+            reset_config()
+            rows["listing"] = _summary([await _connect(key, pool) for _ in range(args.agents)])
+
+            os.environ["MCP_DISCOVERY_CACHE"] = "1"
+            reset_config()
+            cache = discovery_cache_from_config()
+            first_ms = await _connect(key, pool)
+            disk = []
+            for _ in range(args.agents):
+                cache._memory.clear()
+                disk.append(await _connect(key, pool))
+            rows["disk"] = _summary(disk)
+            rows["memory"] = _summary([await _connect(key, pool) for _ in range(args.agents)])
+    finally:
+        await pool.close()
+
+    print(f"MCP tool connect with {args.tools} server tools, {args.agents} connects per mode (server prewarmed)")
+    print(f"  {'mode':<8} {'p50 ms':>8} {'mean ms':>8}")
+    for mode, r in rows.items():
+        print(f"  {mode:<8} {r['p50_ms']:>8.2f} {r['mean_ms']:>8.2f}")
+    print(f"\n  first cached connect (miss, writes the file): {first_ms:.2f} ms")
+    print(f"  {cache.format_stats()}")
+
+    if args.output:
+        result = {
+            "benchmark": "mcp_discovery",
+            "tools": args.tools,
+            "agents": args.agents,
+            "first_cached_connect_ms": round(first_ms, 2),
+            "modes": rows,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Multiplexed MCP tool calls (`runtime.mcp_mux`): concurrent users on one stdio session.
+
+Starts one Python MCP stdio server whose tool takes `--tool-ms` (as a slow
+tool or busy server would) and has `--users` concurrent callers make
+`--calls` tool calls each over the same session, the way DevUI users share
+the coordinator's pooled sequential-thinking server. Repeated for each
+in-flight limit in `--limits`; a limit of 1 is calls handled one at a time.
+
+Reports wall time, calls/s, p50 / p99 latency as the caller sees it (queue
+wait + call) and the session's peak queue depth.
+
+    python3 benchmarks/bench_mcp_multiplex.py
+    python3 benchmarks/bench_mcp_multiplex.py --users 32 --limits 1,8,32 --tool-ms 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.histogram import LogHistogram  # noqa: E402
+from runtime.mcp_mux import McpMuxStats, MultiplexedSession, MuxSettings  # noqa: E402
+from runtime.mcp_pool import ServerKey  # noqa: E402
+
+# A one-tool MCP server that answers after `ms` (FastMCP in mcp 1.x, MCPServer in 2.x).
+PYTHON_SERVER = """
+import asyncio
+try:
+    from mcp.server.fastmcp import FastMCP as Server
+except ImportError:
+    from mcp.server.mcpserver import MCPServer as Server
+server = Server("slow")
+
+@server.tool()
+async def work(ms: float) -> str:
+    \"\"\"Answer after `ms` milliseconds.\"\"\"
+    await asyncio.sleep(ms / 1000.0)
+    return "done"
+
+server.run()
+"""
+SERVER = ServerKey(sys.executable, ("-c", PYTHON_SERVER))
+
+
+async def _run(session, limit: int, args: argparse.Namespace) -> dict[str, float]:
+    stats = McpMuxStats()
+    mux = MultiplexedSession(session, str(SERVER), MuxSettings(max_in_flight=limit), stats)
+    hist = LogHistogram()
+
+    async def user() -> None:
+        for _ in range(args.calls):
+            started = time.perf_counter()
+            await mux.call_tool("work", {"ms": args.tool_ms})
+            hist.record((time.perf_counter() - started) * 1000.0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(args.users)))
+    wall = time.perf_counter() - t0
+    row = stats.snapshot()[str(SERVER)]
+    return {
+        "in_flight_limit": limit,
+        "wall_ms": round(wall * 1000.0, 1),
+        "calls_per_sec": round(hist.count / wall, 1),
+        "p50_ms": round(hist.quantile(0.5), 1),
+        "p99_ms": round(hist.quantile(0.99), 1),
+        "peak_queued": row["peak_queued"],
+        "peak_in_flight": row["peak_in_flight"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=16, help="Concurrent callers sharing the session.")
+    parser.add_argument("--calls", type=int, default=5, help="Tool calls per caller.")
+    parser.add_argument("--tool-ms", type=float, default=50.0, help="Server-side time per tool call.")
+    parser.add_argument("--limits", default="1,4,16", help="Comma-separated in-flight limits to compare.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+    limits = [int(v) for v in args.limits.split(",")]
+
+    from mcp import ClientSession
+    from mcp.client.stdio import stdio_client
+
+    async with stdio_client(SERVER.parameters()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            rows = [await _run(session, limit, args) for limit in limits]
+
+    print(f"{args.users} users x {args.calls} calls of {args.tool_ms:g} ms over one stdio session")
+    print(f"  {'limit':>5} {'wall ms':>9} {'calls/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'peak q':>7} {'peak fl':>8}")
+    for r in rows:
+        print(
+            f"  {r['in_flight_limit']:>5} {r['wall_ms']:>9.1f} {r['calls_per_sec']:>8.1f} {r['p50_ms']:>8.1f} "
+            f"{r['p99_ms']:>8.1f} {r['peak_queued']:>7} {r['peak_in_flight']:>8}"
+        )
+
+    if args.output:
+        result = {
+            "benchmark": "mcp_multiplex",
+            "users": args.users,
+            "calls": args.calls,
+            "tool_ms": args.tool_ms,
+            "limits": rows,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""Cold-spawned vs pooled MCP stdio servers (`runtime.mcp_pool`): latency to the first tool result.
+
+An agent with an `MCPStdioTool` spawns the server, initializes the session and
+lists its tools before the model can call anything. This benchmark repeats
+what `--agents` agent constructions pay for their first tool call, with:
+
+- cold: a fresh server per agent (plain `MCPStdioTool` behaviour);
+- pooled: a session leased from `McpServerPool` (warmed once up front), as
+  `PooledMCPStdioTool` does.
+
+Each sample is connect (spawn + initialize, or lease) + `tools/list` + one
+`tools/call`. The pool table also shows spawn, lease and restart counts.
+
+`--server python` (default) runs a small Python MCP server so no network is
+needed; `--server npx` uses the sequential-thinking server the demos use.
+
+    python3 benchmarks/bench_mcp_pool.py
+    python3 benchmarks/bench_mcp_pool.py --server npx --agents 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.mcp_pool import McpPoolSettings, McpServerPool, ServerKey  # noqa: E402
+
+# A one-tool MCP server for offline runs (FastMCP in mcp 1.x, MCPServer in 2.x).
+PYTHON_SERVER = """
+try:
+    from mcp.server.fastmcp import FastMCP as Server
+except ImportError:
+    from mcp.server.mcpserver import MCPServer as Server
+server = Server("echo")
+
+@server.tool()
+def sequentialthinking(thought: str, nextThoughtNeeded: bool, thoughtNumber: int, totalThoughts: int) -> str:
+    \"\"\"Record one thinking step.\"\"\"
+    return f"thought {thoughtNumber}/{totalThoughts} recorded"
+
+server.run()
+"""
+
+SERVERS = {
+    "python": ServerKey(sys.executable, ("-c", PYTHON_SERVER)),
+    "npx": ServerKey("npx", ("-y", "@modelcontextprotocol/server-sequential-thinking")),
+}
+ARGUMENTS = {"thought": "Plan the venue search first.", "nextThoughtNeeded": False, "thoughtNumber": 1, "totalThoughts": 1}
+
+
+async def _first_call(session) -> None:
+    tools = await session.list_tools()
+    await session.call_tool(tools.tools[0].name, ARGUMENTS)
+
+
+async def _cold(key: ServerKey) -> float:
+    from mcp import ClientSession
+    from mcp.client.stdio import stdio_client
+
+    t0 = time.perf_counter()
+    async with stdio_client(key.parameters()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await _first_call(session)
+            return (time.perf_counter() - t0) * 1000.0
+
+
+async def _pooled(pool: McpServerPool, key: ServerKey) -> float:
+    t0 = time.perf_counter()
+    session = await pool.lease(key)
+    try:
+        await _first_call(session)
+    finally:
+        pool.release(key, session)
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(statistics.median(samples), 1),
+        "mean_ms": round(statistics.fmean(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=sorted(SERVERS), default="python", help="MCP server to start.")
+    parser.add_argument("--agents", type=int, default=10, help="Agent constructions (first tool calls) per mode.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    key = SERVERS[args.server]
+    cold = [await _cold(key) for _ in range(args.agents)]
+
+    pool = McpServerPool(McpPoolSettings())
+    t0 = time.perf_counter()
+    await pool.warm(key)
+    warm_ms = (time.perf_counter() - t0) * 1000.0
+    try:
+        pooled = [await _pooled(pool, key) for _ in range(args.agents)]
+    finally:
+        await pool.close()
+
+    rows = {"cold": _summary(cold), "pooled": _summary(pooled)}
+    print(f"First tool result per agent, {args.agents} agents, server: {key}"[:120])
+    print(f"  {'mode':<8} {'p50 ms':>9} {'mean ms':>9} {'max ms':>9}")
+    for mode, r in rows.items():
+        print(f"  {mode:<8} {r['p50_ms']:>9.1f} {r['mean_ms']:>9.1f} {r['max_ms']:>9.1f}")
+    print(f"\n  pool warm-up (once, at startup): {warm_ms:.1f} ms")
+    print(f"  total: cold {sum(cold):.0f} ms vs pooled {warm_ms + sum(pooled):.0f} ms including warm-up\n")
+    print(pool.stats.format_table())
+
+    if args.output:
+        result = {
+            "benchmark": "mcp_pool",
+            "server": args.server,
+            "agents": args.agents,
+            "warm_up_ms": round(warm_ms, 1),
+            "modes": rows,
+            "pool": pool.stats.snapshot(),
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
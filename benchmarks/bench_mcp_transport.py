@@ -0,0 +1,111 @@
+"""In-process vs stdio MCP transport (`runtime.mcp_local`): tool-call round trips.
+
+Runs the Python sequential-thinking server (`runtime.mcp_local`) two ways and
+times the same MCP session operations on each:
+
+- stdio: as a child process (`python3 -m runtime.mcp_local sequential-thinking`),
+  the way `MCPStdioTool` runs a server: JSON-RPC over pipes;
+- in-process: in the benchmark's event loop over in-memory streams, as
+  `InProcessMCPTool` does.
+
+Reports the connect time (spawn or start + initialize + tools/list, the cost of
+an agent's first connect) and p50 / p99 per `tools/call` for `--calls`
+sequential calls, plus throughput with `--concurrency` calls in flight.
+
+    python3 benchmarks/bench_mcp_transport.py
+    python3 benchmarks/bench_mcp_transport.py --calls 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from runtime.histogram import LogHistogram  # noqa: E402
+from runtime.mcp_local import in_process_transport, sequential_thinking_server  # noqa: E402
+
+ARGUMENTS = {"thought": "Plan the venue search first.", "nextThoughtNeeded": True, "thoughtNumber": 1, "totalThoughts": 3}
+
+
+@asynccontextmanager
+async def _stdio():
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "runtime.mcp_local", "sequential-thinking"], cwd=str(SRC)
+    )
+    async with stdio_client(params) as streams:
+        yield streams
+
+
+TRANSPORTS = {
+    "stdio": _stdio,
+    "in-process": lambda: in_process_transport(sequential_thinking_server()),
+}
+
+
+async def _measure(transport, calls: int, concurrency: int) -> dict[str, float]:
+    from mcp import ClientSession
+
+    t0 = time.perf_counter()
+    async with transport() as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            connect_ms = (time.perf_counter() - t0) * 1000.0
+
+            hist = LogHistogram()
+            for _ in range(calls):
+                started = time.perf_counter()
+                await session.call_tool("sequentialthinking", ARGUMENTS)
+                hist.record((time.perf_counter() - started) * 1000.0)
+
+            async def worker(n: int) -> None:
+                for _ in range(n):
+                    await session.call_tool("sequentialthinking", ARGUMENTS)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(calls // concurrency) for _ in range(concurrency)))
+            throughput = (calls // concurrency) * concurrency / (time.perf_counter() - started)
+
+    return {
+        "connect_ms": round(connect_ms, 1),
+        "call_p50_us": round(hist.quantile(0.5) * 1000.0, 1),
+        "call_p99_us": round(hist.quantile(0.99) * 1000.0, 1),
+        "calls_per_sec": round(throughput, 0),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500, help="tools/call round trips per transport.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight for the throughput run.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+    if args.concurrency < 1 or args.calls < args.concurrency:
+        parser.error("--concurrency must be between 1 and --calls")
+
+    rows = {name: await _measure(transport, args.calls, args.concurrency) for name, transport in TRANSPORTS.items()}
+
+    print(f"sequentialthinking server, {args.calls} calls per transport ({args.concurrency} in flight for calls/s)")
+    print(f"  {'transport':<11} {'connect ms':>11} {'call p50 us':>12} {'call p99 us':>12} {'calls/s':>9}")
+    for name, r in rows.items():
+        print(
+            f"  {name:<11} {r['connect_ms']:>11.1f} {r['call_p50_us']:>12.1f} "
+            f"{r['call_p99_us']:>12.1f} {r['calls_per_sec']:>9.0f}"
+        )
+
+    if args.output:
+        result = {"benchmark": "mcp_transport", "calls": args.calls, "concurrency": args.concurrency, "transports": rows}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Span classifier benchmark: the inline `_DemoSpanExporter` checks vs `SpanClassifier`.
+
+Builds a pool of real OpenTelemetry SDK spans with a workflow-like mix (agent
+invocations, tool calls, chat calls, HTTP client spans, workflow plumbing),
+then pushes `--spans` of them (one million by default) through:
+
+- legacy      the per-span logic the demos used to carry: `dict(attrs)`, five
+              separate key tests and `startswith` checks, field lookups;
+- classifier  `runtime.SpanClassifier.classify()`.
+
+Both paths are checked to agree on every span in the pool before timing.
+    python3 benchmarks/bench_span_classifier.py --spans 1000000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime import get_span_classifier  # noqa: E402
+
+_AGENTS = ["coordinator", "venue", "catering", "budget_analyst", "booking"]
+_TOOLS = ["web_search", "code_interpreter", "sequential-thinking"]
+
+
+def _legacy(span):
+    # Verbatim from the old `_DemoSpanExporter.export()`, returning instead of printing.
+    attrs = dict(getattr(span, "attributes", None) or {})
+    is_agent = "gen_ai.agent.name" in attrs or str(span.name).startswith("invoke_agent")
+    is_tool = (
+        "gen_ai.tool.name" in attrs
+        or "gen_ai.tool.call.id" in attrs
+        or "tool.name" in attrs
+        or "function.name" in attrs
+        or str(span.name).startswith(("run_tool", "invoke_tool"))
+    )
+    if not (is_agent or is_tool):
+        return None
+
+    agent = attrs.get("gen_ai.agent.name") or attrs.get("agent.name") or "-"
+    tool = attrs.get("gen_ai.tool.name") or attrs.get("tool.name") or attrs.get("function.name") or "-"
+    op = attrs.get("gen_ai.operation.name") or attrs.get("operation.name") or "-"
+    kind = "TOOL" if is_tool else "AGENT"
+    return (kind, agent, tool, op)
+
+
+class _Collect(SpanExporter):
+    def __init__(self) -> None:
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+
+def _build_pool(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    collector = _Collect()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(collector))
+    tracer = provider.get_tracer("bench")
+    common = {"gen_ai.system": "openai", "gen_ai.request.model": "gpt-4o-mini", "server.address": "bench.invalid"}
+    for _ in range(size):
+        agent = rng.choice(_AGENTS)
+        roll = rng.random()
+        if roll < 0.15:
+            name = f"invoke_agent {agent}"
+            attrs = {**common, "gen_ai.agent.name": agent, "gen_ai.operation.name": "invoke_agent"}
+        elif roll < 0.30:
+            tool = rng.choice(_TOOLS)
+            name = f"execute_tool {tool}"
+            attrs = {
+                **common,
+                "gen_ai.tool.name": tool,
+                "gen_ai.tool.call.id": f"call_{rng.randrange(1 << 30):x}",
+                "gen_ai.operation.name": "execute_tool",
+            }
+        elif roll < 0.55:
+            name = "chat gpt-4o-mini"
+            attrs = {**common, "gen_ai.operation.name": "chat", "gen_ai.usage.input_tokens": rng.randrange(2000)}
+        elif roll < 0.80:
+            name = "POST"
+            attrs = {"http.request.method": "POST", "url.full": "https://bench.invalid/openai/v1/responses"}
+        else:
+            name = rng.choice(["executor.process", "edge_group.process", "workflow.run", "message.send"])
+            attrs = {"executor.id": agent, "workflow.id": "event-planning", "message.type": "AgentExecutorResponse"}
+        with tracer.start_as_current_span(name, attributes=attrs):
+            pass
+    provider.shutdown()
+    return collector.spans
+
+
+def _time(fn, spans: list, total: int) -> tuple[float, int]:
+    n = len(spans)
+    matched = 0
+    start = time.perf_counter()
+    for i in range(total):
+        if fn(spans[i % n]) is not None:
+            matched += 1
+    return time.perf_counter() - start, matched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=1_000_000, help="Spans classified per path.")
+    parser.add_argument("--pool", type=int, default=2000, help="Distinct synthetic spans (cycled).")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    args = parser.parse_args()
+
+    spans = _build_pool(args.pool, args.seed)
+    classify = get_span_classifier().classify
+    for span in spans:
+        new = classify(span)
+        old = _legacy(span)
+        if (tuple(new) if new else None) != old:
+            raise SystemExit(f"Classifier disagrees with legacy path on {span.name!r}: {new} != {old}")
+
+    results = {}
+    for label, fn in (("legacy", _legacy), ("classifier", classify)):
+        elapsed, matched = _time(fn, spans, args.spans)
+        results[label] = {"seconds": elapsed, "ns_per_span": elapsed / args.spans * 1e9, "matched": matched}
+
+    print("=" * 80)
+    print(f"Span classification: {args.spans:,} spans ({args.pool} distinct, {results['legacy']['matched']:,} agent/tool)")
+    print("=" * 80)
+    for label, res in results.items():
+        print(f"{label:<12} {res['seconds']:7.2f} s  {res['ns_per_span']:8.0f} ns/span")
+    speedup = results["legacy"]["seconds"] / results["classifier"]["seconds"]
+    print(f"\nspeedup: {speedup:.2f}x")
+
+    if args.output:
+        args.output.write_text(json.dumps({**results, "speedup": speedup}, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Startup benchmark: parse `python -X importtime` for each demo and the DevUI entities.
+
+Each target is imported (not run) in a fresh interpreter with `-X importtime`.
+The script reports total import time, the heaviest direct imports, and
+whether the modules we load lazily (`opentelemetry.sdk`,
+`azure.ai.projects.models`) were pulled in at import time.
+
+To catch regressions, save a baseline and compare later runs against it:
+    python3 benchmarks/bench_startup_importtime.py --output bench_output.json
+    python3 benchmarks/bench_startup_importtime.py --baseline bench_output.json --tolerance 0.25
+
+The command exits with status 1 when a target's median import time grows by more
+than `--tolerance` over the baseline. No Azure access is needed: the DevUI entity
+targets run with placeholder config, a stub DNS resolver and a fake `npx`.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_SRC_DIR = _REPO_ROOT / "src"
+_ENTITIES_DIR = _REPO_ROOT / "entities"
+
+_DEMOS = [
+    "demo1_run_agent",
+    "demo2_web_search",
+    "demo3_hosted_mcp",
+    "demo4_structured_output",
+    "demo5_workflow_edges",
+    "demo6_devui",
+    "demo7_toolbox",
+]
+_ENTITIES = ["event_planning_workflow", "ai_genius_workflow"]
+
+# Modules that should only load on first use.
+_WATCHED = ("opentelemetry.sdk", "azure.ai.projects.models")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_PLACEHOLDER_ENV = {
+    "FOUNDRY_PROJECT_ENDPOINT": "https://bench.invalid/api/projects/bench",
+    "FOUNDRY_MODEL": "bench-model",
+    "BING_CONNECTION_ID": "/subscriptions/bench/connections/bing",
+    "AZURE_OPENAI_ENDPOINT": "https://bench.invalid/",
+    "AZURE_OPENAI_CHAT_DEPLOYMENT_NAME": "bench-deployment",
+    "AZURE_OPENAI_API_KEY": "bench-key",
+    "AZURE_OPENAI_AUTH": "api_key",
+}
+
+
+def _import_code(target: str) -> str:
+    if target in _ENTITIES:
+        # Mirror DevUI directory discovery: `entities/` on sys.path, import the package.
+        return (
+            "import sys\n"
+            f"sys.path[:0] = [{str(_SRC_DIR)!r}, {str(_ENTITIES_DIR)!r}]\n"
+            "import runtime\n"
+            "runtime.set_resolver(runtime.EndpointResolver(getaddrinfo_sync=lambda host, port: []))\n"
+            f"import {target}\n"
+        )
+    return f"import sys\nsys.path.insert(0, {str(_SRC_DIR)!r})\nimport {target}\n"
+
+
+def _parse_importtime(stderr: str) -> dict:
+    total_us = 0
+    direct: list[tuple[int, str]] = []
+    loaded: set[str] = set()
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative_us, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        loaded.add(name)
+        # `-X importtime` indents nested imports by two spaces per level.
+        depth = max(0, len(indent) - 1) // 2
+        if depth == 0:
+            total_us += cumulative_us
+        elif depth == 1:
+            direct.append((cumulative_us, name))
+    direct.sort(reverse=True)
+    return {
+        "total_ms": total_us / 1000.0,
+        "top": [(name, us / 1000.0) for us, name in direct[:5]],
+        "watched": {prefix: any(n == prefix or n.startswith(prefix + ".") for n in loaded) for prefix in _WATCHED},
+    }
+
+
+def _measure(target: str, env: dict[str, str], runs: int) -> dict:
+    samples: list[dict] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _import_code(target)],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=_REPO_ROOT,
+        )
+        if out.returncode != 0:
+            tail = "\n".join(out.stderr.strip().splitlines()[-3:])
+            raise RuntimeError(f"Importing {target} failed:\n{tail}")
+        samples.append(_parse_importtime(out.stderr))
+    median = statistics.median(s["total_ms"] for s in samples)
+    result = min(samples, key=lambda s: abs(s["total_ms"] - median))
+    return {**result, "total_ms": median}
+
+
+def _bench_env(fake_bin: Path) -> dict[str, str]:
+    # A fake `npx` so the event-planning entity's `_require_command("npx")` passes.
+    npx = fake_bin / "npx"
+    npx.write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+    npx.chmod(0o755)
+    env = dict(os.environ)
+    env.update(_PLACEHOLDER_ENV)
+    env["PATH"] = f"{fake_bin}{os.pathsep}{env.get('PATH', '')}"
+    env["DEMO_TRACING"] = "0"
+    return env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median is reported).")
+    parser.add_argument("--targets", nargs="*", default=_DEMOS + _ENTITIES, help="Subset of targets to measure.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON (usable as a later --baseline).")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --output file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown vs baseline.")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else {}
+    results: dict[str, dict] = {}
+    regressions: list[str] = []
+
+    print("=" * 80)
+    print(f"Startup import time (-X importtime, median of {args.runs})")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _bench_env(Path(tmp))
+        for target in args.targets:
+            res = results[target] = _measure(target, env, args.runs)
+            watched = " ".join(f"{k}={'LOADED' if v else 'lazy'}" for k, v in res["watched"].items())
+            line = f"{target:<26} {res['total_ms']:9.1f} ms  {watched}"
+            base = baseline.get(target)
+            if base:
+                delta = res["total_ms"] / base["total_ms"] - 1.0
+                line += f"  ({delta:+.0%} vs baseline)"
+                if delta > args.tolerance:
+                    regressions.append(target)
+            print(line)
+            for name, ms in res["top"]:
+                print(f"    {ms:9.1f} ms  {name}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.output}")
+    if regressions:
+        print(f"\nImport-time regression (> {args.tolerance:.0%}): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
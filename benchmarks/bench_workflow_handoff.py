@@ -0,0 +1,121 @@
+"""Tokens each agent receives under each handoff mode (`WORKFLOW_HANDOFF`).
+
+Runs Demo 5's workflow on `runtime.stub_client.StubChatClient` once per
+handoff spec. The stub answers with a markdown plan (headings, bullet points,
+figures and prose, like the real specialists), and records the
+input tokens of every model call, so the table shows what each agent was
+actually sent and how much each mode saves over `full`. The per-edge table of
+the `HandoffStats` (tokens received and sent by every stage) follows. The stub
+makes no tool calls, so `final` matches `full` here; with the real agents it also
+drops their Bing and MCP tool calls and results. No Azure access:
+
+    python3 benchmarks/bench_workflow_handoff.py
+    python3 benchmarks/bench_workflow_handoff.py --topology parallel --modes full final "booking=summary:150,*=final"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.handoff import HandoffPolicy, conversation_tokens  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.workflows import CHAIN, TOPOLOGIES, build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+def _plan(name: str, paragraphs: int) -> str:
+    prose = (
+        f"The {name} recommendation balances guest experience against cost and leaves room for changes "
+        "once the client confirms numbers; alternatives were compared on availability, reviews and access. "
+    )
+    return "\n".join(
+        [
+            f"## {name.replace('_', ' ').title()} plan",
+            *(prose for _ in range(paragraphs)),
+            "- Option A: $4,800 for 50 guests, available December 6th",
+            "- Option B: $5,250 for 50 guests, includes AV",
+            "- Deposit: 25% due 30 days ahead",
+            "### Next steps",
+            "1. Confirm headcount by November 15th",
+            "2. Hold Option A for 7 days",
+        ]
+    )
+
+
+def _reply(received: dict[str, int], paragraphs: int):
+    def reply(index, messages, options):
+        name = str(options.get("instructions", "")).split(":", 1)[0]
+        received[name] = conversation_tokens([m for m in messages if m.role != "system"])
+        return _plan(name, paragraphs)
+
+    return reply
+
+
+async def _run(spec: str, topology: str, paragraphs: int) -> dict:
+    received: dict[str, int] = {}
+    client = StubChatClient(reply=_reply(received, paragraphs))
+    agents = [client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist.") for name in AGENTS]
+    policy = HandoffPolicy.parse(spec)
+    workflow = build_event_planning_workflow(
+        agents[0], agents[1:3], agents[3], agents[4], topology=topology, handoff=policy
+    )
+    t0 = time.perf_counter()
+    async for _ in workflow.run(PROMPT, stream=True):
+        pass
+    return {
+        "spec": str(policy),
+        "run_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        "input_tokens": {name: received.get(name, 0) for name in AGENTS},
+        "edges": policy.stats.snapshot(),
+        "table": policy.stats.format_table(),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=CHAIN, help="Workflow shape.")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["full", "final", "summary:120", "tail:400"],
+        help="WORKFLOW_HANDOFF specs to compare (the first is the baseline).",
+    )
+    parser.add_argument("--paragraphs", type=int, default=4, help="Prose paragraphs per stub reply.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    try:
+        results = [await _run(spec, args.topology, args.paragraphs) for spec in args.modes]
+    except ValueError as ex:
+        parser.error(str(ex))
+
+    baseline = sum(results[0]["input_tokens"].values())
+    print(f"Input tokens per agent by handoff mode ({args.topology}, tokens ~ chars/4)")
+    print(f"  {'mode':<28} " + " ".join(f"{name:>14}" for name in AGENTS) + f" {'total':>7} {'saved':>6}")
+    for r in results:
+        total = sum(r["input_tokens"].values())
+        r["total_input_tokens"] = total
+        r["saved_vs_baseline"] = round(1 - total / baseline, 3) if baseline else 0.0
+        print(
+            f"  {r['spec']:<28} "
+            + " ".join(f"{r['input_tokens'][name]:>14}" for name in AGENTS)
+            + f" {total:>7} {r['saved_vs_baseline']:>6.0%}"
+        )
+    for r in results:
+        print(f"\n[{r['spec']}] " + r.pop("table"))
+
+    if args.output:
+        result = {"benchmark": "workflow_handoff", "topology": args.topology, "modes": results}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""Hedged requests (`WORKFLOW_HEDGE_AFTER_SECONDS`): workflow tail latency with occasional stalls.
+
+Runs Demo 5's chain on `runtime.stub_client.StubChatClient` where every model
+call stalls for `--stall-ms` with probability `--stall-rate` (a queued or
+throttled request) and otherwise answers after `--latency`. Each run is
+repeated with no policy, with a hedge after `--hedge-after` seconds, and with a
+deadline of `--deadline` seconds alone. The report has end-to-end p50 / p90 /
+p99 / max, extra model calls, hedges fired and won, and missed deadlines
+(a missed deadline fails the run).
+
+No Azure access:
+
+    python3 benchmarks/bench_workflow_hedging.py
+    python3 benchmarks/bench_workflow_hedging.py --runs 100 --stall-rate 0.1 --hedge-after 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.deadlines import DeadlineMiddleware, DeadlinePolicy, ExecutorDeadlineExceeded, PerAgent  # noqa: E402
+from runtime.histogram import LogHistogram  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.synthetic import LatencyModel  # noqa: E402
+from runtime.workflows import build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+class StallingLatency(LatencyModel):
+    """`base` latency, replaced by `stall_ms` with probability `rate`."""
+
+    def __init__(self, base: str, stall_ms: float, rate: float, seed: int) -> None:
+        super().__init__(base, seed=seed)
+        self.stall_ms = stall_ms
+        self.rate = rate
+        self._stalls = random.Random(seed + 1)
+
+    def sample(self) -> float:
+        return self.stall_ms if self._stalls.random() < self.rate else super().sample()
+
+
+async def _run(args: argparse.Namespace, policy: DeadlinePolicy | None, seed: int) -> tuple[float | None, int]:
+    latency = StallingLatency(args.latency, args.stall_ms, args.stall_rate, seed)
+    client = StubChatClient(latency=latency, tokens_per_sec=args.tokens_per_sec, reply_tokens=args.reply_tokens)
+    middleware = [DeadlineMiddleware(policy)] if policy is not None else []
+    agents = [
+        client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist.", middleware=middleware)
+        for name in AGENTS
+    ]
+    workflow = build_event_planning_workflow(agents[0], agents[1:3], agents[3], agents[4])
+    t0 = time.perf_counter()
+    try:
+        async for _ in workflow.run(PROMPT, stream=True):
+            pass
+    except ExecutorDeadlineExceeded:
+        return None, client.calls
+    return (time.perf_counter() - t0) * 1000.0, client.calls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=40, help="Runs per mode.")
+    parser.add_argument("--latency", default="lognormal:150:0.2", help="Normal time to first token (runtime.synthetic.LatencyModel spec).")
+    parser.add_argument("--stall-ms", type=float, default=3000.0, help="Time to first token of a stalled call.")
+    parser.add_argument("--stall-rate", type=float, default=0.05, help="Share of model calls that stall.")
+    parser.add_argument("--tokens-per-sec", type=float, default=2000.0, help="Stub streaming rate.")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Tokens per reply.")
+    parser.add_argument("--hedge-after", type=float, default=0.4, help="Hedge threshold (seconds without a first update).")
+    parser.add_argument("--deadline", type=float, default=2.0, help="Per-agent deadline for the deadline-only mode (seconds).")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for latencies and stalls.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    modes = {
+        "no policy": None,
+        f"hedge after {args.hedge_after:g}s": DeadlinePolicy(hedge_after=PerAgent(args.hedge_after)),
+        f"deadline {args.deadline:g}s": DeadlinePolicy(deadline=PerAgent(args.deadline)),
+    }
+    rows = []
+    for label, policy in modes.items():
+        hist = LogHistogram()
+        calls = failed = 0
+        for i in range(args.runs):
+            wall_ms, run_calls = await _run(args, policy, args.seed + i)
+            calls += run_calls
+            if wall_ms is None:
+                failed += 1
+            else:
+                hist.record(wall_ms)
+        counts = policy.stats.snapshot() if policy is not None else {}
+        rows.append(
+            {
+                "mode": label,
+                "completed": hist.count,
+                "failed": failed,
+                "p50_ms": round(hist.quantile(0.5), 1) if hist.count else None,
+                "p90_ms": round(hist.quantile(0.9), 1) if hist.count else None,
+                "p99_ms": round(hist.quantile(0.99), 1) if hist.count else None,
+                "max_ms": round(hist.max, 1) if hist.count else None,
+                "model_calls": calls,
+                "hedged": sum(s["hedged"] for s in counts.values()),
+                "hedges_won": sum(s["hedge_won"] for s in counts.values()),
+            }
+        )
+
+    print(
+        f"{args.runs} chain runs per mode, {args.stall_rate:.0%} of calls stall for {args.stall_ms:g} ms "
+        f"(otherwise {args.latency})"
+    )
+    header = f"  {'mode':<20} {'done':>5} {'failed':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'calls':>6} {'hedged':>7} {'won':>5}"
+    print(header)
+    for r in rows:
+        cells = " ".join(f"{r[k]:>8.1f}" if r[k] is not None else f"{'-':>8}" for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms"))
+        print(
+            f"  {r['mode']:<20} {r['completed']:>5} {r['failed']:>7} {cells} "
+            f"{r['model_calls']:>6} {r['hedged']:>7} {r['hedges_won']:>5}"
+        )
+
+    if args.output:
+        result = {
+            "benchmark": "workflow_hedging",
+            "runs": args.runs,
+            "latency": args.latency,
+            "stall_ms": args.stall_ms,
+            "stall_rate": args.stall_rate,
+            "modes": rows,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
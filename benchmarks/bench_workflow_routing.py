@@ -0,0 +1,135 @@
+"""Model calls and wall time saved by conditional routing (`WORKFLOW_ROUTING=1`).
+
+Runs Demo 5's workflow on `runtime.stub_client.StubChatClient` for a mix of
+requests (in-person, virtual, venue already booked, catering arranged,
+budget-only), each with routing off and on, and reports the model calls, the
+specialists the router skipped and the wall time per request. Each skipped
+specialist also saves its hosted Bing calls with the real agents; the stub has
+none. Before the runs, `classify_request()` is checked against golden
+requests that must and must not skip specialists; a mismatch fails the script.
+No Azure access:
+
+    python3 benchmarks/bench_workflow_routing.py
+    python3 benchmarks/bench_workflow_routing.py --topology parallel --latency lognormal:800:0.3
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.routing import classify_request  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.workflows import CHAIN, TOPOLOGIES, build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+REQUESTS = {
+    "in-person": "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle",
+    "virtual": "Plan a virtual year-end celebration for 120 remote employees in December",
+    "venue-booked": "Plan a team dinner for 20 people; the venue is already booked at our office",
+    "catering-arranged": "Plan a product launch for 80 guests in Austin, catering is provided by the venue",
+    "budget-only": "I only need a budget for a two-day sales kickoff for 60 people in Denver",
+}
+
+SPECIALISTS = ("venue", "catering")
+# (request, coordinator plan, specialists that must be skipped)
+GOLDEN = [
+    # positives
+    ("Plan a virtual year-end celebration for 120 remote employees", "", {"venue"}),
+    ("Plan a webinar for 300 partners next month", "", {"venue"}),
+    ("Team dinner for 20 people; the venue is already booked at our office", "", {"venue"}),
+    ("Offsite for 40 people, no venue needed, we use our office", "", {"venue"}),
+    ("Product launch for 80 guests in Austin, catering is provided by the venue", "", {"catering"}),
+    ("Workshop for 25 engineers, no catering needed", "", {"catering"}),
+    ("Neighborhood potluck picnic for 30 families", "", {"catering"}),
+    ("I only need a budget for a two-day sales kickoff for 60 people", "", {"venue", "catering"}),
+    # negatives: ordinary in-person requests run every specialist
+    ("Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle", "", set()),
+    ("Hybrid conference, 200 in person in Denver plus virtual attendees", "", set()),
+    ("In-person team offsite for 30 with a virtual option for remote staff", "", set()),
+    ("Gala dinner for 100 guests, no food allergies among them", "", set()),
+    ("Awards night for 150 people, no food trucks please", "", set()),
+    # negatives: questions, negations and open needs are not statements
+    ("Offsite for 40 people, no venue booked yet", "", set()),
+    ("We still need the venue confirmed for our party of 60", "", set()),
+    ("Is the venue reserved? Please find options for 80 guests", "", set()),
+    ("Catering confirmed? Not yet, we need a caterer for 50", "", set()),
+    ("Has catering been sorted out? no, please plan it", "", set()),
+    ("catering has been sorted out? no, please plan it", "", set()),
+    ("We are not sure if the venue is already booked; please check options", "", set()),
+    ("Sales kickoff for 70 with virtual reality demos at the booth", "", set()),
+    ("Should this be a virtual event? We prefer meeting in Boston", "", set()),
+    (
+        "Plan a corporate holiday party for 50 people in Seattle",
+        "1. Livestream the keynote for remote staff. 2. Confirm the venue is reserved and catering is confirmed.",
+        set(),
+    ),
+]
+
+
+def _check_golden() -> None:
+    failures = []
+    for request, plan, expected in GOLDEN:
+        skipped = set(classify_request(request, plan, SPECIALISTS))
+        if skipped != expected:
+            failures.append(f"  {request!r}: skipped {sorted(skipped)}, expected {sorted(expected)}")
+    if failures:
+        raise SystemExit("classify_request golden cases failed:\n" + "\n".join(failures))
+    print(f"classify_request: {len(GOLDEN)} golden cases passed\n")
+
+
+async def _run(prompt: str, topology: str, latency: str, routing: bool) -> dict:
+    client = StubChatClient(latency=latency, reply_tokens=40)
+    agents = [client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist.") for name in AGENTS]
+    workflow = build_event_planning_workflow(
+        agents[0], agents[1:3], agents[3], agents[4], topology=topology, routing=routing
+    )
+    skipped: dict[str, str] = {}
+    t0 = time.perf_counter()
+    async for event in workflow.run(prompt, stream=True):
+        if event.type == "executor_bypassed":
+            skipped[event.executor_id] = str(event.data)
+    return {"calls": client.calls, "skipped": skipped, "run_ms": round((time.perf_counter() - t0) * 1000.0, 1)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=CHAIN, help="Workflow shape.")
+    parser.add_argument("--latency", default="fixed:300", help="Stub time to first token (runtime.synthetic.LatencyModel spec).")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    _check_golden()
+    rows = []
+    for label, prompt in REQUESTS.items():
+        base = await _run(prompt, args.topology, args.latency, routing=False)
+        routed = await _run(prompt, args.topology, args.latency, routing=True)
+        rows.append({"request": label, "prompt": prompt, "baseline": base, "routed": routed})
+
+    print(f"Conditional routing ({args.topology}, latency {args.latency})")
+    print(f"  {'request':<18} {'calls':>5} {'routed':>6} {'ms':>8} {'routed ms':>10}  skipped")
+    for r in rows:
+        b, t = r["baseline"], r["routed"]
+        skipped = ", ".join(f"{k} ({v})" for k, v in t["skipped"].items()) or "-"
+        print(f"  {r['request']:<18} {b['calls']:>5} {t['calls']:>6} {b['run_ms']:>8.1f} {t['run_ms']:>10.1f}  {skipped}")
+    calls = sum(r["baseline"]["calls"] for r in rows)
+    routed_calls = sum(r["routed"]["calls"] for r in rows)
+    ms = sum(r["baseline"]["run_ms"] for r in rows)
+    routed_ms = sum(r["routed"]["run_ms"] for r in rows)
+    print(
+        f"\n  total: {calls} -> {routed_calls} model calls ({1 - routed_calls / calls:.0%} fewer), "
+        f"{ms:.0f} -> {routed_ms:.0f} ms ({1 - routed_ms / ms:.0%} faster)"
+    )
+
+    if args.output:
+        result = {"benchmark": "workflow_routing", "topology": args.topology, "latency": args.latency, "requests": rows}
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""Speculative execution in the chain topology (`WORKFLOW_SPECULATION=1`): hit rate and time saved.
+
+Runs Demo 5's chain on `runtime.stub_client.StubChatClient`, alternating plain
+and speculative runs. In a `--miss-rate` share of the runs the stub venue agent
+replies that the venue has in-house catering, which the default validator
+treats as a reason to re-run catering (a miss). Otherwise the speculative
+catering result is kept (a hit). The report has:
+
+- end-to-end latency (p50 / mean) with and without speculation;
+- hit rate, speculative calls cancelled while still in flight, time saved on
+  hits and model time wasted on misses (`SpeculationStats`);
+- extra model calls caused by misses.
+
+It first checks that a run whose venue agent fails leaves no speculation
+pending (the speculative catering call is cancelled when the run ends).
+
+No Azure access:
+
+    python3 benchmarks/bench_workflow_speculation.py
+    python3 benchmarks/bench_workflow_speculation.py --runs 40 --miss-rate 0.5 --latency lognormal:800:0.4
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.speculation import SpeculationPolicy, SpeculativeAgentExecutor  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.synthetic import LatencyModel  # noqa: E402
+from runtime.workflows import build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+VENUE_HIT = "The Loft on 5th fits 50 guests for $4,800 and allows outside caterers."
+VENUE_MISS = "The Loft on 5th fits 50 guests for $4,800; it has in-house catering only."
+
+
+def _reply(venue_text: str):
+    def reply(index, messages, options):
+        name = str(options.get("instructions", "")).split(":", 1)[0]
+        return venue_text if name == "venue" else f"{name} recommendation for the event."
+
+    return reply
+
+
+async def _run(latency: LatencyModel, venue_text: str, policy: SpeculationPolicy | None) -> tuple[float, int]:
+    client = StubChatClient(latency=latency, reply=_reply(venue_text))
+    agents = [client.as_agent(name=name, instructions=f"{name}: you are the {name} specialist.") for name in AGENTS]
+    workflow = build_event_planning_workflow(agents[0], agents[1:3], agents[3], agents[4], speculation=policy)
+    t0 = time.perf_counter()
+    async for _ in workflow.run(PROMPT, stream=True):
+        pass
+    return (time.perf_counter() - t0) * 1000.0, client.calls
+
+
+async def _check_failed_run() -> None:
+    # Venue fails while the speculative catering call is still running.
+    def fail(index, messages, options):
+        return RuntimeError("venue unavailable") if str(options.get("instructions", "")).startswith("venue") else None
+
+    fast = StubChatClient(latency="fixed:50", fault=fail)
+    slow = StubChatClient(latency="fixed:5000")
+    agents = [
+        (slow if name == "catering" else fast).as_agent(name=name, instructions=f"{name}: you are the {name} specialist.")
+        for name in AGENTS
+    ]
+    workflow = build_event_planning_workflow(agents[0], agents[1:3], agents[3], agents[4], speculation=SpeculationPolicy())
+    speculative = [e for e in workflow.get_executors_list() if isinstance(e, SpeculativeAgentExecutor)]
+    tasks = []
+    try:
+        async for event in workflow.run(PROMPT, stream=True):
+            if event.type == "executor_invoked" and event.executor_id == "venue":
+                tasks = [e._pending.task for e in speculative if e._pending is not None]
+    except Exception:
+        pass
+    await asyncio.sleep(0)  # let the cancellations land
+    if not tasks or any(e._pending is not None for e in speculative) or not all(t.cancelled() for t in tasks):
+        raise SystemExit("speculation left pending after a failed run")
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {"p50_ms": round(statistics.median(samples), 1), "mean_ms": round(statistics.fmean(samples), 1)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per mode.")
+    parser.add_argument("--miss-rate", type=float, default=0.25, help="Share of runs where venue forces a re-run.")
+    parser.add_argument("--latency", default="lognormal:300:0.3", help="Stub time to first token (runtime.synthetic.LatencyModel spec).")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for latencies and misses.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    await _check_failed_run()
+    rng = random.Random(args.seed)
+    latency = LatencyModel(args.latency, seed=args.seed)
+    policy = SpeculationPolicy()
+    plain: list[float] = []
+    speculative: list[float] = []
+    plain_calls = speculative_calls = 0
+    for _ in range(args.runs):
+        venue_text = VENUE_MISS if rng.random() < args.miss_rate else VENUE_HIT
+        ms, calls = await _run(latency, venue_text, None)
+        plain.append(ms)
+        plain_calls += calls
+        ms, calls = await _run(latency, venue_text, policy)
+        speculative.append(ms)
+        speculative_calls += calls
+
+    stats = policy.stats.snapshot()
+    base, spec = _summary(plain), _summary(speculative)
+    print(f"Speculative catering in the chain ({args.runs} runs per mode, latency {args.latency}, miss rate {args.miss_rate:.0%})")
+    print(f"  {'mode':<12} {'p50 ms':>9} {'mean ms':>9} {'model calls':>12}")
+    print(f"  {'chain':<12} {base['p50_ms']:>9.1f} {base['mean_ms']:>9.1f} {plain_calls:>12}")
+    print(f"  {'speculative':<12} {spec['p50_ms']:>9.1f} {spec['mean_ms']:>9.1f} {speculative_calls:>12}")
+    print(
+        f"\n  {policy.stats.format_stats()}\n"
+        f"  mean speed-up: {base['mean_ms'] / spec['mean_ms']:.2f}x; "
+        f"{speculative_calls - plain_calls} extra model call(s) from misses"
+    )
+
+    if args.output:
+        result = {
+            "benchmark": "workflow_speculation",
+            "runs": args.runs,
+            "latency": args.latency,
+            "miss_rate": args.miss_rate,
+            "chain": {**base, "model_calls": plain_calls},
+            "speculative": {**spec, "model_calls": speculative_calls},
+            "speculation": stats,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+"""Workflow throughput benchmark: the Demo 5 executor chain against a stub model.
+
+Builds the `coordinator -> venue -> catering -> budget_analyst -> booking`
+workflow (`runtime.workflows`, as used by Demo 5 and the `event_planning_workflow`
+entity; `--topology parallel` for the fan-out/fan-in shape) on `runtime.stub_client.StubChatClient`, so no Azure access, network
+or MCP server is involved, and runs it `--runs` times with up to
+`--concurrency` runs in flight. Each run streams events like Demo 5 does.
+
+Reported:
+- runs/sec and per-run wall time (p50/p90/p99);
+- per-edge handoff overhead: time from the upstream `executor_completed`
+  event (the last one, for a fan-in) to the downstream `executor_invoked`
+  event, as seen by the consumer;
+- event-loop CPU time per streamed update event (process CPU / streamed events);
+  Agent Framework 1.2.2 surfaces agent updates as `data` events, or as
+  `output` events for output executors (here `booking`), so both are counted;
+- peak RSS of the process.
+
+    python3 benchmarks/bench_workflow_throughput.py --runs 200 --concurrency 16
+    python3 benchmarks/bench_workflow_throughput.py --latency lognormal:300:0.4 --tokens-per-sec 80 \\
+        --output throughput.json
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.histogram import LogHistogram  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.workflows import (  # noqa: E402
+    CHAIN as CHAIN_TOPOLOGY,
+    JOIN_EXECUTOR_ID,
+    PARALLEL,
+    TOPOLOGIES,
+    build_event_planning_workflow,
+)
+
+CHAIN = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+# Executor -> the executors whose completion hands off to it, per topology.
+UPSTREAM = {
+    CHAIN_TOPOLOGY: {downstream: (upstream,) for upstream, downstream in zip(CHAIN, CHAIN[1:])},
+    PARALLEL: {
+        "venue": ("coordinator",),
+        "catering": ("coordinator",),
+        JOIN_EXECUTOR_ID: ("venue", "catering"),
+        "budget_analyst": (JOIN_EXECUTOR_ID,),
+        "booking": ("budget_analyst",),
+    },
+}
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+def build_workflow(client: StubChatClient, topology: str = CHAIN_TOPOLOGY):
+    """Demo 5's workflow with one fresh agent per executor."""
+
+    coordinator, venue, catering, budget_analyst, booking = (
+        client.as_agent(name=name, instructions=f"You are the {name} specialist.") for name in CHAIN
+    )
+    return build_event_planning_workflow(coordinator, [venue, catering], budget_analyst, booking, topology=topology)
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.run_ms = LogHistogram()
+        self.edges: dict[str, LogHistogram] = defaultdict(LogHistogram)
+        self.stream_events = 0
+        self.events = 0
+        self.failures = 0
+
+
+async def _one_run(client: StubChatClient, stats: _Stats, topology: str = CHAIN_TOPOLOGY) -> None:
+    workflow = build_workflow(client, topology)
+    upstream_of = UPSTREAM[topology]
+    completed_at: dict[str, float] = {}
+    start = time.perf_counter()
+    async for event in workflow.run(PROMPT, stream=True):
+        now = time.perf_counter()
+        stats.events += 1
+        if event.type in ("data", "output"):
+            stats.stream_events += 1
+        elif event.type == "executor_completed" and event.executor_id:
+            completed_at[event.executor_id] = now
+        elif event.type == "executor_invoked" and event.executor_id in upstream_of:
+            # Fan-in: the handoff starts when the last upstream finishes.
+            done = [completed_at[u] for u in upstream_of[event.executor_id] if u in completed_at]
+            if done:
+                edge = f"{'|'.join(upstream_of[event.executor_id])}->{event.executor_id}"
+                stats.edges[edge].record((now - max(done)) * 1000.0)
+    stats.run_ms.record((time.perf_counter() - start) * 1000.0)
+
+
+async def _bench(args: argparse.Namespace) -> dict:
+    client = StubChatClient(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+    )
+    stats = _Stats()
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def guarded() -> None:
+        async with gate:
+            try:
+                await _one_run(client, stats, args.topology)
+            except Exception as ex:  # keep going; failures are reported
+                stats.failures += 1
+                print(f"run failed: {type(ex).__name__}: {ex}", file=sys.stderr)
+
+    # One warm-up run so imports and first-call caches are not measured.
+    await _one_run(client, _Stats(), args.topology)
+
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    await asyncio.gather(*(guarded() for _ in range(args.runs)))
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+
+    def quantiles(hist: LogHistogram) -> dict:
+        return {
+            "count": hist.count,
+            "mean": round(hist.mean, 3),
+            "p50": round(hist.quantile(0.5), 3),
+            "p90": round(hist.quantile(0.9), 3),
+            "p99": round(hist.quantile(0.99), 3),
+        }
+
+    edge_means = [h.mean for h in stats.edges.values() if h.count]
+    return {
+        "benchmark": "workflow_throughput",
+        "topology": args.topology,
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "latency": args.latency,
+        "tokens_per_sec": args.tokens_per_sec,
+        "reply_tokens": args.reply_tokens,
+        "failures": stats.failures,
+        "wall_s": round(wall, 4),
+        "runs_per_sec": round((args.runs - stats.failures) / wall, 3),
+        "run_ms": quantiles(stats.run_ms),
+        "handoff_ms": {edge: quantiles(hist) for edge, hist in sorted(stats.edges.items())},
+        "handoff_mean_ms": round(statistics.fmean(edge_means), 4) if edge_means else None,
+        "events": stats.events,
+        "stream_events": stats.stream_events,
+        "cpu_s": round(cpu, 4),
+        "cpu_us_per_stream_event": round(cpu / stats.stream_events * 1e6, 3) if stats.stream_events else None,
+        "model_calls": client.calls,
+        # ru_maxrss is KiB on Linux.
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _print_report(result: dict) -> None:
+    print(
+        f"{result['runs']} run(s) at concurrency {result['concurrency']} "
+        f"(latency {result['latency']}, {result['tokens_per_sec'] or 'unpaced'} tok/s, "
+        f"{result['reply_tokens']} tokens/reply, {result['topology']})"
+    )
+    print(f"  throughput        {result['runs_per_sec']:10.2f} runs/s  ({result['wall_s']:.2f} s wall)")
+    run = result["run_ms"]
+    print(f"  run time          p50 {run['p50']:9.1f} ms  p90 {run['p90']:9.1f} ms  p99 {run['p99']:9.1f} ms")
+    print(f"  streamed events   {result['stream_events']:10d}  ({result['cpu_us_per_stream_event']} us CPU each)")
+    print(f"  peak RSS          {result['peak_rss_mib']:10.1f} MiB")
+    if result["failures"]:
+        print(f"  failures          {result['failures']:10d}")
+    print("  handoff overhead (upstream completed -> downstream invoked):")
+    for edge, q in result["handoff_ms"].items():
+        print(f"    {edge:<34} p50 {q['p50']:8.3f} ms  p99 {q['p99']:8.3f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100, help="Workflow runs to measure.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Runs in flight at once.")
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Stub time to first token in ms: fixed:MS, uniform:LO:HI, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA.",
+    )
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Stub streaming rate (0 = no pacing).")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Stub reply length in tokens.")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=CHAIN_TOPOLOGY, help="Workflow shape to run.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+    if args.runs < 1 or args.concurrency < 1:
+        parser.error("--runs and --concurrency must be at least 1")
+
+    result = await _bench(args)
+    _print_report(result)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
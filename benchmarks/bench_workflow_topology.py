@@ -0,0 +1,99 @@
+"""Topology benchmark: chain vs fan-out/fan-in event-planning workflow on a stub model.
+
+Runs the same five agents in both shapes from `runtime.workflows`:
+
+- chain     coordinator -> venue -> catering -> budget_analyst -> booking
+- parallel  coordinator -> (venue | catering) -> join -> budget_analyst -> booking
+
+on `runtime.stub_client.StubChatClient` (per-call latency drawn from
+`--latency`, replies streamed at `--tokens-per-sec`), alternating topologies
+run by run so both see the same conditions. Reports end-to-end latency
+(p50/p90/p99, mean) per topology and the parallel speed-up. No Azure access:
+
+    python3 benchmarks/bench_workflow_topology.py --runs 30 --latency lognormal:800:0.5 --tokens-per-sec 60
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from runtime.histogram import LogHistogram  # noqa: E402
+from runtime.stub_client import StubChatClient  # noqa: E402
+from runtime.synthetic import LatencyModel  # noqa: E402
+from runtime.workflows import TOPOLOGIES, build_event_planning_workflow  # noqa: E402
+
+AGENTS = ("coordinator", "venue", "catering", "budget_analyst", "booking")
+PROMPT = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+
+
+async def _run_once(client: StubChatClient, topology: str) -> float:
+    coordinator, venue, catering, budget_analyst, booking = (
+        client.as_agent(name=name, instructions=f"You are the {name} specialist.") for name in AGENTS
+    )
+    workflow = build_event_planning_workflow(coordinator, [venue, catering], budget_analyst, booking, topology=topology)
+    start = time.perf_counter()
+    async for _ in workflow.run(PROMPT, stream=True):
+        pass
+    return (time.perf_counter() - start) * 1000.0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per topology.")
+    parser.add_argument(
+        "--latency",
+        default="lognormal:500:0.4",
+        help="Stub time to first token in ms: fixed:MS, uniform:LO:HI, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA.",
+    )
+    parser.add_argument("--tokens-per-sec", type=float, default=80.0, help="Stub streaming rate (0 = no pacing).")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Stub reply length in tokens.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the latency distribution.")
+    parser.add_argument("--output", type=Path, help="Write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    try:
+        latency = LatencyModel(args.latency, seed=args.seed)
+    except ValueError as ex:
+        parser.error(str(ex))
+    client = StubChatClient(latency=latency, tokens_per_sec=args.tokens_per_sec, reply_tokens=args.reply_tokens)
+
+    hists = {topology: LogHistogram() for topology in TOPOLOGIES}
+    for topology in TOPOLOGIES:  # warm-up
+        await _run_once(StubChatClient(), topology)
+    for _ in range(args.runs):
+        for topology in TOPOLOGIES:
+            hists[topology].record(await _run_once(client, topology))
+
+    print(
+        f"{args.runs} run(s) per topology (latency {args.latency}, "
+        f"{args.tokens_per_sec or 'unpaced'} tok/s, {args.reply_tokens} tokens/reply)"
+    )
+    print(f"  {'topology':<10} {'p50':>10} {'p90':>10} {'p99':>10} {'mean':>10}  (ms)")
+    result: dict = {
+        "benchmark": "workflow_topology",
+        "runs": args.runs,
+        "latency": args.latency,
+        "tokens_per_sec": args.tokens_per_sec,
+        "reply_tokens": args.reply_tokens,
+        "topologies": {},
+    }
+    for topology, hist in hists.items():
+        q = {"p50": hist.quantile(0.5), "p90": hist.quantile(0.9), "p99": hist.quantile(0.99), "mean": hist.mean}
+        result["topologies"][topology] = {k: round(v, 3) for k, v in q.items()}
+        print(f"  {topology:<10} {q['p50']:10.1f} {q['p90']:10.1f} {q['p99']:10.1f} {q['mean']:10.1f}")
+    speedup = hists["chain"].mean / hists["parallel"].mean
+    result["parallel_speedup"] = round(speedup, 3)
+    print(f"\n  parallel speed-up over chain: {speedup:.2f}x (mean end-to-end)")
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,52 +6,36 @@ module-level variable named `workflow`.
 We use Azure OpenAI (Demo 1) here for stability inside DevUI.
 """
 
-import os
-import socket
+import sys
 from pathlib import Path
-from urllib.parse import urlparse
 
 from agent_framework import WorkflowBuilder
 from agent_framework.openai import OpenAIChatCompletionClient
-from dotenv import dotenv_values
-
-
-# Load env vars from the repository root `.env`.
-# NOTE: In Dev Containers / Codespaces, vars may be injected as empty strings.
-_DOTENV_PATH = Path(__file__).resolve().parents[2] / ".env"
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
-
-
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
 
 
-def _check_endpoint_dns(url: str, env_name: str) -> None:
-    host = urlparse(url).hostname
-    if not host:
-        raise RuntimeError(f"{env_name} does not look like a valid URL: {url}")
-    socket.getaddrinfo(host, 443)
+# DevUI imports entities without `src/` on sys.path; add it so the shared
+# `runtime` package (fill-only `.env`, parsed once per process) is importable.
+_SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+if str(_SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(_SRC_DIR))
+
+from runtime import (  # noqa: E402
+    AZURE_OPENAI_REQUIRED,
+    check_endpoint_dns_sync,
+    get_config,
+    get_sync_credential,
+)
 
 
 # Demo 1 env vars
-_endpoint = _require_env("AZURE_OPENAI_ENDPOINT")
-_deployment = _require_env("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-_api_version = (os.getenv("AZURE_OPENAI_API_VERSION") or "").strip() or None
-_api_key = (os.getenv("AZURE_OPENAI_API_KEY") or "").strip()
+_config = get_config()
+_config.validate(*AZURE_OPENAI_REQUIRED)
+_endpoint = _config.azure_openai_endpoint
+_deployment = _config.azure_openai_chat_deployment_name
+_api_version = _config.azure_openai_api_version
+_api_key = _config.azure_openai_api_key or ""
 
-_check_endpoint_dns(_endpoint, "AZURE_OPENAI_ENDPOINT")
+check_endpoint_dns_sync(_endpoint, "AZURE_OPENAI_ENDPOINT")
 
 
 def _make_chat_client() -> OpenAIChatCompletionClient:
@@ -64,7 +48,7 @@ def _make_chat_client() -> OpenAIChatCompletionClient:
     Note: Many Azure OpenAI resources disable key-based auth.
     """
 
-    auth_mode = (os.getenv("AZURE_OPENAI_AUTH") or "").strip().lower()
+    auth_mode = _config.azure_openai_auth
 
     if auth_mode == "api_key":
         if not _api_key:
@@ -80,11 +64,10 @@ def _make_chat_client() -> OpenAIChatCompletionClient:
         )
 
     # Default: Entra ID (Azure CLI credential)
-    # Lazy import so DevUI discovery doesn't require azure-identity unless used.
-    from azure.identity import AzureCliCredential  # noqa: E402
-
+    # The shared sync credential imports azure-identity on first use, so DevUI
+    # discovery doesn't require it unless used, and shares the process token cache.
     return OpenAIChatCompletionClient(
-        credential=AzureCliCredential(),
+        credential=get_sync_credential(),
         azure_endpoint=_endpoint,
         model=_deployment,
         api_version=_api_version,
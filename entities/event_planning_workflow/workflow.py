@@ -1,62 +1,36 @@
-import os
 import shutil
-import socket
+import sys
 from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
 
-from agent_framework import MCPStdioTool, WorkflowBuilder
 from agent_framework.foundry import FoundryChatClient
-from azure.ai.projects.models import (
-    BingGroundingSearchConfiguration,
-    BingGroundingSearchToolParameters,
-    BingGroundingTool,
-)
-from dotenv import dotenv_values
-from azure.identity.aio import AzureCliCredential
 
 
-# Load env vars from the repository root `.env`.
-# NOTE: In Dev Containers / Codespaces, vars may be injected as empty strings.
+# DevUI imports entities without `src/` on sys.path; add it so the shared
+# `runtime` package (fill-only `.env`, parsed once per process) is importable.
 _REPO_ROOT = Path(__file__).resolve().parents[2]
-_DOTENV_PATH = _REPO_ROOT / ".env"
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
-
-
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
+_SRC_DIR = _REPO_ROOT / "src"
+if str(_SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(_SRC_DIR))
+
+from runtime import (  # noqa: E402
+    FOUNDRY_REQUIRED,
+    check_endpoint_dns_sync,
+    get_config,
+    get_credential,
+    get_project_client,
+    lazy_import,
+)
+from runtime.budget import budget_calculator_tool  # noqa: E402
+from runtime.deadlines import deadline_middleware  # noqa: E402
+from runtime.handoff import handoff_policy_from_config  # noqa: E402
+from runtime.mcp_local import in_process_tools, sequential_thinking_tool  # noqa: E402
+from runtime.result_cache import result_cache_middleware  # noqa: E402
+from runtime.speculation import speculation_from_config  # noqa: E402
+from runtime.workflows import build_event_planning_workflow  # noqa: E402
 
-
-def _check_project_endpoint_dns() -> None:
-    endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    host = urlparse(endpoint).hostname
-    if not host:
-        raise RuntimeError(
-            "FOUNDRY_PROJECT_ENDPOINT does not look like a valid URL. "
-            f"Got: {endpoint}"
-        )
-    try:
-        socket.getaddrinfo(host, 443)
-    except OSError as ex:
-        raise RuntimeError(
-            "Cannot resolve FOUNDRY_PROJECT_ENDPOINT host via DNS from this environment.\n\n"
-            f"  Host: {host}\n"
-            f"  Endpoint: {endpoint}\n\n"
-            "If your Foundry project uses private networking / private DNS, run this demo from a network that can resolve the private endpoint, "
-            "or switch to a public (non-private-link) project endpoint."
-        ) from ex
+# Loaded on first use (only when a Bing grounding tool is actually built).
+_projects_models = lazy_import("azure.ai.projects.models")
 
 
 def _require_command(cmd: str) -> str:
@@ -79,24 +53,14 @@ def _get_bing_tool_properties() -> dict:
     or the names commonly used in Foundry docs.
     """
 
-    connection_id = (
-        os.getenv("BING_CONNECTION_ID")
-        or os.getenv("BING_PROJECT_CONNECTION_ID")
-        or ""
-    ).strip()
+    config = get_config()
+
+    connection_id = config.bing_connection_id
     if connection_id:
         return {"connection_id": connection_id}
 
-    custom_connection_id = (
-        os.getenv("BING_CUSTOM_CONNECTION_ID")
-        or os.getenv("BING_CUSTOM_SEARCH_PROJECT_CONNECTION_ID")
-        or ""
-    ).strip()
-    custom_instance_name = (
-        os.getenv("BING_CUSTOM_INSTANCE_NAME")
-        or os.getenv("BING_CUSTOM_SEARCH_INSTANCE_NAME")
-        or ""
-    ).strip()
+    custom_connection_id = config.bing_custom_connection_id
+    custom_instance_name = config.bing_custom_instance_name
     if custom_connection_id and custom_instance_name:
         return {
             "custom_connection_id": custom_connection_id,
@@ -116,30 +80,34 @@ def _validate_environment() -> None:
 
     NOTE: We intentionally do *not* run this at import time so DevUI can start
     and list entities even when env vars are not configured yet.
+
+    Every agent factory calls this; the DNS answer is cached process-wide, so
+    only the first call (per TTL) performs a lookup.
     """
 
-    _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    _require_env("FOUNDRY_MODEL")
-    _check_project_endpoint_dns()
-    _require_command("npx")
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    check_endpoint_dns_sync(config.foundry_project_endpoint)
+    if "sequential-thinking" not in in_process_tools():
+        _require_command("npx")
 
 
 
 
 def _build_bing_grounding_tool() -> dict:
     """Build Foundry Bing Grounding tool dict from BING_CONNECTION_ID env var."""
-    connection_id = (os.getenv("BING_CONNECTION_ID") or os.getenv("BING_PROJECT_CONNECTION_ID") or "").strip()
+    connection_id = get_config().bing_connection_id
     if not connection_id:
         raise RuntimeError(
             "Hosted Bing grounding requires BING_CONNECTION_ID (or BING_PROJECT_CONNECTION_ID).\n"
             "Set it to the full ARM resource ID of a Bing.Grounding connection in your Foundry project."
         )
-    cfg = BingGroundingSearchConfiguration()
+    cfg = _projects_models.BingGroundingSearchConfiguration()
     cfg.project_connection_id = connection_id
     cfg.market = "en-US"
     cfg.count = 5
-    return BingGroundingTool(
-        bing_grounding=BingGroundingSearchToolParameters(search_configurations=[cfg])
+    return _projects_models.BingGroundingTool(
+        bing_grounding=_projects_models.BingGroundingSearchToolParameters(search_configurations=[cfg])
     ).as_dict()
 
 @lru_cache(maxsize=1)
@@ -147,15 +115,17 @@ def _get_client() -> FoundryChatClient:
     """Create and cache a single FoundryChatClient for the process."""
 
     # We pass explicit config so failures are easier to reason about in DevUI.
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    model_deployment_name = _require_env("FOUNDRY_MODEL")
+    config = get_config()
+    project_endpoint = config.foundry_project_endpoint
+    model_deployment_name = config.foundry_model
 
-    # NOTE: This SDK expects an async credential type.
-    cred = AzureCliCredential()
+    # NOTE: This SDK expects an async credential type. The shared credential
+    # caches tokens process-wide and refreshes them in the background.
+    cred = get_credential()
 
+    # The shared project client keeps one keep-alive HTTP pool for every agent.
     return FoundryChatClient(
-        credential=cred,
-        project_endpoint=project_endpoint,
+        project_client=get_project_client(project_endpoint, cred),
         model=model_deployment_name,
     )
 
@@ -169,14 +139,14 @@ def create_coordinator_agent():
             "You are the Event Coordinator, the workflow orchestrator for event planning. "
             "Use the sequential-thinking tool to break down tasks into clear steps before proceeding."
         ),
-        tools=[
-            MCPStdioTool(
-                name="sequential-thinking",
-                command="npx",
-                load_prompts=False,
-                args=["-y", "@modelcontextprotocol/server-sequential-thinking"],
-            )
-        ],
+        # The npx server is leased from the process-wide MCP server pool (runtime/mcp_pool.py),
+        # so it is spawned on the first run and reused by later runs and other agents; its tool
+        # listing comes from the on-disk MCP discovery cache (runtime/mcp_discovery.py).
+        # MCP_INPROCESS=sequential-thinking runs a Python port in-process instead (runtime/mcp_local.py).
+        tools=[sequential_thinking_tool()],
+        # RESULT_CACHE=1 replays stored results for identical inputs (runtime/result_cache.py);
+        # WORKFLOW_DEADLINE_SECONDS / WORKFLOW_HEDGE_AFTER_SECONDS apply to cache misses (runtime/deadlines.py).
+        middleware=[*result_cache_middleware(), *deadline_middleware()],
     )
 
 
@@ -192,6 +162,7 @@ def create_venue_agent():
         tools=[
             _build_bing_grounding_tool(),
         ],
+        middleware=[*result_cache_middleware(), *deadline_middleware()],
     )
 
 
@@ -207,6 +178,7 @@ def create_catering_agent():
         tools=[
             _build_bing_grounding_tool(),
         ],
+        middleware=[*result_cache_middleware(), *deadline_middleware()],
     )
 
 
@@ -217,11 +189,16 @@ def create_budget_analyst_agent():
         name="budget_analyst",
         instructions=(
             "You are the Budget Analyst. Create a reasonable per-person estimate and allocate costs across venue, catering, AV, staffing, and contingency. "
-            "When you need calculations, use the code interpreter tool."
+            "Use the budget_calculator tool for the estimate and the allocation, with unit costs from the venue and catering plans; "
+            "pass several headcounts or contingency rates to compare scenarios. "
+            "Use the code interpreter tool only for other calculations."
         ),
+        # budget_calculator runs in-process (runtime/budget.py); the code interpreter stays for free-form analysis.
         tools=[
+            budget_calculator_tool(),
             client.get_code_interpreter_tool().as_dict(),
         ],
+        middleware=[*result_cache_middleware(), *deadline_middleware()],
     )
 
 
@@ -234,6 +211,7 @@ def create_booking_agent():
             "You are the Event Booking Specialist. Synthesize all prior specialist outputs into one cohesive event plan. "
             "Use markdown headings and bullet points. Include an executive summary, venue, catering, budget, logistics, and next steps."
         ),
+        middleware=[*result_cache_middleware(), *deadline_middleware()],
     )
 
 
@@ -246,16 +224,17 @@ _catering = create_catering_agent()
 _budget_analyst = create_budget_analyst_agent()
 _booking = create_booking_agent()
 
-workflow = (
-    WorkflowBuilder(
-        name="Event Planning Workflow",
-        max_iterations=30,
-        start_executor=_coordinator,
-        output_executors=[_booking],
-    )
-    .add_edge(_coordinator, _venue)
-    .add_edge(_venue, _catering)
-    .add_edge(_catering, _budget_analyst)
-    .add_edge(_budget_analyst, _booking)
-    .build()
+# WORKFLOW_TOPOLOGY=parallel runs venue and catering at the same time (see runtime.workflows);
+# WORKFLOW_HANDOFF bounds the context each agent is handed (see runtime.handoff);
+# WORKFLOW_ROUTING=1 skips specialists the request does not need (see runtime.routing);
+# WORKFLOW_SPECULATION=1 starts catering on the coordinator's plan (see runtime.speculation).
+workflow = build_event_planning_workflow(
+    _coordinator,
+    [_venue, _catering],
+    _budget_analyst,
+    _booking,
+    topology=get_config().workflow_topology,
+    handoff=handoff_policy_from_config(),
+    routing=get_config().workflow_routing,
+    speculation=speculation_from_config(),
 )
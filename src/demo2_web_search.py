@@ -1,55 +1,22 @@
 import asyncio
-import os
-import socket
-from pathlib import Path
-from urllib.parse import urlparse
 
 from agent_framework.foundry import FoundryChatClient
 from agent_framework.exceptions import ChatClientInvalidResponseException
-from azure.ai.projects.models import (
-    BingGroundingSearchConfiguration,
-    BingGroundingSearchToolParameters,
-    BingGroundingTool,
-)
-from dotenv import dotenv_values
-from azure.identity.aio import AzureCliCredential
-
-
-# Optional: emit concise OpenTelemetry lines for agent/tool spans.
-# (If OpenTelemetry isn't available in your environment, we skip this.)
-try:
-    from agent_framework.observability import configure_otel_providers
-    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-except Exception:  # pragma: no cover
-    configure_otel_providers = None  # type: ignore[assignment]
-    SpanExporter = object  # type: ignore[misc,assignment]
-    SpanExportResult = None  # type: ignore[assignment]
-
 
-# Load env vars from the repository root `.env`.
-# NOTE: In Dev Containers, vars may be injected as empty strings via `containerEnv`.
-_DOTENV_PATH = Path(__file__).resolve().parents[1] / ".env"
-
-# We *do not* blindly override, because it's useful to be able to temporarily
-# override values via `VAR=... python ...` when debugging.
-# Instead, we fill only missing/empty environment variables from `.env`.
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
+from runtime import (
+    FOUNDRY_REQUIRED,
+    check_endpoint_dns,
+    close_http_pool,
+    configure_demo_tracing,
+    get_config,
+    get_credential,
+    get_project_client,
+    lazy_import,
+)
 
 
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
+# Loaded on first use (only when a Bing grounding tool is actually built).
+_projects_models = lazy_import("azure.ai.projects.models")
 
 
 def _build_bing_grounding_tool() -> dict:
@@ -64,7 +31,7 @@ def _build_bing_grounding_tool() -> dict:
         /subscriptions/<sub>/resourceGroups/<rg>/providers/Microsoft.CognitiveServices/
         accounts/<account>/projects/<project>/connections/<conn-name>
     """
-    connection_id = (os.getenv("BING_CONNECTION_ID") or os.getenv("BING_PROJECT_CONNECTION_ID") or "").strip()
+    connection_id = get_config().bing_connection_id
     if not connection_id:
         raise RuntimeError(
             "Hosted Bing grounding requires BING_CONNECTION_ID (or BING_PROJECT_CONNECTION_ID).\n"
@@ -74,123 +41,62 @@ def _build_bing_grounding_tool() -> dict:
             "/subscriptions/.../projects/<project>/connections/<conn-name>)."
         )
 
-    cfg = BingGroundingSearchConfiguration()
+    cfg = _projects_models.BingGroundingSearchConfiguration()
     cfg.project_connection_id = connection_id
     cfg.market = "en-US"
     cfg.count = 5
-    return BingGroundingTool(
-        bing_grounding=BingGroundingSearchToolParameters(search_configurations=[cfg])
+    return _projects_models.BingGroundingTool(
+        bing_grounding=_projects_models.BingGroundingSearchToolParameters(search_configurations=[cfg])
     ).as_dict()
 
 
-def _check_project_endpoint_dns() -> None:
-    """Fail fast if the Foundry project endpoint hostname cannot be resolved.
-
-    This commonly happens when:
-    - the endpoint value is mistyped, or
-    - the Foundry account/project is configured with private networking and
-      requires private DNS that is not available in the current environment.
-    """
-
-    endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    host = urlparse(endpoint).hostname
-    if not host:
-        raise RuntimeError(
-            "FOUNDRY_PROJECT_ENDPOINT does not look like a valid URL. "
-            f"Got: {endpoint}"
-        )
-    try:
-        socket.getaddrinfo(host, 443)
-    except OSError as ex:
-        raise RuntimeError(
-            "Cannot resolve FOUNDRY_PROJECT_ENDPOINT host via DNS from this environment.\n\n"
-            f"  Host: {host}\n"
-            f"  Endpoint: {endpoint}\n\n"
-            "If your Foundry project uses private networking / private DNS, run this demo from a network that can resolve the private endpoint, "
-            "or switch to a public (non-private-link) project endpoint."
-        ) from ex
-
-
-class _DemoSpanExporter(SpanExporter):
-    """Print one concise line per span (agent runs + tool calls)."""
-
-    def export(self, spans):  # type: ignore[override]
-        if SpanExportResult is None:
-            return None
-
-        for s in spans:
-            attrs = dict(getattr(s, "attributes", None) or {})
-            is_agent = "gen_ai.agent.name" in attrs or str(s.name).startswith("invoke_agent")
-            is_tool = (
-                "gen_ai.tool.name" in attrs
-                or "gen_ai.tool.call.id" in attrs
-                or "tool.name" in attrs
-                or "function.name" in attrs
-                or str(s.name).startswith(("run_tool", "invoke_tool"))
-            )
-            if not (is_agent or is_tool):
-                continue
-
-            agent = attrs.get("gen_ai.agent.name") or attrs.get("agent.name") or "-"
-            tool = (
-                attrs.get("gen_ai.tool.name")
-                or attrs.get("tool.name")
-                or attrs.get("function.name")
-                or "-"
-            )
-            op = attrs.get("gen_ai.operation.name") or attrs.get("operation.name") or "-"
-            kind = "TOOL" if is_tool else "AGENT"
-            print(f"[{kind}] name={s.name!s} op={op} agent={agent} tool={tool}")
-
-        return SpanExportResult.SUCCESS
-
-    def shutdown(self) -> None:
-        return None
-
-
 async def main() -> None:
     # Validate the minimum required configuration for Microsoft Foundry.
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    model = _require_env("FOUNDRY_MODEL")
-    _check_project_endpoint_dns()
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    project_endpoint = config.foundry_project_endpoint
+    model = config.foundry_model
+    await check_endpoint_dns(config.foundry_project_endpoint)
     bing_tool = _build_bing_grounding_tool()
 
-    async with AzureCliCredential() as cred:
-        # Microsoft Foundry chat client (Agent Framework 1.2.2)
-        client = FoundryChatClient(
-            project_endpoint=project_endpoint,
-            model=model,
-            credential=cred,
-        )
-        async with client.as_agent(
-            name="web_search",
-            instructions=(
-                "You are a web search expert who can find current information on the web "
-                "to help plan events and answer questions."
-            ),
-            tools=[bing_tool],
-        ) as agent:
-            try:
-                result = await agent.run(
-                    "What venue could hold 50 people on December 6th, 2026 in Seattle"
-                )
-            except ChatClientInvalidResponseException as ex:
-                msg = str(ex)
-                if "Failed to resolve model info" in msg:
-                    raise RuntimeError(
-                        "Microsoft Foundry could not resolve the model deployment specified by FOUNDRY_MODEL.\n\n"
-                        "What to check:\n"
-                        "- In the Foundry portal for this project, open 'Models + endpoints' and confirm the deployment name exists.\n"
-                        "- FOUNDRY_MODEL must be the Foundry project model deployment name (it is often NOT the same as your Azure OpenAI deployment name used in Demo 6).\n\n"
-                        "Current value:\n"
-                        f"  FOUNDRY_MODEL={os.environ.get('FOUNDRY_MODEL','')}\n"
-                    ) from ex
-                raise
-
-            print(result.text)
+    try:
+        async with get_credential() as cred:
+            # Microsoft Foundry chat client (Agent Framework 1.2.2)
+            client = FoundryChatClient(
+                project_client=get_project_client(project_endpoint, cred),
+                model=model,
+            )
+            async with client.as_agent(
+                name="web_search",
+                instructions=(
+                    "You are a web search expert who can find current information on the web "
+                    "to help plan events and answer questions."
+                ),
+                tools=[bing_tool],
+            ) as agent:
+                try:
+                    result = await agent.run(
+                        "What venue could hold 50 people on December 6th, 2026 in Seattle"
+                    )
+                except ChatClientInvalidResponseException as ex:
+                    msg = str(ex)
+                    if "Failed to resolve model info" in msg:
+                        raise RuntimeError(
+                            "Microsoft Foundry could not resolve the model deployment specified by FOUNDRY_MODEL.\n\n"
+                            "What to check:\n"
+                            "- In the Foundry portal for this project, open 'Models + endpoints' and confirm the deployment name exists.\n"
+                            "- FOUNDRY_MODEL must be the Foundry project model deployment name (it is often NOT the same as your Azure OpenAI deployment name used in Demo 6).\n\n"
+                            "Current value:\n"
+                            f"  FOUNDRY_MODEL={get_config().get('FOUNDRY_MODEL') or ''}\n"
+                        ) from ex
+                    raise
+
+                print(result.text)
+    finally:
+        # The project client and its connection pool are shared, so agents do not close them.
+        await close_http_pool()
 
 
 if __name__ == "__main__":
-    if configure_otel_providers is not None:
-        configure_otel_providers(exporters=[_DemoSpanExporter()])
+    configure_demo_tracing()
     asyncio.run(main())
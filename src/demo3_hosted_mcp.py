@@ -1,72 +1,20 @@
 import asyncio
-import os
 import shutil
-import socket
-from pathlib import Path
-from urllib.parse import urlparse
 
-from agent_framework import MCPStdioTool
 from agent_framework.exceptions import ChatClientInvalidResponseException
 from agent_framework.foundry import FoundryChatClient
-from azure.identity.aio import AzureCliCredential
-from dotenv import dotenv_values
 
-
-# Optional: emit concise OpenTelemetry lines for agent/tool spans.
-# (If OpenTelemetry isn't available in your environment, we skip this.)
-try:
-    from agent_framework.observability import configure_otel_providers
-    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-except Exception:  # pragma: no cover
-    configure_otel_providers = None  # type: ignore[assignment]
-    SpanExporter = object  # type: ignore[misc,assignment]
-    SpanExportResult = None  # type: ignore[assignment]
-
-
-# Load env vars from the repository root `.env`.
-# NOTE: In Dev Containers, vars may be injected as empty strings via `containerEnv`.
-_DOTENV_PATH = Path(__file__).resolve().parents[1] / ".env"
-
-# We *do not* blindly override, because it's useful to be able to temporarily
-# override values via `VAR=... python ...` when debugging.
-# Instead, we fill only missing/empty environment variables from `.env`.
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
-
-
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
-
-
-def _check_project_endpoint_dns() -> None:
-    endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    host = urlparse(endpoint).hostname
-    if not host:
-        raise RuntimeError(
-            "FOUNDRY_PROJECT_ENDPOINT does not look like a valid URL. "
-            f"Got: {endpoint}"
-        )
-    try:
-        socket.getaddrinfo(host, 443)
-    except OSError as ex:
-        raise RuntimeError(
-            "Cannot resolve FOUNDRY_PROJECT_ENDPOINT host via DNS from this environment.\n\n"
-            f"  Host: {host}\n"
-            f"  Endpoint: {endpoint}\n\n"
-            "If your Foundry project uses private networking / private DNS, run this demo from a network that can resolve the private endpoint, "
-            "or switch to a public (non-private-link) project endpoint."
-        ) from ex
+from runtime import (
+    FOUNDRY_REQUIRED,
+    check_endpoint_dns,
+    close_http_pool,
+    configure_demo_tracing,
+    get_config,
+    get_credential,
+    get_project_client,
+)
+from runtime.mcp_local import in_process_tools, sequential_thinking_tool
+from runtime.mcp_pool import close_mcp_pool, warm_mcp_servers
 
 
 def _require_command(cmd: str) -> str:
@@ -81,99 +29,69 @@ def _require_command(cmd: str) -> str:
     return resolved
 
 
-class _DemoSpanExporter(SpanExporter):
-    """Print one concise line per span (agent runs + tool calls)."""
-
-    def export(self, spans):  # type: ignore[override]
-        if SpanExportResult is None:
-            return None
-
-        for s in spans:
-            attrs = dict(getattr(s, "attributes", None) or {})
-            is_agent = "gen_ai.agent.name" in attrs or str(s.name).startswith("invoke_agent")
-            is_tool = (
-                "gen_ai.tool.name" in attrs
-                or "gen_ai.tool.call.id" in attrs
-                or "tool.name" in attrs
-                or "function.name" in attrs
-                or str(s.name).startswith(("run_tool", "invoke_tool"))
-            )
-            if not (is_agent or is_tool):
-                continue
-
-            agent = attrs.get("gen_ai.agent.name") or attrs.get("agent.name") or "-"
-            tool = (
-                attrs.get("gen_ai.tool.name")
-                or attrs.get("tool.name")
-                or attrs.get("function.name")
-                or "-"
-            )
-            op = attrs.get("gen_ai.operation.name") or attrs.get("operation.name") or "-"
-            kind = "TOOL" if is_tool else "AGENT"
-            print(f"[{kind}] name={s.name!s} op={op} agent={agent} tool={tool}")
-
-        return SpanExportResult.SUCCESS
-
-    def shutdown(self) -> None:
-        return None
-
-
 async def main() -> None:
     # Validate the minimum required configuration for Microsoft Foundry.
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    model = _require_env("FOUNDRY_MODEL")
-    _check_project_endpoint_dns()
-
-    # Demo 3 uses an MCP server started via npx.
-    _require_command("npx")
-
-    async with AzureCliCredential() as cred:
-        print("Creating client...")
-        client = FoundryChatClient(
-            project_endpoint=project_endpoint,
-            model=model,
-            credential=cred,
-        )
-        print("Creating agent...")
-        async with client.as_agent(
-            name="event_coordinator_specialist",
-            instructions=(
-                "You are the Event Coordinator Specialist, an expert in event planning and coordination. "
-                "Use the sequential-thinking tool to break down the planning into clear steps before answering."
-            ),
-            tools=[
-                MCPStdioTool(
-                    name="sequential-thinking",
-                    command="npx",
-                    load_prompts=False,
-                    args=["-y", "@modelcontextprotocol/server-sequential-thinking"],
-                )
-            ],
-        ) as agent:
-            print("Running agent...")
-            try:
-                result = await agent.run(
-                    "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
-                )
-            except ChatClientInvalidResponseException as ex:
-                msg = str(ex)
-                if "Failed to resolve model info" in msg:
-                    raise RuntimeError(
-                        "Microsoft Foundry could not resolve the model deployment specified by FOUNDRY_MODEL.\n\n"
-                        "What to check:\n"
-                        "- In the Foundry portal for this project, open 'Models + endpoints' and confirm the deployment name exists.\n"
-                        "- FOUNDRY_MODEL must be the Foundry project model deployment name.\n\n"
-                        "Current value:\n"
-                        f"  FOUNDRY_MODEL={os.environ.get('FOUNDRY_MODEL','')}\n"
-                    ) from ex
-                raise
-
-            print("Result:\n")
-            print(result.text)
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    project_endpoint = config.foundry_project_endpoint
+    model = config.foundry_model
+
+    # Demo 3 uses an MCP server started via npx. The process comes from the shared
+    # MCP server pool (runtime/mcp_pool.py); start it now so npx resolution overlaps
+    # the DNS check and client setup.
+    # MCP_INPROCESS=sequential-thinking runs a Python port in-process instead (runtime/mcp_local.py).
+    if "sequential-thinking" not in in_process_tools():
+        _require_command("npx")
+    sequential_thinking = sequential_thinking_tool()
+    warmup = asyncio.create_task(warm_mcp_servers(sequential_thinking))
 
+    try:
+        await check_endpoint_dns(config.foundry_project_endpoint)
+        async with get_credential() as cred:
+            print("Creating client...")
+            client = FoundryChatClient(
+                project_client=get_project_client(project_endpoint, cred),
+                model=model,
+            )
+            await warmup
+            print("Creating agent...")
+            async with client.as_agent(
+                name="event_coordinator_specialist",
+                instructions=(
+                    "You are the Event Coordinator Specialist, an expert in event planning and coordination. "
+                    "Use the sequential-thinking tool to break down the planning into clear steps before answering."
+                ),
+                tools=[sequential_thinking],
+            ) as agent:
+                print("Running agent...")
+                try:
+                    result = await agent.run(
+                        "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
+                    )
+                except ChatClientInvalidResponseException as ex:
+                    msg = str(ex)
+                    if "Failed to resolve model info" in msg:
+                        raise RuntimeError(
+                            "Microsoft Foundry could not resolve the model deployment specified by FOUNDRY_MODEL.\n\n"
+                            "What to check:\n"
+                            "- In the Foundry portal for this project, open 'Models + endpoints' and confirm the deployment name exists.\n"
+                            "- FOUNDRY_MODEL must be the Foundry project model deployment name.\n\n"
+                            "Current value:\n"
+                            f"  FOUNDRY_MODEL={get_config().get('FOUNDRY_MODEL') or ''}\n"
+                        ) from ex
+                    raise
+
+                print("Result:\n")
+                print(result.text)
+    finally:
+        # If the DNS check or login failed, the warm-up is still running (or its error unread).
+        warmup.cancel()
+        await asyncio.gather(warmup, return_exceptions=True)
+        await close_mcp_pool()
+        # The project client and its connection pool are shared, so agents do not close them.
+        await close_http_pool()
 
 
 if __name__ == "__main__":
-    if configure_otel_providers is not None:
-        configure_otel_providers(exporters=[_DemoSpanExporter()])
+    configure_demo_tracing()
     asyncio.run(main())
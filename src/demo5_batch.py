@@ -0,0 +1,155 @@
+"""Demo 5 batch mode: run the event-planning workflow for every prompt in a JSONL file.
+
+One client and one set of agents (from `demo5_workflow_edges._create_agent_factory`)
+serve the whole batch; each prompt gets its own workflow instance, and at most
+`--concurrency` workflows run at once. Each finished run is appended to the
+output JSONL straight away with the per-executor results:
+
+    {"id": "...", "prompt": "...", "topology": "chain",
+     "executors": {"coordinator": "...", "venue": "...", ...},
+     "output": "<booking's plan>", "status": "ok", "elapsed_s": 41.2}
+
+With `WORKFLOW_ROUTING=1`, specialists the router skipped are listed as
+`"skipped": {"venue": "virtual event"}`. Unless `WORKFLOW_TIMING=0`, each record
+also has `"timing"`: queue time, time to first token, streaming and total time
+per executor (see `runtime/executor_timing.py`; time to first token for every
+agent, not just booking, needs `WORKFLOW_STREAM_AGENTS=1`); the p50/p90 table
+over the whole batch is printed at exit.
+
+Re-running with the same output file skips prompts that already succeeded, so
+an interrupted batch resumes where it stopped. Input lines look like
+`{"id": "acme-offsite", "prompt": "Plan a ..."}` (see `runtime/batch.py`).
+
+    python3 -u src/demo5_batch.py prompts.jsonl --output results.jsonl --concurrency 4
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+from demo5_workflow_edges import (
+    _create_agent_factory,
+    _create_event_planning_agents,
+    _require_command,
+    _result_text,
+    _run_checkpoints,
+    _workflow_options,
+)
+from runtime import FOUNDRY_REQUIRED, check_endpoint_dns, configure_demo_tracing, get_config
+from runtime.batch import DEFAULT_CONCURRENCY, BatchPrompt, read_prompts, run_batch
+from runtime.checkpoints import checkpoints_enabled
+from runtime.executor_timing import RunTimer, timing_stats_from_config
+from runtime.mcp_local import in_process_tools, sequential_thinking_tool
+from runtime.mcp_pool import warm_mcp_servers
+from runtime.workflows import build_event_planning_workflow
+
+
+async def _run_prompt(agents: tuple, options: dict[str, Any], item: BatchPrompt) -> dict[str, Any]:
+    coordinator, venue, catering, budget_analyst, booking = agents
+    # A workflow instance runs one prompt at a time; the agents behind it are shared.
+    workflow = build_event_planning_workflow(
+        coordinator,
+        [venue, catering],
+        budget_analyst,
+        booking,
+        **options,
+    )
+    names = {getattr(a, "name", None) for a in agents}
+    executors: dict[str, str] = {}
+    skipped: dict[str, str] = {}
+    # With WORKFLOW_CHECKPOINTS=1 a prompt that failed part-way resumes from its last checkpoint.
+    # Keyed by item id too: two items with the same prompt text may run at the same time.
+    checkpoints = _run_checkpoints(item.prompt, options, run_key=item.id) if checkpoints_enabled() else None
+    if checkpoints is not None:
+        events = await checkpoints.run(workflow, item.prompt)
+        executors.update(checkpoints.completed)
+    else:
+        events = workflow.run(item.prompt, stream=True)
+    timing = timing_stats_from_config()
+    timer = RunTimer(timing, executors=names) if timing is not None else None
+    if timer is not None:
+        events = timer.observe(events)
+    async for event in events:
+        if event.type == "executor_bypassed" and event.executor_id is not None:
+            skipped[event.executor_id] = str(event.data)
+        if event.type == "executor_completed" and event.data is not None and event.executor_id is not None:
+            # Agents only; the join and handoff stages are plumbing.
+            if event.executor_id in names:
+                executors[event.executor_id] = _result_text(event.data)
+                if checkpoints is not None:
+                    checkpoints.record(event.executor_id, executors[event.executor_id])
+    if checkpoints is not None:
+        checkpoints.finish()
+    record: dict[str, Any] = {
+        "topology": options["topology"],
+        "executors": executors,
+        "output": executors.get("booking"),
+    }
+    if skipped:
+        record["skipped"] = skipped
+    if timer is not None:
+        record["timing"] = {t.executor_id: {k: v for k, v in t._asdict().items() if k != "executor_id"} for t in timer.timings}
+    if checkpoints is not None and checkpoints.resumed_from is not None:
+        record["resumed"] = True
+    return record
+
+
+def _report(record: dict[str, Any]) -> None:
+    detail = f" ({record['error']})" if record["status"] == "error" else ""
+    print(f"[{record['status']}] {record['id']} in {record['elapsed_s']:.1f}s{detail}", flush=True)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prompts", type=Path, help="JSONL file with one prompt per line.")
+    parser.add_argument("--output", type=Path, required=True, help="JSONL file results are appended to.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Workflows in flight at once (default {DEFAULT_CONCURRENCY}).",
+    )
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    prompts = read_prompts(args.prompts)
+
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    if "sequential-thinking" not in in_process_tools():
+        _require_command("npx")
+    warmup = asyncio.create_task(warm_mcp_servers(sequential_thinking_tool()))
+    await check_endpoint_dns(config.foundry_project_endpoint)
+    options = _workflow_options()
+
+    client, agent, close = await _create_agent_factory()
+    try:
+        await warmup
+        agents = await _create_event_planning_agents(client, agent)
+        summary = await run_batch(
+            prompts,
+            lambda item: _run_prompt(agents, options, item),
+            args.output,
+            concurrency=args.concurrency,
+            on_result=_report,
+        )
+    finally:
+        await close()
+
+    print(
+        f"\n{summary.succeeded} succeeded, {summary.failed} failed, {summary.skipped} skipped "
+        f"(already done) of {summary.total} prompt(s) in {summary.elapsed_s:.1f}s -> {args.output}"
+    )
+    if summary.failed:
+        print("Re-run the same command to retry the failed prompts.")
+
+
+if __name__ == "__main__":
+    configure_demo_tracing()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -1,78 +1,36 @@
 import asyncio
-import os
 import shutil
-import socket
 import sys
 from contextlib import AsyncExitStack
-from pathlib import Path
-from urllib.parse import urlparse
 
-from agent_framework import (
-    MCPStdioTool,
-    WorkflowBuilder,
-)
 from agent_framework.foundry import FoundryChatClient
-from azure.ai.projects.models import (
-    BingGroundingSearchConfiguration,
-    BingGroundingSearchToolParameters,
-    BingGroundingTool,
-)
 from agent_framework.exceptions import ChatClientInvalidResponseException
-from azure.identity.aio import AzureCliCredential
-from dotenv import dotenv_values
-
-
-# Optional: emit concise OpenTelemetry lines for agent/tool spans.
-# (If OpenTelemetry isn't available in your environment, we skip this.)
-try:
-    from agent_framework.observability import configure_otel_providers
-    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-except Exception:  # pragma: no cover
-    configure_otel_providers = None  # type: ignore[assignment]
-    SpanExporter = object  # type: ignore[misc,assignment]
-    SpanExportResult = None  # type: ignore[assignment]
-
-
-# Load env vars from the repository root `.env`.
-# NOTE: In Dev Containers / Codespaces, vars may be injected as empty strings.
-_DOTENV_PATH = Path(__file__).resolve().parents[1] / ".env"
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
-
-
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
+
+from runtime import (
+    FOUNDRY_REQUIRED,
+    check_endpoint_dns,
+    close_http_pool,
+    configure_demo_tracing,
+    get_config,
+    get_credential,
+    get_project_client,
+    lazy_import,
+)
+from runtime.budget import budget_calculator_tool
+from runtime.checkpoints import RunCheckpoints, checkpoints_enabled
+from runtime.deadlines import deadline_middleware
+from runtime.event_router import EventBatch, EventRouter, router_settings_from_config
+from runtime.executor_timing import RunTimer, timing_stats_from_config
+from runtime.handoff import handoff_policy_from_config
+from runtime.mcp_local import in_process_tools, sequential_thinking_tool
+from runtime.mcp_pool import close_mcp_pool, warm_mcp_servers
+from runtime.result_cache import result_cache_middleware
+from runtime.speculation import SpeculationOutcome, speculation_from_config
+from runtime.workflows import PARALLEL, build_event_planning_workflow
 
 
-def _check_project_endpoint_dns() -> None:
-    endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    host = urlparse(endpoint).hostname
-    if not host:
-        raise RuntimeError(
-            "FOUNDRY_PROJECT_ENDPOINT does not look like a valid URL. "
-            f"Got: {endpoint}"
-        )
-    try:
-        socket.getaddrinfo(host, 443)
-    except OSError as ex:
-        raise RuntimeError(
-            "Cannot resolve FOUNDRY_PROJECT_ENDPOINT host via DNS from this environment.\n\n"
-            f"  Host: {host}\n"
-            f"  Endpoint: {endpoint}\n\n"
-            "If your Foundry project uses private networking / private DNS, run this demo from a network that can resolve the private endpoint, "
-            "or switch to a public (non-private-link) project endpoint."
-        ) from ex
+# Loaded on first use (only when a Bing grounding tool is actually built).
+_projects_models = lazy_import("azure.ai.projects.models")
 
 
 def _print_header(title: str) -> None:
@@ -81,22 +39,22 @@ def _print_header(title: str) -> None:
     print("=" * 80)
 
 
-def _print_result_item(item: object) -> None:
-    # Many completion events wrap the payload in a single-item list.
+def _result_text(item: object) -> str:
+    """Best-effort text of an executor completion payload (also used by `demo5_batch.py`)."""
+
+    # Many completion events wrap the payload in a list. Streaming runs list the
+    # executor's response followed by every update it streamed; keep the response.
     if isinstance(item, list):
+        item = [sub for sub in item if getattr(sub, "agent_response", None) is not None] or item
         if len(item) == 1:
             item = item[0]
         else:
-            for sub in item:
-                _print_result_item(sub)
-                print()
-            return
+            return "\n\n".join(_result_text(sub) for sub in item)
 
     # Most common shape: an object with `.text`.
     text = getattr(item, "text", None)
     if isinstance(text, str) and text.strip():
-        print(text)
-        return
+        return text
 
     # Sometimes an executor completion wraps an agent response.
     agent_response = getattr(item, "agent_response", None)
@@ -104,14 +62,12 @@ def _print_result_item(item: object) -> None:
         # 1) Prefer plain text if available.
         text = getattr(agent_response, "text", None)
         if isinstance(text, str) and text.strip():
-            print(text)
-            return
+            return text
 
-        # 2) If structured output exists, print it (or recurse).
+        # 2) If structured output exists, use it (or recurse).
         value = getattr(agent_response, "value", None)
         if value is not None:
-            _print_result_item(value)
-            return
+            return _result_text(value)
 
         # 3) Some responses carry messages even when `.text` is empty.
         messages = getattr(agent_response, "messages", None)
@@ -119,24 +75,57 @@ def _print_result_item(item: object) -> None:
             for m in reversed(messages):
                 m_text = getattr(m, "text", None)
                 if isinstance(m_text, str) and m_text.strip():
-                    print(m_text)
-                    return
+                    return m_text
 
-        # 4) As a last attempt, print the last message in the full conversation.
+        # 4) As a last attempt, use the last message in the full conversation.
         full_conversation = getattr(item, "full_conversation", None)
         if isinstance(full_conversation, list) and full_conversation:
             for m in reversed(full_conversation):
                 m_text = getattr(m, "text", None)
                 if isinstance(m_text, str) and m_text.strip():
-                    print(m_text)
-                    return
+                    return m_text
+
+        # Fallback: the wrapped response object rather than the full wrapper repr.
+        return str(agent_response)
+
+    # Fall back to the object itself.
+    return str(item)
+
+
+def _print_result_item(item: object) -> None:
+    print(_result_text(item))
+
+
+def _workflow_options() -> dict:
+    """`build_event_planning_workflow()` keyword arguments from the WORKFLOW_* settings."""
 
-        # Fallback: print the wrapped response object rather than the full wrapper repr.
-        print(agent_response)
-        return
+    config = get_config()
+    return {
+        "topology": config.workflow_topology,
+        "handoff": handoff_policy_from_config(),
+        "routing": config.workflow_routing,
+        "speculation": speculation_from_config(),
+        # Every agent's first token is only timed when all agents stream (changes the graph).
+        "stream_agents": config.workflow_stream_agents,
+    }
 
-    # Fall back to printing the object itself.
-    print(item)
+
+def _run_checkpoints(prompt: str, options: dict, run_key: str | None = None) -> RunCheckpoints:
+    """Checkpoints for `prompt` under the workflow shape `options` builds (see `_workflow_options`).
+
+    `run_key` separates runs of the same prompt, e.g. the batch item id in `demo5_batch.py`.
+    """
+
+    handoff = options["handoff"]
+    return RunCheckpoints(
+        prompt,
+        topology=options["topology"],
+        handoff=str(handoff) if handoff is not None else None,
+        routing=options["routing"],
+        speculation=options["speculation"] is not None,
+        stream_agents=options["stream_agents"],
+        run_key=run_key,
+    )
 
 
 def _require_command(cmd: str) -> str:
@@ -151,100 +140,20 @@ def _require_command(cmd: str) -> str:
     return resolved
 
 
-def _get_bing_tool_properties() -> dict:
-    """Build Foundry web search tool configuration.
-
-    We accept either the env var names referenced by the Agent Framework runtime
-    or the names commonly used in Foundry docs.
-    """
-
-    # Standard Bing grounding
-    connection_id = (
-        os.getenv("BING_CONNECTION_ID")
-        or os.getenv("BING_PROJECT_CONNECTION_ID")
-        or ""
-    ).strip()
-    if connection_id:
-        return {"connection_id": connection_id}
-
-    # Custom Bing Search
-    custom_connection_id = (
-        os.getenv("BING_CUSTOM_CONNECTION_ID")
-        or os.getenv("BING_CUSTOM_SEARCH_PROJECT_CONNECTION_ID")
-        or ""
-    ).strip()
-    custom_instance_name = (
-        os.getenv("BING_CUSTOM_INSTANCE_NAME")
-        or os.getenv("BING_CUSTOM_SEARCH_INSTANCE_NAME")
-        or ""
-    ).strip()
-    if custom_connection_id and custom_instance_name:
-        return {
-            "custom_connection_id": custom_connection_id,
-            "custom_instance_name": custom_instance_name,
-        }
-
-    raise RuntimeError(
-        "Hosted web search requires a Bing connection. Set either:\n"
-        "  - BING_CONNECTION_ID (or BING_PROJECT_CONNECTION_ID)\n"
-        "  - OR BING_CUSTOM_CONNECTION_ID + BING_CUSTOM_INSTANCE_NAME\n"
-        "    (or BING_CUSTOM_SEARCH_PROJECT_CONNECTION_ID + BING_CUSTOM_SEARCH_INSTANCE_NAME)\n\n"
-        "You can create a 'Grounding with Bing Search' connection in the Foundry portal, then copy its project connection ID."
-    )
-
-
-class _DemoSpanExporter(SpanExporter):
-    """Print one concise line per span (agent runs + tool calls)."""
-
-    def export(self, spans):  # type: ignore[override]
-        if SpanExportResult is None:
-            return None
-
-        for s in spans:
-            attrs = dict(getattr(s, "attributes", None) or {})
-            is_agent = "gen_ai.agent.name" in attrs or str(s.name).startswith("invoke_agent")
-            is_tool = (
-                "gen_ai.tool.name" in attrs
-                or "gen_ai.tool.call.id" in attrs
-                or "tool.name" in attrs
-                or "function.name" in attrs
-                or str(s.name).startswith(("run_tool", "invoke_tool"))
-            )
-            if not (is_agent or is_tool):
-                continue
-
-            agent = attrs.get("gen_ai.agent.name") or attrs.get("agent.name") or "-"
-            tool = (
-                attrs.get("gen_ai.tool.name")
-                or attrs.get("tool.name")
-                or attrs.get("function.name")
-                or "-"
-            )
-            op = attrs.get("gen_ai.operation.name") or attrs.get("operation.name") or "-"
-            kind = "TOOL" if is_tool else "AGENT"
-            print(f"[{kind}] name={s.name!s} op={op} agent={agent} tool={tool}")
-
-        return SpanExportResult.SUCCESS
-
-    def shutdown(self) -> None:
-        return None
-
-
-
 def _build_bing_grounding_tool() -> dict:
     """Build Foundry Bing Grounding tool dict from BING_CONNECTION_ID env var."""
-    connection_id = (os.getenv("BING_CONNECTION_ID") or os.getenv("BING_PROJECT_CONNECTION_ID") or "").strip()
+    connection_id = get_config().bing_connection_id
     if not connection_id:
         raise RuntimeError(
             "Hosted Bing grounding requires BING_CONNECTION_ID (or BING_PROJECT_CONNECTION_ID).\n"
             "Set it to the full ARM resource ID of a Bing.Grounding connection in your Foundry project."
         )
-    cfg = BingGroundingSearchConfiguration()
+    cfg = _projects_models.BingGroundingSearchConfiguration()
     cfg.project_connection_id = connection_id
     cfg.market = "en-US"
     cfg.count = 5
-    return BingGroundingTool(
-        bing_grounding=BingGroundingSearchToolParameters(search_configurations=[cfg])
+    return _projects_models.BingGroundingTool(
+        bing_grounding=_projects_models.BingGroundingSearchToolParameters(search_configurations=[cfg])
     ).as_dict()
 
 async def _create_agent_factory() -> tuple[FoundryChatClient, callable, callable]:
@@ -256,144 +165,232 @@ async def _create_agent_factory() -> tuple[FoundryChatClient, callable, callable
     so they are cleaned up reliably.
     """
 
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    model = _require_env("FOUNDRY_MODEL")
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    project_endpoint = config.foundry_project_endpoint
+    model = config.foundry_model
 
     stack = AsyncExitStack()
-    cred = await stack.enter_async_context(AzureCliCredential())
+    cred = await stack.enter_async_context(get_credential())
 
     # FoundryChatClient is NOT an async context manager in 1.2.2; just instantiate it.
-    # The async cleanup happens when the credential leaves its async with block.
+    # All agents share one project client and HTTP connection pool; close() releases them.
     client = FoundryChatClient(
-        project_endpoint=project_endpoint,
+        project_client=get_project_client(project_endpoint, cred),
         model=model,
-        credential=cred,
     )
 
+    # RESULT_CACHE=1 replays stored agent results for identical inputs (see runtime/result_cache.py);
+    # WORKFLOW_DEADLINE_SECONDS / WORKFLOW_HEDGE_AFTER_SECONDS bound and hedge the model calls
+    # a cache miss makes (see runtime/deadlines.py).
+    agent_middleware = [*result_cache_middleware(), *deadline_middleware()]
+
     async def agent_factory(**kwargs):
+        kwargs.setdefault("middleware", agent_middleware)
         return await stack.enter_async_context(client.as_agent(**kwargs))
 
     async def close() -> None:
         await stack.aclose()
+        await close_mcp_pool()
+        await close_http_pool()
 
     return client, agent_factory, close
 
 
-async def main() -> None:
-    # Validate the minimum required configuration for Microsoft Foundry Agents.
-    _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    _require_env("FOUNDRY_MODEL")
-    _check_project_endpoint_dns()
+async def _create_event_planning_agents(client: FoundryChatClient, agent: callable) -> tuple:
+    """Create (coordinator, venue, catering, budget_analyst, booking) with `agent_factory`.
 
-    # Demo 5 uses an MCP server started via npx.
-    _require_command("npx")
+    The agents hold no per-run state, so one set can serve many workflow runs
+    (see `demo5_batch.py`); build a new workflow around them for each run.
+    """
 
-    # Demo 5 also uses Hosted Web Search (Bing grounding).
-    # Bing grounding will be wired via _build_bing_grounding_tool() in agent factory closures
+    coordinator = await agent(
+        name="coordinator",
+        instructions=(
+            "You are the Event Coordinator. You orchestrate a team of specialists to plan an event. "
+            "First, create a clear step-by-step plan for what each specialist must deliver, then proceed through the workflow. "
+            "Use the sequential-thinking tool to plan before answering."
+        ),
+        tools=[sequential_thinking_tool()],
+    )
 
-    client, agent, close = await _create_agent_factory()
-    try:
-        coordinator = await agent(
-            name="coordinator",
-            instructions=(
-                "You are the Event Coordinator. You orchestrate a team of specialists to plan an event. "
-                "First, create a clear step-by-step plan for what each specialist must deliver, then proceed through the workflow. "
-                "Use the sequential-thinking tool to plan before answering."
-            ),
-            tools=[
-                MCPStdioTool(
-                    name="sequential-thinking",
-                    command="npx",
-                    load_prompts=False,
-                    args=["-y", "@modelcontextprotocol/server-sequential-thinking"],
-                )
-            ],
-        )
+    venue = await agent(
+        name="venue",
+        instructions=(
+            "You are the Venue Specialist. Recommend venues for the event and justify your choices. "
+            "Consider capacity, location, accessibility, amenities, and vibe."
+        ),
+        tools=[
+            _build_bing_grounding_tool(),
+        ],
+    )
 
-        venue = await agent(
-            name="venue",
-            instructions=(
-                "You are the Venue Specialist. Recommend venues for the event and justify your choices. "
-                "Consider capacity, location, accessibility, amenities, and vibe."
-            ),
-            tools=[
-                _build_bing_grounding_tool(),
-            ],
-        )
+    catering = await agent(
+        name="catering",
+        instructions=(
+            "You are the Catering Coordinator. Propose food & beverage options for the event. "
+            "Include options for common dietary restrictions by default, and match the plan to the venue and schedule."
+        ),
+        tools=[
+            _build_bing_grounding_tool(),
+        ],
+    )
 
-        catering = await agent(
-            name="catering",
-            instructions=(
-                "You are the Catering Coordinator. Propose food & beverage options for the event. "
-                "Include options for common dietary restrictions by default, and match the plan to the venue and schedule."
-            ),
-            tools=[
-                _build_bing_grounding_tool(),
-            ],
-        )
+    budget_analyst = await agent(
+        name="budget_analyst",
+        instructions=(
+            "You are the Budget Analyst. Create a reasonable per-person estimate and allocate costs across venue, catering, AV, staffing, and contingency. "
+            "Use the budget_calculator tool for the estimate and the allocation, with unit costs from the venue and catering plans; "
+            "pass several headcounts or contingency rates to compare scenarios. "
+            "Use the code interpreter tool only for other calculations."
+        ),
+        # budget_calculator runs in-process (runtime/budget.py); the code interpreter stays for free-form analysis.
+        tools=[
+            budget_calculator_tool(),
+            client.get_code_interpreter_tool().as_dict(),
+        ],
+    )
 
-        budget_analyst = await agent(
-            name="budget_analyst",
-            instructions=(
-                "You are the Budget Analyst. Create a reasonable per-person estimate and allocate costs across venue, catering, AV, staffing, and contingency. "
-                "When you need calculations, use the code interpreter tool."
-            ),
-            tools=[
-                client.get_code_interpreter_tool().as_dict(),
-            ],
-        )
+    booking = await agent(
+        name="booking",
+        instructions=(
+            "You are the Event Booking Specialist. Synthesize all prior specialist outputs into one cohesive event plan. "
+            "Use markdown headings and bullet points. Include an executive summary, venue, catering, budget, logistics, and next steps."
+        ),
+    )
 
-        booking = await agent(
-            name="booking",
-            instructions=(
-                "You are the Event Booking Specialist. Synthesize all prior specialist outputs into one cohesive event plan. "
-                "Use markdown headings and bullet points. Include an executive summary, venue, catering, budget, logistics, and next steps."
-            ),
-        )
+    return coordinator, venue, catering, budget_analyst, booking
 
-        # Coordinator -> Venue -> Catering -> Budget -> Booking
-        # Agent Framework 1.2.2 requires `start_executor` and `output_executors` at builder construction.
-        workflow = (
-            WorkflowBuilder(
-                name="Event Planning Workflow",
-                max_iterations=30,
-                start_executor=coordinator,
-                output_executors=[booking],
-            )
-            .add_edge(coordinator, venue)
-            .add_edge(venue, catering)
-            .add_edge(catering, budget_analyst)
-            .add_edge(budget_analyst, booking)
-            .build()
-        )
 
-        _print_header(
-            "Demo 5: Multi-agent workflow (coordinator -> venue -> catering -> budget_analyst -> booking)"
+async def main() -> None:
+    # Validate the minimum required configuration for Microsoft Foundry Agents.
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+
+    # Demo 5 uses an MCP server started via npx; start it now so npx resolution
+    # overlaps the DNS check and client setup. With MCP_INPROCESS=sequential-thinking
+    # it runs in-process instead (runtime/mcp_local.py) and needs neither.
+    if "sequential-thinking" not in in_process_tools():
+        _require_command("npx")
+    warmup = asyncio.create_task(warm_mcp_servers(sequential_thinking_tool()))
+
+    try:
+        await check_endpoint_dns(config.foundry_project_endpoint)
+        options = _workflow_options()
+        topology = options["topology"]
+
+        # Demo 5 also uses Hosted Web Search (Bing grounding).
+        # Bing grounding will be wired via _build_bing_grounding_tool() in agent factory closures
+
+        client, agent, close = await _create_agent_factory()
+    except BaseException:
+        # Nothing owns the warm-up yet: stop it and the server it may have started.
+        warmup.cancel()
+        await asyncio.gather(warmup, return_exceptions=True)
+        await close_mcp_pool()
+        raise
+    try:
+        await warmup
+        coordinator, venue, catering, budget_analyst, booking = await _create_event_planning_agents(client, agent)
+
+        # Chain:    coordinator -> venue -> catering -> budget_analyst -> booking
+        # Parallel: coordinator -> (venue | catering) -> join -> budget_analyst -> booking
+        workflow = build_event_planning_workflow(
+            coordinator,
+            [venue, catering],
+            budget_analyst,
+            booking,
+            **options,
         )
 
+        if topology == PARALLEL:
+            _print_header(
+                "Demo 5: Multi-agent workflow (coordinator -> venue | catering -> budget_analyst -> booking)"
+            )
+        else:
+            _print_header(
+                "Demo 5: Multi-agent workflow (coordinator -> venue -> catering -> budget_analyst -> booking)"
+            )
+
         prompt = "Plan a corporate holiday party for 50 people on December 6th, 2026 in Seattle"
         print("Running workflow...\n")
 
         chain = ["coordinator", "venue", "catering", "budget_analyst", "booking"]
         completed: dict[str, object] = {}
-        final_output: object | None = None
+        skipped: dict[str, object] = {}
+        final_output: str | None = None
+
+        # WORKFLOW_CHECKPOINTS=1 checkpoints every superstep and resumes an unfinished run
+        # of the same prompt from the last finished executor (see runtime/checkpoints.py).
+        checkpoints = _run_checkpoints(prompt, options) if checkpoints_enabled() else None
+        finished = False
 
         try:
-            events = workflow.run(prompt, stream=True)
+            if checkpoints is not None:
+                events = await checkpoints.run(workflow, prompt)
+                if checkpoints.resumed_from is not None:
+                    completed.update(checkpoints.completed)
+                    print(f"Resuming from checkpoint (already finished: {', '.join(checkpoints.completed)})\n")
+            else:
+                events = workflow.run(prompt, stream=True)
+            # Queue time, time to first token, streaming and total time per agent, taken as
+            # events leave the workflow; a table is printed at exit (runtime/executor_timing.py).
+            timing = timing_stats_from_config()
+            if timing is not None:
+                events = RunTimer(timing, executors=chain).observe(events)
+            # In Agent Framework 1.2.2, all workflow events are unified into a single
+            # WorkflowEvent class with a `type` discriminator; the router dispatches on it.
+            # Streamed tokens arrive coalesced into batches, and a bounded queue keeps a
+            # slow console from buffering the whole stream (WORKFLOW_EVENT_* settings,
+            # see runtime/event_router.py).
+            router = EventRouter.from_settings(router_settings_from_config())
+            streamed: list[str] = []
             last_executor_id: str | None = None
-            async for event in events:
-                # In Agent Framework 1.2.2, all workflow events are unified into a
-                # single WorkflowEvent class with a `type` discriminator.
-                if event.type == "data":
-                    # Show which executor is currently producing updates (no token spam).
-                    if event.executor_id != last_executor_id:
-                        print(f"-> {event.executor_id}")
-                        last_executor_id = event.executor_id
-                elif event.type == "executor_completed":
-                    if event.data is not None and event.executor_id is not None:
-                        completed[event.executor_id] = event.data
-                elif event.type == "output":
-                    final_output = event.data
+
+            @router.on("data", payload=SpeculationOutcome)
+            def _on_speculation(event) -> None:
+                # WORKFLOW_SPECULATION=1: a specialist that started early was kept or re-run.
+                outcome = event.data
+                if outcome.hit:
+                    print(f"-> {outcome.executor_id}: speculative result kept ({outcome.saved_ms / 1000.0:.1f}s saved)")
+                else:
+                    print(f"-> {outcome.executor_id}: re-ran ({outcome.reason})")
+
+            def _on_progress(batch: EventBatch) -> None:
+                # Show which executor is currently producing updates (no token spam).
+                nonlocal last_executor_id
+                if batch.executor_id != last_executor_id:
+                    print(f"-> {batch.executor_id}")
+                    last_executor_id = batch.executor_id
+
+            @router.on("output")
+            def _on_output(batch: EventBatch) -> None:
+                _on_progress(batch)
+                # Every agent streams with WORKFLOW_STREAM_AGENTS=1; the final answer is booking's.
+                if batch.executor_id == chain[-1]:
+                    streamed.append(batch.text)
+
+            router.on("data", _on_progress)
+
+            @router.on("executor_bypassed")
+            def _on_bypassed(event) -> None:
+                # WORKFLOW_ROUTING=1: the router decided this specialist is not needed.
+                skipped[event.executor_id] = event.data
+                print(f"-> {event.executor_id} skipped ({event.data})")
+
+            @router.on("executor_completed")
+            def _on_completed(event) -> None:
+                # Agents only; the join and handoff stages are plumbing.
+                if event.data is not None and event.executor_id in chain:
+                    completed[event.executor_id] = event.data
+                    if checkpoints is not None:
+                        checkpoints.record(event.executor_id, _result_text(event.data))
+
+            await router.run(events)
+            final_output = "".join(streamed) or None
+            finished = True
+            if checkpoints is not None:
+                checkpoints.finish()
         except ChatClientInvalidResponseException as ex:
             msg = str(ex)
             if "Failed to resolve model info" in msg:
@@ -403,7 +400,7 @@ async def main() -> None:
                     "- In the Foundry portal for this project, open 'Models + endpoints' and confirm the deployment name exists.\n"
                     "- FOUNDRY_MODEL must be the Foundry project model deployment name (it is often NOT the same as your Azure OpenAI deployment name used in Demo 1).\n\n"
                     "Current value:\n"
-                    f"  FOUNDRY_MODEL={os.environ.get('FOUNDRY_MODEL','')}\n"
+                    f"  FOUNDRY_MODEL={get_config().get('FOUNDRY_MODEL') or ''}\n"
                 ) from ex
 
             # Common auth errors (RBAC / not logged in)
@@ -420,12 +417,22 @@ async def main() -> None:
                     "Azure CLI credential is not authenticated. Run `az login` and try again."
                 ) from ex
             raise
+        finally:
+            if checkpoints is not None and not finished and checkpoints.completed:
+                print(
+                    f"\nCheckpoint kept after: {', '.join(checkpoints.completed)}. "
+                    "Run again with WORKFLOW_CHECKPOINTS=1 to resume from there.",
+                    file=sys.stderr,
+                )
 
         print("\nWorkflow Result:\n")
 
         # Prefer per-executor completion payloads (most reliable for this pinned SDK).
         printed_any = False
         for executor_id in chain:
+            if executor_id in skipped:
+                print(f"### {executor_id}\n(skipped: {skipped[executor_id]})\n")
+                continue
             if executor_id not in completed:
                 continue
             printed_any = True
@@ -438,7 +445,7 @@ async def main() -> None:
             _print_result_item(final_output)
 
         # Optional pause for live demos; keep it opt-in to avoid blocking automation.
-        if os.getenv("DEMO_PAUSE", "").strip().lower() in {"1", "true", "yes"} and sys.stdin.isatty():
+        if (get_config().get("DEMO_PAUSE") or "").lower() in {"1", "true", "yes"} and sys.stdin.isatty():
             input("Press Enter to exit...")
 
     finally:
@@ -446,8 +453,7 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    if configure_otel_providers is not None:
-        configure_otel_providers(exporters=[_DemoSpanExporter()])
+    configure_demo_tracing()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
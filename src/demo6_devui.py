@@ -1,10 +1,11 @@
-import os
 import sys
 from pathlib import Path
 import socket
 
 from agent_framework.devui import serve
 
+from runtime import configure_latency_summary, get_config
+
 def main() -> None:
     # Ensure the repository root is on sys.path so `entities/` can be imported
     # when running this file directly (sys.path[0] becomes `src/`).
@@ -12,16 +13,18 @@ def main() -> None:
     if str(repo_root) not in sys.path:
         sys.path.insert(0, str(repo_root))
 
-    # Import the workflow entity (this module loads .env fill-only and validates config at runtime).
+    # Import the workflow entity (config comes from the shared `runtime` package; `.env` is parsed once).
     from entities.event_planning_workflow.workflow import workflow
 
+    config = get_config()
+
     # Default to auto_open=True for convenience, but allow disabling in headless environments.
-    no_open = (os.getenv("DEMO_NO_OPEN", "").strip().lower() in {"1", "true", "yes"})
+    no_open = ((config.get("DEMO_NO_OPEN") or "").lower() in {"1", "true", "yes"})
 
-    host = os.getenv("DEVUI_HOST", "0.0.0.0")
+    host = config.get("DEVUI_HOST") or "0.0.0.0"
     # Default to 8080 to match the Dev Container configuration (forwarded port) and the DevUI
     # documentation defaults. Override with DEVUI_PORT if you already use 8080 for something else.
-    port = int(os.getenv("DEVUI_PORT", "8080"))
+    port = int(config.get("DEVUI_PORT") or "8080")
 
     # Preflight: fail with a clear message if the port is already occupied.
     # (Uvicorn will raise Errno 98, but this is friendlier.)
@@ -41,6 +44,9 @@ def main() -> None:
     finally:
         sock.close()
 
+    # Per-agent / per-tool latency histograms; printed when DevUI stops (Ctrl+C).
+    configure_latency_summary()
+
     serve(
         entities=[workflow],
         host=host,
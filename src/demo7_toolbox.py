@@ -28,52 +28,18 @@ Run:
 """
 
 import asyncio
-import os
-import socket
-from pathlib import Path
-from urllib.parse import urlparse
 
 from agent_framework.foundry import FoundryAgent, FoundryChatClient, select_toolbox_tools
 from agent_framework.exceptions import AgentFrameworkException, ChatClientInvalidResponseException
-from azure.identity.aio import AzureCliCredential
-from dotenv import dotenv_values
-
-
-# Load env vars from the repository root `.env` (fill-only).
-_DOTENV_PATH = Path(__file__).resolve().parents[1] / ".env"
-_dotenv = dotenv_values(_DOTENV_PATH)
-for _k, _v in _dotenv.items():
-    if _v is None:
-        continue
-    _existing = os.getenv(_k)
-    if _existing is None or not _existing.strip():
-        os.environ[_k] = _v
-
-
-def _require_env(name: str) -> str:
-    value = (os.getenv(name) or "").strip()
-    if not value:
-        raise RuntimeError(
-            f"Required environment variable is missing or empty: {name}. "
-            "Set it via .env / export / Codespaces secrets and try again."
-        )
-    return value
-
 
-def _check_project_endpoint_dns() -> None:
-    endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    host = urlparse(endpoint).hostname
-    if not host:
-        raise RuntimeError(
-            f"FOUNDRY_PROJECT_ENDPOINT is not a valid URL: {endpoint}"
-        )
-    try:
-        socket.getaddrinfo(host, 443)
-    except OSError as ex:
-        raise RuntimeError(
-            f"Cannot resolve {host} via DNS. If your Foundry project uses private "
-            "networking, run this demo from a network with private DNS resolution."
-        ) from ex
+from runtime import (
+    FOUNDRY_REQUIRED,
+    check_endpoint_dns,
+    close_http_pool,
+    get_config,
+    get_credential,
+    get_project_client,
+)
 
 
 async def demo_toolbox_consumer() -> None:
@@ -82,7 +48,7 @@ async def demo_toolbox_consumer() -> None:
     Pre-requisite: a Toolbox named ${FOUNDRY_TOOLBOX_NAME} exists in your Foundry project,
     grouping (e.g.) a Bing web search and a code interpreter.
     """
-    toolbox_name = (os.getenv("FOUNDRY_TOOLBOX_NAME") or "").strip()
+    toolbox_name = get_config().foundry_toolbox_name
     if not toolbox_name:
         print(
             "[Toolbox demo] Skipped — FOUNDRY_TOOLBOX_NAME not set.\n"
@@ -91,14 +57,15 @@ async def demo_toolbox_consumer() -> None:
         )
         return
 
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    model = _require_env("FOUNDRY_MODEL")
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    project_endpoint = config.foundry_project_endpoint
+    model = config.foundry_model
 
-    async with AzureCliCredential() as cred:
+    async with get_credential() as cred:
         client = FoundryChatClient(
-            project_endpoint=project_endpoint,
+            project_client=get_project_client(project_endpoint, cred),
             model=model,
-            credential=cred,
         )
         try:
             # `select_toolbox_tools` accepts a list-of-tools (or dicts) and filters by
@@ -136,7 +103,7 @@ async def demo_toolbox_consumer() -> None:
 
 async def demo_hosted_agent_consumer() -> None:
     """Demonstrate connecting to an existing Hosted Agent V2."""
-    agent_name = (os.getenv("FOUNDRY_AGENT_NAME") or "").strip()
+    agent_name = get_config().foundry_agent_name
     if not agent_name:
         print(
             "[Hosted Agent demo] Skipped — FOUNDRY_AGENT_NAME not set.\n"
@@ -146,16 +113,16 @@ async def demo_hosted_agent_consumer() -> None:
         )
         return
 
-    project_endpoint = _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    agent_version = (os.getenv("FOUNDRY_AGENT_VERSION") or "").strip() or None
+    config = get_config()
+    project_endpoint = config.foundry_project_endpoint
+    agent_version = config.foundry_agent_version
 
-    async with AzureCliCredential() as cred:
+    async with get_credential() as cred:
         try:
             async with FoundryAgent(
-                project_endpoint=project_endpoint,
+                project_client=get_project_client(project_endpoint, cred),
                 agent_name=agent_name,
                 agent_version=agent_version,
-                credential=cred,
             ) as agent:
                 print(f"[Hosted Agent demo] Connected to Hosted Agent: {agent_name}")
                 if agent_version:
@@ -177,23 +144,27 @@ async def demo_hosted_agent_consumer() -> None:
 
 
 async def main() -> None:
-    _require_env("FOUNDRY_PROJECT_ENDPOINT")
-    _require_env("FOUNDRY_MODEL")
-    _check_project_endpoint_dns()
+    config = get_config()
+    config.validate(*FOUNDRY_REQUIRED)
+    await check_endpoint_dns(config.foundry_project_endpoint)
 
     print("=" * 80)
     print("Demo 7: Foundry Toolboxes + Hosted Agent V2 (Agent Framework 1.2.2)")
     print("=" * 80)
     print()
 
-    print(">> Part 1: Consume a Foundry Toolbox")
-    print("-" * 80)
-    await demo_toolbox_consumer()
-    print()
-
-    print(">> Part 2: Connect to a Hosted Agent")
-    print("-" * 80)
-    await demo_hosted_agent_consumer()
+    try:
+        print(">> Part 1: Consume a Foundry Toolbox")
+        print("-" * 80)
+        await demo_toolbox_consumer()
+        print()
+
+        print(">> Part 2: Connect to a Hosted Agent")
+        print("-" * 80)
+        await demo_hosted_agent_consumer()
+    finally:
+        # Both parts share one project client and connection pool.
+        await close_http_pool()
 
 
 if __name__ == "__main__":
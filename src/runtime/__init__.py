@@ -0,0 +1,81 @@
+"""Shared runtime helpers for the demos in `src/` and the DevUI entities.
+
+Scripts in `src/` import this package directly (`sys.path[0]` is `src/`).
+DevUI entities add `src/` to `sys.path` before importing it.
+"""
+
+from .config import (
+    AZURE_OPENAI_REQUIRED,
+    FOUNDRY_REQUIRED,
+    RuntimeConfig,
+    get_config,
+    reset_config,
+)
+from .credentials import (
+    SharedAzureCliCredential,
+    SharedSyncAzureCliCredential,
+    TokenCache,
+    get_credential,
+    get_sync_credential,
+    get_token_cache,
+)
+from .dns import (
+    EndpointResolver,
+    check_endpoint_dns,
+    check_endpoint_dns_sync,
+    get_resolver,
+    set_resolver,
+)
+from .histogram import HistogramSet, LogHistogram
+from .http import (
+    PooledTransport,
+    PoolSettings,
+    close_http_pool,
+    get_http_client,
+    get_project_client,
+    pool_settings_from_config,
+)
+from .lazy import LazyModule, lazy_import
+from .spans import SpanClassifier, SpanInfo, get_span_classifier
+from .tracing import (
+    configure_demo_tracing,
+    configure_latency_summary,
+    latency_summary_enabled,
+    tracing_enabled,
+)
+
+__all__ = [
+    "AZURE_OPENAI_REQUIRED",
+    "FOUNDRY_REQUIRED",
+    "EndpointResolver",
+    "HistogramSet",
+    "LazyModule",
+    "LogHistogram",
+    "PoolSettings",
+    "PooledTransport",
+    "RuntimeConfig",
+    "SharedAzureCliCredential",
+    "SharedSyncAzureCliCredential",
+    "SpanClassifier",
+    "SpanInfo",
+    "TokenCache",
+    "check_endpoint_dns",
+    "check_endpoint_dns_sync",
+    "close_http_pool",
+    "configure_demo_tracing",
+    "configure_latency_summary",
+    "get_config",
+    "get_credential",
+    "get_http_client",
+    "get_project_client",
+    "get_resolver",
+    "get_span_classifier",
+    "get_sync_credential",
+    "get_token_cache",
+    "latency_summary_enabled",
+    "lazy_import",
+    "pool_settings_from_config",
+    "reset_config",
+    "set_resolver",
+    "tracing_enabled",
+]
@@ -0,0 +1,146 @@
+"""Restartable, bounded-concurrency batch runs over a JSONL prompt file.
+
+Input (`read_prompts`): one prompt per line, either a JSON object with
+`prompt` and an optional `id` (other keys are kept and copied to the output),
+or a bare JSON string. Prompts without an `id` get one derived from their text,
+so ids stay stable when the file is edited or reordered.
+
+Output (`run_batch`): one JSON object per finished run, appended and flushed
+as soon as that run finishes, so a crash or Ctrl+C loses at most the runs still
+in flight. On restart, prompts whose id already has an `"status": "ok"` line in
+the output are skipped; failed runs are retried.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple
+
+DEFAULT_CONCURRENCY = 4
+
+
+class BatchPrompt(NamedTuple):
+    id: str
+    prompt: str
+    extra: dict[str, Any]
+
+
+class BatchSummary(NamedTuple):
+    total: int
+    skipped: int
+    succeeded: int
+    failed: int
+    elapsed_s: float
+
+
+def prompt_id(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def read_prompts(path: Path) -> list[BatchPrompt]:
+    """Parse a prompt JSONL file; duplicate ids keep their first occurrence."""
+
+    prompts: list[BatchPrompt] = []
+    seen: set[str] = set()
+    with path.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as ex:
+                raise RuntimeError(f"{path}:{lineno}: not valid JSON ({ex.msg}).") from ex
+            if isinstance(item, str):
+                item = {"prompt": item}
+            text = item.get("prompt") if isinstance(item, dict) else None
+            if not isinstance(text, str) or not text.strip():
+                raise RuntimeError(f'{path}:{lineno}: expected {{"prompt": "...", "id": "..."}} or a JSON string.')
+            pid = str(item.get("id") or prompt_id(text))
+            if pid in seen:
+                continue
+            seen.add(pid)
+            extra = {k: v for k, v in item.items() if k not in ("id", "prompt")}
+            prompts.append(BatchPrompt(pid, text, extra))
+    return prompts
+
+
+def completed_ids(path: Path) -> set[str]:
+    """Ids with a successful result in an existing output file (torn last lines are ignored)."""
+
+    done: set[str] = set()
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "ok" and "id" in record:
+                done.add(str(record["id"]))
+    return done
+
+
+async def run_batch(
+    prompts: Iterable[BatchPrompt],
+    run: Callable[[BatchPrompt], Awaitable[dict[str, Any]]],
+    output: Path,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> BatchSummary:
+    """Run `run(prompt)` for each pending prompt, at most `concurrency` at a time.
+
+    `run` returns the result fields to record; exceptions are recorded as
+    `"status": "error"` and do not stop the batch.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    start = time.perf_counter()
+    prompts = list(prompts)
+    done = completed_ids(output)
+    todo = [p for p in prompts if p.id not in done]
+    pending = iter(todo)
+    counts = {"ok": 0, "error": 0}
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as sink:
+        # A run interrupted mid-write leaves a torn line; start on a fresh one.
+        if sink.tell() and not output.read_bytes().endswith(b"\n"):
+            sink.write("\n")
+
+        async def worker() -> None:
+            # Workers pull from one shared iterator, so only `concurrency`
+            # runs (and tasks) exist at a time however long the batch is.
+            for item in pending:
+                t0 = time.perf_counter()
+                record: dict[str, Any] = {"id": item.id, "prompt": item.prompt, **item.extra}
+                try:
+                    record.update(await run(item))
+                    record["status"] = "ok"
+                except Exception as ex:
+                    record["status"] = "error"
+                    record["error"] = f"{type(ex).__name__}: {ex}"
+                record["elapsed_s"] = round(time.perf_counter() - t0, 3)
+                counts[record["status"]] += 1
+                # Single-threaded loop: each line is written and flushed whole.
+                sink.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                sink.flush()
+                if on_result is not None:
+                    on_result(record)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return BatchSummary(
+        total=len(prompts),
+        skipped=len(prompts) - len(todo),
+        succeeded=counts["ok"],
+        failed=counts["error"],
+        elapsed_s=round(time.perf_counter() - start, 3),
+    )
@@ -0,0 +1,173 @@
+"""Local budget calculator for the `budget_analyst` agent (NumPy, deterministic).
+
+`budget_analyst` used the hosted code interpreter for the same arithmetic on
+every run: a per-person estimate and an allocation across venue, catering, AV,
+staffing and contingency. Each call is a round trip to a remote sandbox, and
+the model writes (and sometimes gets wrong) the same few lines of Python.
+`budget_calculator_tool()` is an Agent Framework function tool that runs that
+allocation in-process instead, over a whole grid of scenarios at once:
+
+    venue       = venue_fixed + venue_per_person * headcount
+    catering    = catering_per_person * headcount
+    av          = av_fixed
+    staffing    = ceil(headcount / guests_per_staff) * staff_hourly_rate * event_hours
+    contingency = contingency_rate * (venue + catering + av + staffing)
+
+`allocate()` evaluates every (headcount, contingency rate) pair with NumPy
+broadcasting, so a sweep of 50 headcounts by 10 rates costs about as much as
+one scenario. With a `budget`, the tool also reports which scenarios fit and
+the largest headcount that fits at each contingency rate. Unit costs default
+to `CostModel()` and can be overridden per call from the venue and catering
+quotes earlier in the conversation.
+
+The agent keeps the code interpreter for free-form analysis the calculator
+does not cover.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+NumPy is imported on the first calculation.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated, Any, NamedTuple, Sequence
+
+from agent_framework import FunctionTool, tool
+
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+CATEGORIES = ("venue", "catering", "av", "staffing", "contingency")
+MAX_SCENARIOS = 500
+
+
+class CostModel(NamedTuple):
+    """Unit costs in USD (defaults: a mid-range corporate evening event)."""
+
+    venue_fixed: float = 2500.0
+    venue_per_person: float = 15.0
+    catering_per_person: float = 85.0
+    av_fixed: float = 1500.0
+    staff_hourly_rate: float = 45.0
+    event_hours: float = 5.0
+    guests_per_staff: float = 15.0
+
+
+DEFAULT_COSTS = CostModel()
+
+
+def allocate(
+    headcounts: Sequence[float], contingency_rates: Sequence[float], costs: CostModel = DEFAULT_COSTS
+) -> dict[str, Any]:
+    """Costs per category, total and per person for every (headcount, contingency rate) pair.
+
+    Every array has shape `(len(headcounts), len(contingency_rates))`; amounts
+    are rounded to cents.
+    """
+
+    heads = np.asarray(headcounts, dtype=float).reshape(-1, 1)
+    rates = np.asarray(contingency_rates, dtype=float).reshape(1, -1)
+    if heads.size == 0 or rates.size == 0:
+        raise ValueError("headcounts and contingency_rates must not be empty")
+    if (heads <= 0).any():
+        raise ValueError("headcounts must be positive")
+    if (rates < 0).any():
+        raise ValueError("contingency_rates must not be negative")
+    if any(value < 0 for value in costs) or costs.guests_per_staff <= 0:
+        raise ValueError("unit costs must not be negative and guests_per_staff must be positive")
+    if heads.size * rates.size > MAX_SCENARIOS:
+        raise ValueError(f"at most {MAX_SCENARIOS} scenarios per call (got {heads.size * rates.size})")
+
+    shape = (heads.size, rates.size)
+    venue = np.broadcast_to(costs.venue_fixed + costs.venue_per_person * heads, shape)
+    catering = np.broadcast_to(costs.catering_per_person * heads, shape)
+    av = np.full(shape, costs.av_fixed)
+    staff = np.ceil(heads / costs.guests_per_staff)
+    staffing = np.broadcast_to(staff * costs.staff_hourly_rate * costs.event_hours, shape)
+    subtotal = venue + catering + av + staffing
+    contingency = subtotal * rates
+    total = subtotal + contingency
+    return {
+        "headcount": np.broadcast_to(heads, shape),
+        "contingency_rate": np.broadcast_to(rates, shape),
+        "staff": np.broadcast_to(staff, shape),
+        "venue": np.round(venue, 2),
+        "catering": np.round(catering, 2),
+        "av": np.round(av, 2),
+        "staffing": np.round(staffing, 2),
+        "contingency": np.round(contingency, 2),
+        "total": np.round(total, 2),
+        "per_person": np.round(total / heads, 2),
+    }
+
+
+def _percent(rate: float) -> str:
+    # 0.125 -> "12.5%", 0.1 -> "10%" (`:.0%` would print 12.5% as "12%").
+    return f"{round(rate * 100, 4):g}%"
+
+
+def format_allocation(result: dict[str, Any], budget: float | None = None) -> str:
+    """Markdown table of `allocate()` output, one row per scenario, plus budget fit when given."""
+
+    header = "| headcount | contingency | venue | catering | AV | staffing | staff | contingency $ | total | per person |"
+    if budget is not None:
+        header += " within budget |"
+    lines = [header, "|" + "---|" * (header.count("|") - 1)]
+    fits = result["total"] <= budget if budget is not None else None
+    rows, cols = result["total"].shape
+    for i in range(rows):
+        for j in range(cols):
+            cells = [
+                f"{result['headcount'][i, j]:g}",
+                _percent(result["contingency_rate"][i, j]),
+                *(f"${result[k][i, j]:,.2f}" for k in ("venue", "catering", "av", "staffing")),
+                f"{result['staff'][i, j]:g}",
+                f"${result['contingency'][i, j]:,.2f}",
+                f"${result['total'][i, j]:,.2f}",
+                f"${result['per_person'][i, j]:,.2f}",
+            ]
+            if fits is not None:
+                cells.append("yes" if fits[i, j] else "no")
+            lines.append("| " + " | ".join(cells) + " |")
+    if fits is not None:
+        lines.append("")
+        lines.append(f"Largest headcount within ${budget:,.2f}:")
+        heads = np.where(fits, result["headcount"], np.nan)
+        for j in range(cols):
+            rate = _percent(result["contingency_rate"][0, j])
+            column = heads[:, j]
+            best = f"{np.nanmax(column):g}" if not np.isnan(column).all() else "none of the headcounts"
+            lines.append(f"- {rate} contingency: {best}")
+    return "\n".join(lines)
+
+
+def budget_calculator(
+    headcounts: Annotated[list[int], "Guest counts to price; pass several to compare scenarios."],
+    contingency_rates: Annotated[list[float] | None, "Contingency as fractions of the subtotal, e.g. [0.1, 0.15]."] = None,
+    budget: Annotated[float | None, "Total budget in USD; reports which scenarios fit."] = None,
+    venue_fixed: Annotated[float, "Venue rental, USD."] = DEFAULT_COSTS.venue_fixed,
+    venue_per_person: Annotated[float, "Venue per-guest fees, USD."] = DEFAULT_COSTS.venue_per_person,
+    catering_per_person: Annotated[float, "Food and beverage per guest, USD."] = DEFAULT_COSTS.catering_per_person,
+    av_fixed: Annotated[float, "Audio/visual package, USD."] = DEFAULT_COSTS.av_fixed,
+    staff_hourly_rate: Annotated[float, "Event staff hourly rate, USD."] = DEFAULT_COSTS.staff_hourly_rate,
+    event_hours: Annotated[float, "Staffed hours, including setup."] = DEFAULT_COSTS.event_hours,
+    guests_per_staff: Annotated[float, "Guests per staff member."] = DEFAULT_COSTS.guests_per_staff,
+) -> str:
+    """Allocate an event budget across venue, catering, AV, staffing and contingency.
+
+    Computes every combination of the given headcounts and contingency rates
+    and returns a table with per-category costs, the total and the per-person
+    cost. Use the quotes from the venue and catering plans for the unit costs.
+    """
+
+    costs = CostModel(
+        venue_fixed, venue_per_person, catering_per_person, av_fixed, staff_hourly_rate, event_hours, guests_per_staff
+    )
+    result = allocate(headcounts, contingency_rates or [0.1], costs)
+    return format_allocation(result, budget)
+
+
+def budget_calculator_tool() -> FunctionTool:
+    """`budget_calculator` as an Agent Framework function tool."""
+
+    return tool(budget_calculator)
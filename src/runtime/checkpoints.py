@@ -0,0 +1,146 @@
+"""Durable per-run checkpoints for the event-planning workflow, with resume.
+
+Agent Framework saves a `WorkflowCheckpoint` after every superstep when a run
+is given a `checkpoint_storage`. In the chain topology each superstep is one
+executor, so there is a checkpoint after every `executor_completed`; in the
+parallel topology venue and catering share a superstep and are checkpointed
+together.
+
+`RunCheckpoints` keeps one directory per (workflow, topology, handoff policy,
+routing, speculation, run key, prompt) under
+`.cache/checkpoints/`: the framework's `FileCheckpointStorage` files (written
+atomically, in `checkpoints/`) plus `completed.json`, the text result of every
+executor that finished, so a resumed run can still report all of them. `run()` resumes
+from the latest checkpoint when one exists and starts fresh otherwise;
+`finish()` deletes the directory once a run succeeds.
+
+    WORKFLOW_CHECKPOINTS=1         enable in Demo 5 / demo5_batch (off by default)
+    WORKFLOW_CHECKPOINT_DIR        root directory (default `.cache/checkpoints`)
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from agent_framework import FileCheckpointStorage, Workflow
+
+from .config import REPO_ROOT, get_config
+from .workflows import WORKFLOW_NAME
+
+DEFAULT_ROOT = REPO_ROOT / ".cache" / "checkpoints"
+_COMPLETED_FILE = "completed.json"
+
+
+def checkpoints_enabled() -> bool:
+    return (get_config().get("WORKFLOW_CHECKPOINTS") or "").lower() in {"1", "true", "yes", "on"}
+
+
+def checkpoint_root() -> Path:
+    return Path(get_config().get("WORKFLOW_CHECKPOINT_DIR") or DEFAULT_ROOT)
+
+
+class RunCheckpoints:
+    """Checkpoint directory for one prompt run; see the module docstring."""
+
+    def __init__(
+        self,
+        prompt: str,
+        *,
+        topology: str,
+        handoff: str | None = None,
+        routing: bool = False,
+        speculation: bool = False,
+        stream_agents: bool = False,
+        run_key: str | None = None,
+        workflow_name: str = WORKFLOW_NAME,
+        root: Path | None = None,
+    ) -> None:
+        # Handoff stages, the router, speculation and the `stream_agents` intake change
+        # the graph, so a run only resumes under the same settings (the defaults keep
+        # the original ids).
+        parts = [workflow_name, topology]
+        if handoff is not None:
+            parts.append(handoff)
+        if routing:
+            parts.append("routing")
+        if speculation:
+            parts.append("speculation")
+        if stream_agents:
+            parts.append("stream_agents")
+        # Runs of the same prompt that may be in flight together (e.g. batch items with
+        # their own ids) each need their own directory.
+        if run_key is not None:
+            parts.append(f"run:{run_key}")
+        run_key = json.dumps([*parts, prompt])
+        self.run_id = hashlib.sha256(run_key.encode("utf-8")).hexdigest()[:16]
+        self.workflow_name = workflow_name
+        self.directory = (root or checkpoint_root()) / self.run_id
+        # FileCheckpointStorage reads every *.json in its directory, so it gets its own.
+        self.storage = FileCheckpointStorage(self.directory / "checkpoints")
+        self.resumed_from: str | None = None
+        self._completed: dict[str, str] = self._load_completed()
+
+    # ----- per-executor results -----
+
+    def _load_completed(self) -> dict[str, str]:
+        path = self.directory / _COMPLETED_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+    @property
+    def completed(self) -> dict[str, str]:
+        """Executor id -> result text, for every executor that finished (including earlier attempts)."""
+
+        return dict(self._completed)
+
+    def record(self, executor_id: str, text: str) -> None:
+        """Persist one executor's result (atomic replace, so a crash never leaves half a file)."""
+
+        self._completed[executor_id] = text
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / _COMPLETED_FILE
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._completed, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # ----- run / resume -----
+
+    async def latest_checkpoint_id(self) -> str | None:
+        latest = await self.storage.get_latest(workflow_name=self.workflow_name)
+        return latest.checkpoint_id if latest is not None else None
+
+    async def run(self, workflow: Workflow, prompt: str, *, resume: bool = True) -> Any:
+        """Start `workflow.run(..., stream=True)` with checkpointing; resume when possible.
+
+        Returns the event stream. `resumed_from` names the checkpoint used, if any.
+        """
+
+        checkpoint_id = await self.latest_checkpoint_id() if resume else None
+        if checkpoint_id is None:
+            self.reset()
+            return workflow.run(prompt, stream=True, checkpoint_storage=self.storage)
+        self.resumed_from = checkpoint_id
+        return workflow.run(stream=True, checkpoint_id=checkpoint_id, checkpoint_storage=self.storage)
+
+    def reset(self) -> None:
+        """Drop checkpoints and results from earlier attempts."""
+
+        self.finish()
+        self.storage.storage_path.mkdir(parents=True, exist_ok=True)
+        self._completed = {}
+        self.resumed_from = None
+
+    def finish(self) -> None:
+        """Delete this run's checkpoints (call after the run succeeded)."""
+
+        shutil.rmtree(self.directory, ignore_errors=True)
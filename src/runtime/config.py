@@ -0,0 +1,246 @@
+"""Process-wide runtime configuration (fill-only `.env` + typed accessors).
+
+Every demo and DevUI entity used to parse the repository-root `.env` at import
+time. This module does it at most once per process, on first use, and hands
+out an immutable snapshot of the resulting environment.
+
+The fill-only rule is unchanged:
+- In Dev Containers / Codespaces, vars may be injected as empty strings.
+- We do NOT blindly override: `VAR=... python ...` must keep working.
+- So we fill only missing/empty environment variables from `.env`.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DOTENV_PATH = REPO_ROOT / ".env"
+
+# Minimum configuration for Microsoft Foundry (Demo 1-5, 7 and the event-planning entity).
+FOUNDRY_REQUIRED: tuple[str, ...] = ("FOUNDRY_PROJECT_ENDPOINT", "FOUNDRY_MODEL")
+# Minimum configuration for Azure OpenAI (ai_genius_workflow entity).
+AZURE_OPENAI_REQUIRED: tuple[str, ...] = (
+    "AZURE_OPENAI_ENDPOINT",
+    "AZURE_OPENAI_CHAT_DEPLOYMENT_NAME",
+)
+
+# Project path and model the stand-in server answers for (see `runtime.standin`).
+STANDIN_PROJECT_PATH = "/api/projects/standin"
+STANDIN_MODEL = "standin-model"
+
+_lock = threading.Lock()
+_config: RuntimeConfig | None = None
+
+
+def _fill_env_from_dotenv(path: Path) -> None:
+    # Imported lazily: python-dotenv is only needed on the first call.
+    from dotenv import dotenv_values
+
+    for key, value in dotenv_values(path).items():
+        if value is None:
+            continue
+        existing = os.getenv(key)
+        if existing is None or not existing.strip():
+            os.environ[key] = value
+
+
+def _apply_standin(env: Mapping[str, str]) -> dict[str, str]:
+    """Redirect every model endpoint to `LOCAL_STANDIN_URL` when it is set.
+
+    Endpoints and auth are overridden; model / deployment names are kept when
+    present, so the stand-in echoes what the demo would have used.
+    """
+
+    env = dict(env)
+    url = (env.get("LOCAL_STANDIN_URL") or "").strip().rstrip("/")
+    if not url:
+        return env
+    env["FOUNDRY_PROJECT_ENDPOINT"] = url + STANDIN_PROJECT_PATH
+    env["AZURE_OPENAI_ENDPOINT"] = url
+    env["AZURE_OPENAI_AUTH"] = "api_key"
+    env["AZURE_OPENAI_API_KEY"] = "standin"
+    for name in ("FOUNDRY_MODEL", "AZURE_OPENAI_CHAT_DEPLOYMENT_NAME"):
+        if not (env.get(name) or "").strip():
+            env[name] = STANDIN_MODEL
+    return env
+
+
+class RuntimeConfig:
+    """Immutable snapshot of the process environment after the `.env` fill.
+
+    A plain slotted class rather than a frozen dataclass: building the dataclass
+    costs more at import than parsing `.env` does.
+    """
+
+    __slots__ = ("_env",)
+
+    def __init__(self, env: Mapping[str, str]) -> None:
+        self._env = MappingProxyType(dict(env))
+
+    @property
+    def env(self) -> Mapping[str, str]:
+        return self._env
+
+    def get(self, *names: str) -> str | None:
+        """Return the first non-empty value among `names` (aliases), stripped."""
+
+        for name in names:
+            value = (self.env.get(name) or "").strip()
+            if value:
+                return value
+        return None
+
+    def require(self, name: str) -> str:
+        value = self.get(name)
+        if value is None:
+            raise RuntimeError(
+                f"Required environment variable is missing or empty: {name}. "
+                "Set it via .env / export / Codespaces secrets and try again."
+            )
+        return value
+
+    def validate(self, *names: str) -> None:
+        """Check all `names` in one pass and report every missing key at once."""
+
+        missing = [name for name in names if self.get(name) is None]
+        if len(missing) == 1:
+            self.require(missing[0])
+        if missing:
+            raise RuntimeError(
+                f"Required environment variables are missing or empty: {', '.join(missing)}. "
+                "Set them via .env / export / Codespaces secrets and try again."
+            )
+
+    @property
+    def standin_url(self) -> str | None:
+        """`LOCAL_STANDIN_URL`: all model traffic goes to a local stand-in server."""
+
+        return self.get("LOCAL_STANDIN_URL")
+
+    # ----- Microsoft Foundry -----
+
+    @property
+    def foundry_project_endpoint(self) -> str:
+        return self.require("FOUNDRY_PROJECT_ENDPOINT")
+
+    @property
+    def foundry_model(self) -> str:
+        return self.require("FOUNDRY_MODEL")
+
+    @property
+    def foundry_toolbox_name(self) -> str | None:
+        return self.get("FOUNDRY_TOOLBOX_NAME")
+
+    @property
+    def foundry_agent_name(self) -> str | None:
+        return self.get("FOUNDRY_AGENT_NAME")
+
+    @property
+    def foundry_agent_version(self) -> str | None:
+        return self.get("FOUNDRY_AGENT_VERSION")
+
+    # ----- Workflows -----
+
+    @property
+    def workflow_topology(self) -> str:
+        """`WORKFLOW_TOPOLOGY`: `chain` (default) or `parallel` for the event-planning workflow."""
+
+        topology = (self.get("WORKFLOW_TOPOLOGY") or "chain").lower()
+        if topology not in ("chain", "parallel"):
+            raise RuntimeError(
+                f"Invalid WORKFLOW_TOPOLOGY={topology!r}. "
+                "Use `chain` (specialists one after another) or `parallel` (venue and catering at the same time)."
+            )
+        return topology
+
+    @property
+    def workflow_stream_agents(self) -> bool:
+        """`WORKFLOW_STREAM_AGENTS=1`: surface every agent's streamed updates (see `runtime.executor_timing`)."""
+
+        return (self.get("WORKFLOW_STREAM_AGENTS") or "").lower() in {"1", "true", "yes", "on"}
+
+    @property
+    def workflow_routing(self) -> bool:
+        """`WORKFLOW_ROUTING=1`: skip specialists the request does not need (see `runtime.routing`)."""
+
+        return (self.get("WORKFLOW_ROUTING") or "").lower() in {"1", "true", "yes", "on"}
+
+    @property
+    def workflow_speculation(self) -> bool:
+        """`WORKFLOW_SPECULATION=1`: start later chain specialists early (see `runtime.speculation`)."""
+
+        enabled = (self.get("WORKFLOW_SPECULATION") or "").lower() in {"1", "true", "yes", "on"}
+        if enabled and self.workflow_routing and self.workflow_topology == "chain":
+            raise RuntimeError(
+                "WORKFLOW_SPECULATION=1 and WORKFLOW_ROUTING=1 cannot be combined in the chain topology. "
+                "Unset one of them (or use WORKFLOW_TOPOLOGY=parallel, where speculation has no effect)."
+            )
+        return enabled
+
+    # ----- Bing grounding -----
+    # We accept either the env var names referenced by the Agent Framework runtime
+    # or the names commonly used in Foundry docs.
+
+    @property
+    def bing_connection_id(self) -> str | None:
+        return self.get("BING_CONNECTION_ID", "BING_PROJECT_CONNECTION_ID")
+
+    @property
+    def bing_custom_connection_id(self) -> str | None:
+        return self.get("BING_CUSTOM_CONNECTION_ID", "BING_CUSTOM_SEARCH_PROJECT_CONNECTION_ID")
+
+    @property
+    def bing_custom_instance_name(self) -> str | None:
+        return self.get("BING_CUSTOM_INSTANCE_NAME", "BING_CUSTOM_SEARCH_INSTANCE_NAME")
+
+    # ----- Azure OpenAI -----
+
+    @property
+    def azure_openai_endpoint(self) -> str:
+        return self.require("AZURE_OPENAI_ENDPOINT")
+
+    @property
+    def azure_openai_chat_deployment_name(self) -> str:
+        return self.require("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
+
+    @property
+    def azure_openai_api_key(self) -> str | None:
+        return self.get("AZURE_OPENAI_API_KEY")
+
+    @property
+    def azure_openai_api_version(self) -> str | None:
+        return self.get("AZURE_OPENAI_API_VERSION")
+
+    @property
+    def azure_openai_auth(self) -> str:
+        return (self.get("AZURE_OPENAI_AUTH") or "").lower()
+
+
+def get_config() -> RuntimeConfig:
+    """Return the process-wide config, parsing `.env` on the first call only."""
+
+    global _config
+    config = _config
+    if config is not None:
+        return config
+    with _lock:
+        if _config is None:
+            _fill_env_from_dotenv(DOTENV_PATH)
+            _config = RuntimeConfig(_apply_standin(os.environ))
+        return _config
+
+
+def reset_config() -> None:
+    """Drop the cached snapshot so the next `get_config()` re-reads `.env`.
+
+    Intended for benchmarks and long-lived processes that edit `.env` on purpose.
+    """
+
+    global _config
+    with _lock:
+        _config = None
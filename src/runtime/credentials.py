@@ -0,0 +1,417 @@
+"""Process-wide Azure CLI token cache with background refresh.
+
+`AzureCliCredential` starts an `az account get-access-token` subprocess for
+every token it hands out, and each demo / entity used to keep its own
+instance. The credentials here wrap it with one token cache per process:
+
+- tokens are cached per (scopes, tenant);
+- a token entering its refresh window is refreshed in the background while
+  callers keep receiving the cached value;
+- concurrent refreshes of the same scope are coalesced into one `az` call.
+
+Callers only wait on `az` when no usable token exists yet (cold start).
+`azure.identity` is imported on first use, so importing this module is cheap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+# Refresh tokens this long before they expire (the CLI hands out ~60-90 min tokens).
+DEFAULT_REFRESH_WINDOW_SECONDS = 300.0
+# A cached token this close to expiry is not handed out at all.
+MIN_VALIDITY_SECONDS = 30.0
+# Background refreshes of one scope are at least this far apart, so a CLI that
+# keeps returning an already-stale token can't turn every request into an `az` call.
+MIN_REFRESH_INTERVAL_SECONDS = 30.0
+
+
+class _CachedToken(NamedTuple):
+    token: str
+    expires_on: int
+
+
+_Key = tuple[tuple[str, ...], str | None]
+
+
+class TokenCache:
+    """Thread-safe token store shared by the async and sync credentials."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: dict[_Key, _CachedToken] = {}
+        self.hits = 0
+        self.fetches = 0
+
+    def get(self, key: _Key) -> _CachedToken | None:
+        with self._lock:
+            return self._tokens.get(key)
+
+    def put(self, key: _Key, token: _CachedToken) -> None:
+        with self._lock:
+            self.fetches += 1
+            self._tokens[key] = token
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+_token_cache = TokenCache()
+
+
+def _key(scopes: tuple[str, ...], tenant_id: str | None) -> _Key:
+    return (tuple(sorted(scopes)), tenant_id)
+
+
+def _state(token: _CachedToken | None, refresh_window: float) -> str:
+    """Classify a cached token as "fresh", "stale" (usable, refresh now) or "expired"."""
+
+    if token is None:
+        return "expired"
+    remaining = token.expires_on - time.time()
+    if remaining <= MIN_VALIDITY_SECONDS:
+        return "expired"
+    if remaining <= refresh_window:
+        return "stale"
+    return "fresh"
+
+
+def _token_info(token: _CachedToken) -> Any:
+    from azure.core.credentials import AccessTokenInfo
+
+    return AccessTokenInfo(token.token, token.expires_on)
+
+
+def _access_token(token: _CachedToken) -> Any:
+    from azure.core.credentials import AccessToken
+
+    return AccessToken(token.token, token.expires_on)
+
+
+class SharedAzureCliCredential:
+    """Async `TokenCredential` backed by the process-wide token cache.
+
+    Use it like `azure.identity.aio.AzureCliCredential` (`async with`); entering
+    and leaving is reference counted, so one instance can be shared by every
+    client and agent in the process. Leaving the last context cancels pending
+    background refreshes; cached tokens survive for the next user.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_window: float = DEFAULT_REFRESH_WINDOW_SECONDS,
+        cache: TokenCache | None = None,
+        credential_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self._refresh_window = refresh_window
+        self._cache = cache or _token_cache
+        self._credential_factory = credential_factory
+        self._inner: Any = None
+        self._inflight: dict[_Key, asyncio.Task[_CachedToken]] = {}
+        self._timers: dict[_Key, asyncio.TimerHandle] = {}
+        self._last_background: dict[_Key, float] = {}
+        self._users = 0
+
+    def _credential(self) -> Any:
+        if self._inner is None:
+            if self._credential_factory is not None:
+                self._inner = self._credential_factory()
+            else:
+                from azure.identity.aio import AzureCliCredential
+
+                self._inner = AzureCliCredential()
+        return self._inner
+
+    async def _fetch(self, key: _Key, scopes: tuple[str, ...], tenant_id: str | None) -> _CachedToken:
+        kwargs = {"tenant_id": tenant_id} if tenant_id else {}
+        result = await self._credential().get_token(*scopes, **kwargs)
+        token = _CachedToken(result.token, int(result.expires_on))
+        self._cache.put(key, token)
+        self._schedule_refresh(key, scopes, tenant_id, token)
+        return token
+
+    def _refresh(self, key: _Key, scopes: tuple[str, ...], tenant_id: str | None) -> asyncio.Task[_CachedToken]:
+        """Start (or join) the single in-flight refresh for `key` on this loop."""
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return task
+        task = loop.create_task(self._fetch(key, scopes, tenant_id))
+        self._inflight[key] = task
+
+        def _done(t: asyncio.Task[_CachedToken]) -> None:
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            if not t.cancelled():
+                # Background failures keep the old token; the next foreground
+                # refresh (once it expires) raises to the caller.
+                t.exception()
+
+        task.add_done_callback(_done)
+        return task
+
+    def _schedule_refresh(
+        self, key: _Key, scopes: tuple[str, ...], tenant_id: str | None, token: _CachedToken
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        previous = self._timers.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+        delay = max(MIN_REFRESH_INTERVAL_SECONDS, token.expires_on - time.time() - self._refresh_window)
+        self._timers[key] = loop.call_later(delay, self._refresh, key, scopes, tenant_id)
+
+    def _background_due(self, key: _Key) -> bool:
+        now = time.monotonic()
+        if now - self._last_background.get(key, float("-inf")) < MIN_REFRESH_INTERVAL_SECONDS:
+            return False
+        self._last_background[key] = now
+        return True
+
+    async def _get(self, scopes: tuple[str, ...], tenant_id: str | None) -> _CachedToken:
+        key = _key(scopes, tenant_id)
+        cached = self._cache.get(key)
+        state = _state(cached, self._refresh_window)
+        if state == "fresh":
+            self._cache.record_hit()
+            return cached  # type: ignore[return-value]
+        if state == "stale":
+            self._cache.record_hit()
+            if self._background_due(key):
+                self._refresh(key, scopes, tenant_id)
+            return cached  # type: ignore[return-value]
+        return await asyncio.shield(self._refresh(key, scopes, tenant_id))
+
+    async def get_token(
+        self,
+        *scopes: str,
+        claims: str | None = None,
+        tenant_id: str | None = None,
+        enable_cae: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        if claims:
+            # Claims challenges (CAE) must reach the CLI; never serve them from cache.
+            return await self._credential().get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        return _access_token(await self._get(scopes, tenant_id))
+
+    async def get_token_info(self, *scopes: str, options: dict[str, Any] | None = None) -> Any:
+        options = options or {}
+        if options.get("claims"):
+            return await self._credential().get_token_info(*scopes, options=options)
+        return _token_info(await self._get(scopes, options.get("tenant_id")))
+
+    async def close(self) -> None:
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        if self._inner is not None:
+            inner, self._inner = self._inner, None
+            await inner.close()
+
+    async def __aenter__(self) -> SharedAzureCliCredential:
+        self._users += 1
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users == 0:
+            await self.close()
+
+
+class SharedSyncAzureCliCredential:
+    """Sync `TokenCredential` for clients that need one (e.g. `ai_genius_workflow`).
+
+    Shares the token cache with `SharedAzureCliCredential`. Stale tokens are
+    refreshed on a daemon thread; concurrent expired lookups wait on one `az` call
+    and share its token or its error.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_window: float = DEFAULT_REFRESH_WINDOW_SECONDS,
+        cache: TokenCache | None = None,
+        credential_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self._refresh_window = refresh_window
+        self._cache = cache or _token_cache
+        self._credential_factory = credential_factory
+        self._inner: Any = None
+        self._lock = threading.Lock()
+        self._key_locks: dict[_Key, threading.Lock] = {}
+        # key -> (time.monotonic() of the failure, error) of the last failed `az` call.
+        self._failures: dict[_Key, tuple[float, Exception]] = {}
+        self._background: set[_Key] = set()
+        self._last_background: dict[_Key, float] = {}
+
+    def _credential(self) -> Any:
+        with self._lock:
+            if self._inner is None:
+                if self._credential_factory is not None:
+                    self._inner = self._credential_factory()
+                else:
+                    from azure.identity import AzureCliCredential
+
+                    self._inner = AzureCliCredential()
+            return self._inner
+
+    def _key_lock(self, key: _Key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _fetch(self, key: _Key, scopes: tuple[str, ...], tenant_id: str | None) -> _CachedToken:
+        started = time.monotonic()
+        with self._key_lock(key):
+            # Another thread may have refreshed while we waited for the lock.
+            cached = self._cache.get(key)
+            if _state(cached, self._refresh_window) == "fresh":
+                return cached  # type: ignore[return-value]
+            # Or failed: share its error instead of queueing one more `az` call per waiter.
+            failure = self._failures.get(key)
+            if failure is not None and failure[0] >= started:
+                raise failure[1]
+            kwargs = {"tenant_id": tenant_id} if tenant_id else {}
+            try:
+                result = self._credential().get_token(*scopes, **kwargs)
+            except Exception as ex:
+                self._failures[key] = (time.monotonic(), ex)
+                raise
+            self._failures.pop(key, None)
+            token = _CachedToken(result.token, int(result.expires_on))
+            self._cache.put(key, token)
+            return token
+
+    def _refresh_in_background(self, key: _Key, scopes: tuple[str, ...], tenant_id: str | None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key in self._background:
+                return
+            if now - self._last_background.get(key, float("-inf")) < MIN_REFRESH_INTERVAL_SECONDS:
+                return
+            self._background.add(key)
+            self._last_background[key] = now
+
+        def _run() -> None:
+            try:
+                self._fetch(key, scopes, tenant_id)
+            except Exception:  # noqa: BLE001 - keep serving the cached token
+                pass
+            finally:
+                with self._lock:
+                    self._background.discard(key)
+
+        threading.Thread(target=_run, name="az-token-refresh", daemon=True).start()
+
+    def _get(self, scopes: tuple[str, ...], tenant_id: str | None) -> _CachedToken:
+        key = _key(scopes, tenant_id)
+        cached = self._cache.get(key)
+        state = _state(cached, self._refresh_window)
+        if state == "expired":
+            return self._fetch(key, scopes, tenant_id)
+        self._cache.record_hit()
+        if state == "stale":
+            self._refresh_in_background(key, scopes, tenant_id)
+        return cached  # type: ignore[return-value]
+
+    def get_token(
+        self,
+        *scopes: str,
+        claims: str | None = None,
+        tenant_id: str | None = None,
+        enable_cae: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        if claims:
+            return self._credential().get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        return _access_token(self._get(scopes, tenant_id))
+
+    def get_token_info(self, *scopes: str, options: dict[str, Any] | None = None) -> Any:
+        options = options or {}
+        if options.get("claims"):
+            return self._credential().get_token_info(*scopes, options=options)
+        return _token_info(self._get(scopes, options.get("tenant_id")))
+
+    def close(self) -> None:
+        with self._lock:
+            inner, self._inner = self._inner, None
+        if inner is not None:
+            inner.close()
+
+    def __enter__(self) -> SharedSyncAzureCliCredential:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+class _StandInToken:
+    """Static bearer token for a local stand-in server (no `az` call)."""
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        from azure.core.credentials import AccessToken
+
+        return AccessToken("standin", int(time.time()) + 3600)
+
+    def close(self) -> None:
+        return None
+
+
+class _AsyncStandInToken(_StandInToken):
+    async def get_token(self, *scopes: str, **kwargs: Any) -> Any:  # type: ignore[override]
+        return _StandInToken.get_token(self, *scopes)
+
+    async def close(self) -> None:  # type: ignore[override]
+        return None
+
+
+def _standin_enabled() -> bool:
+    from .config import get_config
+
+    return get_config().standin_url is not None
+
+
+_credential: SharedAzureCliCredential | None = None
+_sync_credential: SharedSyncAzureCliCredential | None = None
+_singleton_lock = threading.Lock()
+
+
+def get_credential() -> SharedAzureCliCredential:
+    """Return the process-wide async Azure CLI credential."""
+
+    global _credential
+    with _singleton_lock:
+        if _credential is None:
+            # With LOCAL_STANDIN_URL set there is nothing to log in to.
+            factory = _AsyncStandInToken if _standin_enabled() else None
+            _credential = SharedAzureCliCredential(cache=TokenCache() if factory else None, credential_factory=factory)
+        return _credential
+
+
+def get_sync_credential() -> SharedSyncAzureCliCredential:
+    """Return the process-wide sync Azure CLI credential (same token cache)."""
+
+    global _sync_credential
+    with _singleton_lock:
+        if _sync_credential is None:
+            factory = _StandInToken if _standin_enabled() else None
+            _sync_credential = SharedSyncAzureCliCredential(
+                cache=TokenCache() if factory else None, credential_factory=factory
+            )
+        return _sync_credential
+
+
+def get_token_cache() -> TokenCache:
+    return _token_cache
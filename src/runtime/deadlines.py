@@ -0,0 +1,327 @@
+"""Per-agent deadlines and hedged requests for workflow agents.
+
+Nothing bounds how long one agent run may take except the workflow's
+`max_iterations`, so a single slow reply from venue or budget_analyst stalls
+the whole chain. `DeadlineMiddleware` is an Agent Framework agent middleware
+(attach it after the result cache, `middleware=[*cache, *deadlines]`) that adds:
+
+- a deadline: the whole run, first token to last, must finish within N
+  seconds, or it is cancelled and `ExecutorDeadlineExceeded` (a TimeoutError)
+  fails the workflow; with `WORKFLOW_CHECKPOINTS=1` the next run resumes there;
+- a hedge: when the first update (streamed token, tool call, or the whole
+  response when not streaming) has not arrived within N seconds, the same
+  request is sent again. Whichever attempt answers first is kept, the other is
+  cancelled. A failed attempt does not win while the other is still running.
+  At most one duplicate is sent per run.
+
+Both are set per agent, like `WORKFLOW_HANDOFF`: one value for every agent or
+comma-separated `agent=seconds` pairs with `*` as the default:
+
+    WORKFLOW_DEADLINE_SECONDS=venue=60,budget_analyst=90,*=180
+    WORKFLOW_HEDGE_AFTER_SECONDS=venue=8,budget_analyst=8
+
+A hedge repeats the request, including any tool calls the model makes, so only
+hedge agents whose tools are safe to run twice (search, code interpreter).
+
+`DeadlineStats` counts runs, hedges fired, hedges won (the duplicate answered
+first) and missed deadlines per agent, with p50/p99 time to first update and
+run time; the configured policy prints the table at exit.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import sys
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, NamedTuple, TypeVar
+
+from agent_framework import AgentContext, AgentMiddleware, ResponseStream
+
+from .config import get_config
+from .histogram import HistogramSet
+
+T = TypeVar("T")
+
+# `__anext__` result of a stream that ended before its first update.
+_EMPTY = object()
+
+
+class ExecutorDeadlineExceeded(TimeoutError):
+    """An agent run did not finish within its deadline."""
+
+    def __init__(self, agent: str, seconds: float) -> None:
+        super().__init__(f"{agent} did not finish within its {seconds:g}s deadline")
+        self.agent = agent
+        self.seconds = seconds
+
+
+class PerAgent(NamedTuple):
+    """Seconds per agent name, with a default (None = off)."""
+
+    default: float | None = None
+    per_agent: dict[str, float | None] = {}
+
+    @classmethod
+    def parse(cls, spec: str) -> PerAgent:
+        """`seconds` for every agent, or comma-separated `agent=seconds` (`*` = default, 0 = off)."""
+
+        default: float | None = None
+        per_agent: dict[str, float | None] = {}
+        for entry in filter(None, (part.strip() for part in spec.split(","))):
+            agent, sep, value = entry.rpartition("=")
+            seconds = float(value)
+            if seconds < 0:
+                raise ValueError(f"{entry!r} is negative")
+            if not sep or agent.strip() == "*":
+                default = seconds or None
+            else:
+                per_agent[agent.strip()] = seconds or None
+        return cls(default, per_agent)
+
+    def for_agent(self, agent: str) -> float | None:
+        return self.per_agent.get(agent, self.default)
+
+    def __str__(self) -> str:
+        parts = [f"{agent}={seconds or 0:g}" for agent, seconds in self.per_agent.items()]
+        return ",".join([*parts, f"*={self.default or 0:g}"])
+
+
+class DeadlineStats:
+    """Per-agent run, hedge and deadline counters plus latency histograms (thread-safe)."""
+
+    COUNTERS = ("runs", "hedged", "hedge_won", "missed")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+        self.histograms = HistogramSet()
+
+    def count(self, agent: str, counter: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(agent, dict.fromkeys(self.COUNTERS, 0))
+            counts[counter] += 1
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            result: dict[str, dict[str, float]] = {agent: dict(counts) for agent, counts in self._counts.items()}
+        for (metric, agent), hist in self.histograms.items():
+            if agent in result:
+                result[agent][f"{metric}_p50_ms"] = round(hist.quantile(0.5), 1)
+                result[agent][f"{metric}_p99_ms"] = round(hist.quantile(0.99), 1)
+        return result
+
+    def format_table(self) -> str:
+        header = (
+            f"{'agent':<16} {'runs':>5} {'hedged':>7} {'won':>5} {'missed':>7} "
+            f"{'first p50':>9} {'first p99':>9} {'total p50':>9} {'total p99':>9}"
+        )
+        lines = ["Agent deadlines and hedging (ms):", header, "-" * len(header)]
+        for agent, s in self.snapshot().items():
+            cells = " ".join(
+                f"{s[key]:>9.1f}" if key in s else f"{'-':>9}"
+                for key in ("first_p50_ms", "first_p99_ms", "total_p50_ms", "total_p99_ms")
+            )
+            lines.append(
+                f"{agent:<16} {s['runs']:>5} {s['hedged']:>7} {s['hedge_won']:>5} {s['missed']:>7} {cells}"
+            )
+        return "\n".join(lines)
+
+
+class DeadlinePolicy:
+    """Deadline and hedge thresholds per agent, and shared `DeadlineStats`."""
+
+    def __init__(self, deadline: PerAgent = PerAgent(), hedge_after: PerAgent = PerAgent()) -> None:
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.stats = DeadlineStats()
+
+    def __str__(self) -> str:
+        return f"deadline {self.deadline}; hedge after {self.hedge_after}"
+
+
+def _consume(task: asyncio.Task[Any]) -> None:
+    # A cancelled or abandoned attempt must not log "exception was never retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+async def _call(context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> Any:
+    # One attempt: run the rest of the pipeline and take its result, leaving
+    # `context.result` as it was so concurrent attempts do not see each other's.
+    previous = context.result
+    await call_next()
+    result, context.result = context.result, previous
+    return result
+
+
+async def _first_update(context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> tuple[Any, Any]:
+    stream = await _call(context, call_next)
+    try:
+        return stream, await stream.__anext__()
+    except StopAsyncIteration:
+        return stream, _EMPTY
+
+
+class _Run:
+    """One agent run under a `DeadlinePolicy`."""
+
+    def __init__(self, policy: DeadlinePolicy, agent: str) -> None:
+        self.stats = policy.stats
+        self.agent = agent
+        self.deadline = policy.deadline.for_agent(agent)
+        self.hedge_after = policy.hedge_after.for_agent(agent)
+        self.started = 0.0
+        self.deadline_at: float | None = None
+        self.stream: ResponseStream[Any, Any] | None = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        if self.deadline is not None:
+            self.deadline_at = asyncio.get_running_loop().time() + self.deadline
+        self.stats.count(self.agent, "runs")
+
+    def _remaining(self) -> float | None:
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - asyncio.get_running_loop().time())
+
+    def _missed(self) -> ExecutorDeadlineExceeded:
+        self.stats.count(self.agent, "missed")
+        return ExecutorDeadlineExceeded(self.agent, self.deadline or 0.0)
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    async def race(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """First successful answer of `attempt()`, hedged once after `hedge_after` seconds."""
+
+        primary = asyncio.ensure_future(attempt())
+        hedge: asyncio.Future[T] | None = None
+        pending: set[asyncio.Future[T]] = {primary}
+        errors: list[BaseException] = []
+        try:
+            timeout = self._remaining()
+            if self.hedge_after is not None:
+                timeout = self.hedge_after if timeout is None else min(timeout, self.hedge_after)
+            done, _ = await asyncio.wait(pending, timeout=timeout)
+            if not done and self.hedge_after is not None and self._remaining() != 0.0:
+                hedge = asyncio.ensure_future(attempt())
+                pending.add(hedge)
+                self.stats.count(self.agent, "hedged")
+            while pending:
+                if not done:
+                    done, _ = await asyncio.wait(pending, timeout=self._remaining(), return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        raise self._missed()
+                # Prefer the primary when both landed in the same wake-up.
+                for task in sorted(done, key=lambda t: t is not primary):
+                    pending.discard(task)
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.count(self.agent, "hedge_won")
+                        self.stats.histograms.record("first", self.agent, self._elapsed_ms())
+                        return task.result()
+                    errors.append(task.exception())
+                done = set()
+            raise errors[0]
+        finally:
+            for task in (primary, hedge):
+                if task is not None:
+                    task.add_done_callback(_consume)
+                    if not task.done():
+                        task.cancel()
+
+    async def response(self, context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> Any:
+        self.start()
+        result = await self.race(lambda: _call(context, call_next))
+        self.stats.histograms.record("total", self.agent, self._elapsed_ms())
+        return result
+
+    async def updates(self, context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> AsyncIterator[Any]:
+        self.start()
+        self.stream, update = await self.race(lambda: _first_update(context, call_next))
+        stream = self.stream
+        while update is not _EMPTY:
+            yield update
+            try:
+                if self.deadline_at is None:
+                    update = await stream.__anext__()
+                else:
+                    # Per pull, not across the yield: the timeout must cancel this await only.
+                    try:
+                        update = await asyncio.wait_for(stream.__anext__(), self._remaining())
+                    except asyncio.TimeoutError:
+                        if self._remaining() == 0.0:
+                            raise self._missed() from None
+                        raise
+            except StopAsyncIteration:
+                update = _EMPTY
+        self.stats.histograms.record("total", self.agent, self._elapsed_ms())
+
+    async def final_response(self, updates: Any) -> Any:
+        # The winning attempt's own response (with its structured value and result hooks).
+        if self.stream is None:
+            raise RuntimeError(f"{self.agent}: no attempt answered")
+        return await self.stream.get_final_response()
+
+
+class DeadlineMiddleware(AgentMiddleware):
+    """Agent middleware enforcing a `DeadlinePolicy`; see the module docstring."""
+
+    def __init__(self, policy: DeadlinePolicy) -> None:
+        self.policy = policy
+
+    async def process(self, context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> None:
+        run = _Run(self.policy, getattr(context.agent, "name", None) or "agent")
+        if run.deadline is None and run.hedge_after is None:
+            await call_next()
+        elif context.stream:
+            # Attempts start when the caller pulls the first update, like the stream they replace.
+            context.result = ResponseStream(run.updates(context, call_next), finalizer=run.final_response)
+        else:
+            context.result = await run.response(context, call_next)
+
+
+_policy: DeadlinePolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def deadline_policy_from_config() -> DeadlinePolicy | None:
+    """Process-wide policy from `WORKFLOW_DEADLINE_SECONDS` / `WORKFLOW_HEDGE_AFTER_SECONDS`, or None."""
+
+    global _policy
+    config = get_config()
+    deadline = (config.get("WORKFLOW_DEADLINE_SECONDS") or "").strip()
+    hedge_after = (config.get("WORKFLOW_HEDGE_AFTER_SECONDS") or "").strip()
+    if not deadline and not hedge_after:
+        return None
+    with _policy_lock:
+        if _policy is None:
+            try:
+                _policy = DeadlinePolicy(PerAgent.parse(deadline), PerAgent.parse(hedge_after))
+            except ValueError as ex:
+                raise RuntimeError(
+                    f"Invalid deadline settings: {ex}. WORKFLOW_DEADLINE_SECONDS and WORKFLOW_HEDGE_AFTER_SECONDS "
+                    "take seconds, e.g. `120` or `venue=60,budget_analyst=90,*=180`."
+                ) from ex
+            atexit.register(print_deadline_stats, _policy)
+        return _policy
+
+
+def deadline_middleware() -> list[DeadlineMiddleware]:
+    """`middleware=` entries for an agent: the configured policy, or empty when disabled."""
+
+    policy = deadline_policy_from_config()
+    return [DeadlineMiddleware(policy)] if policy is not None else []
+
+
+def print_deadline_stats(policy: DeadlinePolicy | None = None) -> None:
+    """Print the per-agent table to stderr (registered at exit for the configured policy)."""
+
+    policy = policy or _policy
+    if policy is not None and policy.stats.snapshot():
+        print(policy.stats.format_table(), file=sys.stderr)
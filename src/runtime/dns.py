@@ -0,0 +1,200 @@
+"""Process-wide, TTL-cached DNS pre-check for service endpoints.
+
+The demos fail fast when the Foundry / Azure OpenAI endpoint host cannot be
+resolved (typo, or private networking without private DNS). Doing that with a
+blocking `socket.getaddrinfo` inside `async def main()` stalls the event loop,
+and the DevUI entity used to repeat it for every agent it built.
+
+`EndpointResolver` resolves through the running loop's `getaddrinfo`, caches
+both answers and failures for a TTL, and coalesces concurrent lookups of the
+same host into one query. One instance is shared per process (`get_resolver()`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlparse
+
+# (host, port) -> getaddrinfo() result list
+AsyncGetAddrInfo = Callable[[str, int], Awaitable[list[Any]]]
+SyncGetAddrInfo = Callable[[str, int], list[Any]]
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 30.0
+
+
+class EndpointResolver:
+    """Resolve hostnames with positive/negative TTL caching.
+
+    `getaddrinfo` / `getaddrinfo_sync` can be replaced with a local stub
+    resolver (any callable taking `(host, port)`) to run without network access.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        getaddrinfo: AsyncGetAddrInfo | None = None,
+        getaddrinfo_sync: SyncGetAddrInfo | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._getaddrinfo = getaddrinfo
+        self._getaddrinfo_sync = getaddrinfo_sync or socket.getaddrinfo
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (host, port) -> (expires_at, addresses or the OSError that was raised)
+        self._cache: dict[tuple[str, int], tuple[float, list[Any] | OSError]] = {}
+        self._inflight: dict[tuple[str, int], asyncio.Future[list[Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: tuple[str, int]) -> list[Any] | OSError | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, answer = entry
+            if self._clock() >= expires_at:
+                del self._cache[key]
+                return None
+            self.hits += 1
+            return answer
+
+    def _store(self, key: tuple[str, int], answer: list[Any] | OSError) -> None:
+        ttl = self._negative_ttl if isinstance(answer, OSError) else self._ttl
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (self._clock() + ttl, answer)
+
+    @staticmethod
+    def _unwrap(answer: list[Any] | OSError) -> list[Any]:
+        if isinstance(answer, OSError):
+            # Raise a fresh copy so cached failures don't accumulate tracebacks.
+            raise type(answer)(*answer.args)
+        return answer
+
+    async def resolve(self, host: str, port: int = 443) -> list[Any]:
+        """Resolve `host` without blocking the event loop. Raises `OSError` on failure."""
+
+        key = (host, port)
+        cached = self._lookup(key)
+        if cached is not None:
+            return self._unwrap(cached)
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[list[Any]] = loop.create_future()
+        self._inflight[key] = future
+        try:
+            try:
+                if self._getaddrinfo is not None:
+                    answer: list[Any] | OSError = await self._getaddrinfo(host, port)
+                else:
+                    answer = await loop.getaddrinfo(host, port)
+            except OSError as ex:
+                answer = ex
+            self._store(key, answer)
+            if isinstance(answer, OSError):
+                future.set_exception(type(answer)(*answer.args))
+            else:
+                future.set_result(answer)
+            # Nobody else may be waiting; mark the exception as retrieved.
+            future.exception()
+            return self._unwrap(answer)
+        except BaseException as ex:
+            if not future.done():
+                future.set_exception(ex)
+                future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def resolve_sync(self, host: str, port: int = 443) -> list[Any]:
+        """Blocking variant for import-time callers (DevUI entities). Shares the cache."""
+
+        key = (host, port)
+        cached = self._lookup(key)
+        if cached is None:
+            try:
+                cached = self._getaddrinfo_sync(host, port)
+            except OSError as ex:
+                cached = ex
+            self._store(key, cached)
+        return self._unwrap(cached)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_resolver = EndpointResolver()
+
+
+def get_resolver() -> EndpointResolver:
+    """Return the process-wide resolver."""
+
+    return _resolver
+
+
+def set_resolver(resolver: EndpointResolver) -> None:
+    """Replace the process-wide resolver (e.g. with one backed by a stub resolver)."""
+
+    global _resolver
+    _resolver = resolver
+
+
+def _endpoint_host(endpoint: str, env_name: str) -> str:
+    host = urlparse(endpoint).hostname
+    if not host:
+        raise RuntimeError(
+            f"{env_name} does not look like a valid URL. "
+            f"Got: {endpoint}"
+        )
+    return host
+
+
+def _dns_error(host: str, endpoint: str, env_name: str) -> RuntimeError:
+    return RuntimeError(
+        f"Cannot resolve {env_name} host via DNS from this environment.\n\n"
+        f"  Host: {host}\n"
+        f"  Endpoint: {endpoint}\n\n"
+        "If your project uses private networking / private DNS, run this demo from a network that can resolve the private endpoint, "
+        "or switch to a public (non-private-link) endpoint."
+    )
+
+
+async def check_endpoint_dns(endpoint: str, env_name: str = "FOUNDRY_PROJECT_ENDPOINT") -> None:
+    """Fail fast if the endpoint hostname cannot be resolved.
+
+    This commonly happens when:
+    - the endpoint value is mistyped, or
+    - the Foundry account/project is configured with private networking and
+      requires private DNS that is not available in the current environment.
+    """
+
+    host = _endpoint_host(endpoint, env_name)
+    try:
+        await get_resolver().resolve(host, 443)
+    except OSError as ex:
+        raise _dns_error(host, endpoint, env_name) from ex
+
+
+def check_endpoint_dns_sync(endpoint: str, env_name: str = "FOUNDRY_PROJECT_ENDPOINT") -> None:
+    """Blocking `check_endpoint_dns` for code that runs outside an event loop."""
+
+    host = _endpoint_host(endpoint, env_name)
+    try:
+        get_resolver().resolve_sync(host, 443)
+    except OSError as ex:
+        raise _dns_error(host, endpoint, env_name) from ex
@@ -0,0 +1,460 @@
+"""Dispatch-table router for workflow event streams.
+
+Demo 5 used to walk every streamed event through an `if event.type == ...`
+chain, and a long answer streams one `output` event per token. `EventRouter`
+replaces the chain with a dict lookup:
+
+- `router.on("executor_completed", handler)` registers a handler for an event
+  type; `router.on("data", handler, payload=SpeculationOutcome)` narrows it to
+  events whose `data` is an instance of a payload class (checked first). The
+  route for each (type, payload class) pair is resolved once and cached.
+- Token-level types named in `coalesce` (e.g. `output`, `data`) are folded
+  into an `EventBatch` per executor and flushed every `max_batch` events,
+  `window_ms` after the batch opened, or as soon as another executor or an
+  uncoalesced event shows up, so handlers still see events in stream order.
+  Handlers for a coalesced type receive the `EventBatch`, not single events.
+- `router.run(events)` pumps the stream through a bounded queue
+  (`queue_size`). When a slow sink (the console, a socket) falls behind, the
+  producer blocks on the full queue, which stops the workflow stream from
+  being pulled, so the backlog cannot grow without bound. With
+  `drop_when_full=True`, coalesced events are dropped instead of blocking
+  (progress displays only; control events always block).
+
+Handlers may be plain functions or coroutines. Any object with `type`,
+`executor_id` and `data` attributes can be routed, so this module has no
+Agent Framework import. `RouterStats` counts events, batches, unhandled events,
+drops, the deepest queue and the time the producer spent blocked.
+
+Settings for the demos come from the environment (`.env` is honoured):
+    WORKFLOW_EVENT_WINDOW_MS  coalescing window for streamed tokens (default 50, 0 = size only)
+    WORKFLOW_EVENT_BATCH      events per batch before a flush (default 64, 1 = one batch per event)
+    WORKFLOW_EVENT_QUEUE      bounded queue size between stream and sinks (default 256, 0 = no queue)
+
+Not re-exported from `runtime`; import it from `runtime.event_router`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, NamedTuple
+
+from .config import get_config
+
+DEFAULT_WINDOW_MS = 50.0
+DEFAULT_MAX_BATCH = 64
+DEFAULT_QUEUE_SIZE = 256
+
+Handler = Callable[[Any], Any]
+
+_END = object()
+
+
+class EventBatch(NamedTuple):
+    """Consecutive events of one coalesced type from one executor, in stream order."""
+
+    type: str
+    executor_id: str | None
+    events: list[Any]
+
+    @property
+    def data(self) -> list[Any]:
+        return [event.data for event in self.events]
+
+    @property
+    def text(self) -> str:
+        """Concatenated `.text` of the payloads (streamed tokens back into a chunk)."""
+
+        return "".join(getattr(event.data, "text", None) or "" for event in self.events)
+
+
+class RouterSettings(NamedTuple):
+    window_ms: float = DEFAULT_WINDOW_MS
+    max_batch: int = DEFAULT_MAX_BATCH
+    queue_size: int = DEFAULT_QUEUE_SIZE
+
+
+def _number(name: str, default: float, cast: type) -> Any:
+    raw = get_config().get(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError as ex:
+        raise RuntimeError(f"{name} must be a number. Got: {raw}") from ex
+    if value < 0:
+        raise RuntimeError(f"{name} must be zero or greater. Got: {raw}")
+    return value
+
+
+def router_settings_from_config() -> RouterSettings:
+    """Read `WORKFLOW_EVENT_WINDOW_MS`, `WORKFLOW_EVENT_BATCH` and `WORKFLOW_EVENT_QUEUE`."""
+
+    return RouterSettings(
+        window_ms=_number("WORKFLOW_EVENT_WINDOW_MS", DEFAULT_WINDOW_MS, float),
+        max_batch=max(1, _number("WORKFLOW_EVENT_BATCH", DEFAULT_MAX_BATCH, int)),
+        queue_size=_number("WORKFLOW_EVENT_QUEUE", DEFAULT_QUEUE_SIZE, int),
+    )
+
+
+class RouterStats:
+    """Counters for one router (single event loop, so no lock)."""
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.batches = 0
+        self.dropped = 0
+        self.unhandled = 0
+        self.max_queue_depth = 0
+        self.blocked_ms = 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "unhandled": self.unhandled,
+            "max_queue_depth": self.max_queue_depth,
+            "blocked_ms": round(self.blocked_ms, 1),
+        }
+
+    def format_stats(self) -> str:
+        s = self.snapshot()
+        return (
+            f"Event router: {s['events']} event(s), {s['batches']} batch(es), {s['dropped']} dropped, queue depth <= {s['max_queue_depth']}, "
+            f"producer blocked {s['blocked_ms']:.0f} ms"
+        )
+
+
+class _Route(NamedTuple):
+    handlers: tuple[tuple[Handler, bool], ...]  # (handler, is coroutine function)
+    is_async: bool  # any handler is a coroutine function
+    coalesce: bool
+    by_payload: dict[type, _Route] | None  # set when the type has payload-specific handlers
+
+
+def _make_route(handlers: tuple[tuple[Handler, bool], ...], coalesce: bool, by_payload: dict | None) -> _Route:
+    return _Route(handlers, any(is_async for _, is_async in handlers), coalesce, by_payload)
+
+
+class _Channel:
+    """Bounded FIFO between the stream and the sinks.
+
+    `asyncio.Queue` costs about a microsecond per item; this is a deque plus
+    one waiter future per side, and the consumer drains without awaiting
+    while items are buffered.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.items: deque[Any] = deque()
+        self.size = size
+        self._readable: asyncio.Future[None] | None = None
+        self._writable: asyncio.Future[None] | None = None
+
+    def put_nowait(self, item: Any) -> None:
+        self.items.append(item)
+        readable = self._readable
+        if readable is not None:
+            self._readable = None
+            if not readable.done():
+                readable.set_result(None)
+
+    async def put(self, item: Any) -> None:
+        while len(self.items) >= self.size:
+            self._writable = asyncio.get_running_loop().create_future()
+            await self._writable
+        self.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        item = self.items.popleft()
+        writable = self._writable
+        if writable is not None:
+            self._writable = None
+            if not writable.done():
+                writable.set_result(None)
+        return item
+
+    async def wait_readable(self, timeout: float | None) -> bool:
+        """Wait for an item (False when `timeout` seconds passed first)."""
+
+        if self.items:
+            return True
+        self._readable = asyncio.get_running_loop().create_future()
+        if timeout is None:
+            await self._readable
+            return True
+        try:
+            await asyncio.wait_for(self._readable, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class EventRouter:
+    """Route workflow events to per-type handlers; see the module docstring."""
+
+    def __init__(
+        self,
+        *,
+        coalesce: Iterable[str] = (),
+        window_ms: float = 0.0,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        queue_size: int = 0,
+        drop_when_full: bool = False,
+    ) -> None:
+        self.coalesce = frozenset(coalesce)
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.queue_size = queue_size
+        self.drop_when_full = drop_when_full
+        self.stats = RouterStats()
+        self._by_type: dict[str, list[tuple[Handler, bool]]] = {}
+        self._by_payload: dict[str, list[tuple[type, Handler, bool]]] = {}
+        self._default: tuple[Handler, bool] | None = None
+        self._routes: dict[str, _Route] = {}
+        # event type -> its only handler, for plain sync routes (one dict lookup per event)
+        self._direct: dict[str, Handler] = {}
+        self._batch: EventBatch | None = None
+        self._appendable = False  # the open batch's type has no payload-specific handlers
+        self._opened = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: RouterSettings, *, coalesce: Iterable[str] = ("data", "output")) -> EventRouter:
+        return cls(
+            coalesce=coalesce,
+            window_ms=settings.window_ms,
+            max_batch=settings.max_batch,
+            queue_size=settings.queue_size,
+        )
+
+    # ----- Registration -----
+
+    def on(self, event_type: str, handler: Handler | None = None, *, payload: type | None = None) -> Any:
+        """Register `handler` for `event_type` (and `payload` class); usable as a decorator."""
+
+        def register(fn: Handler) -> Handler:
+            entry = (fn, inspect.iscoroutinefunction(fn))
+            if payload is None:
+                self._by_type.setdefault(event_type, []).append(entry)
+            else:
+                self._by_payload.setdefault(event_type, []).append((payload, *entry))
+            self._routes.clear()
+            self._direct.clear()
+            return fn
+
+        return register(handler) if handler is not None else register
+
+    def on_default(self, handler: Handler) -> Handler:
+        """Handler for events no other route matches (they are counted as unhandled otherwise)."""
+
+        self._default = (handler, inspect.iscoroutinefunction(handler))
+        self._routes.clear()
+        self._direct.clear()
+        return handler
+
+    def _route(self, event_type: str, data: Any) -> _Route:
+        route = self._routes.get(event_type)
+        if route is None:
+            handlers = tuple(self._by_type.get(event_type, ()))
+            if not handlers and self._default is not None:
+                handlers = (self._default,)
+            route = _make_route(
+                handlers,
+                event_type in self.coalesce and bool(handlers),
+                {} if event_type in self._by_payload else None,
+            )
+            self._routes[event_type] = route
+            if len(handlers) == 1 and not route.is_async and not route.coalesce and route.by_payload is None:
+                self._direct[event_type] = handlers[0][0]
+        if route.by_payload is None:
+            return route
+        payload_type = type(data)
+        narrowed = route.by_payload.get(payload_type)
+        if narrowed is None:
+            matched = tuple(
+                (fn, is_async)
+                for cls, fn, is_async in self._by_payload[event_type]
+                if issubclass(payload_type, cls)
+            )
+            narrowed = _make_route(matched, False, None) if matched else route._replace(by_payload=None)
+            route.by_payload[payload_type] = narrowed
+        return narrowed
+
+    # ----- Dispatch -----
+
+    async def dispatch(self, event: Any) -> None:
+        """Route one event now (coalesced types may wait in the open batch)."""
+
+        self.stats.events += 1
+        pending = self._feed(event)
+        if pending is not None:
+            await pending
+
+    async def flush(self) -> None:
+        """Hand the open batch (if any) to its handlers."""
+
+        pending = self._take_batch()
+        if pending is not None:
+            await pending
+
+    def _feed(self, event: Any) -> Awaitable[None] | None:
+        # Synchronous fast paths: a plain route is one dict lookup and a call, and
+        # a token joining the open batch is an append. Returns a coroutine to
+        # await (before the next event) when an async handler is involved.
+        batch = self._batch
+        if batch is None:
+            fn = self._direct.get(event.type)
+            if fn is not None:
+                fn(event)
+                return None
+        elif self._appendable and event.type == batch.type and event.executor_id == batch.executor_id:
+            events = batch.events
+            events.append(event)
+            if len(events) >= self.max_batch or (self.window and time.perf_counter() - self._opened >= self.window):
+                return self._take_batch()
+            return None
+        return self._feed_routed(event)
+
+    def _feed_routed(self, event: Any) -> Awaitable[None] | None:
+        event_type = event.type
+        route = self._routes.get(event_type)
+        if route is None or route.by_payload is not None:
+            route = self._route(event_type, event.data)
+
+        batch = self._batch
+        pending = None
+        if route.coalesce:
+            if batch is not None and (batch.type != event_type or batch.executor_id != event.executor_id):
+                pending = self._take_batch()
+                batch = None
+            if batch is None:
+                batch = self._batch = EventBatch(event_type, event.executor_id, [event])
+                self._appendable = self._routes[event_type].by_payload is None
+                if self.window:
+                    self._opened = time.perf_counter()
+            else:
+                batch.events.append(event)
+            if len(batch.events) >= self.max_batch or (
+                self.window and time.perf_counter() - self._opened >= self.window
+            ):
+                if pending is None:
+                    return self._take_batch()
+                self._batch = None
+                self.stats.batches += 1
+                return self._deliver_after(pending, route, batch)
+            return pending
+
+        if batch is not None:
+            pending = self._take_batch()
+        if not route.handlers:
+            self.stats.unhandled += 1
+            return pending
+        if pending is not None:
+            return self._deliver_after(pending, route, event)
+        return self._deliver(route, event)
+
+    def _take_batch(self) -> Awaitable[None] | None:
+        batch, self._batch = self._batch, None
+        if batch is None:
+            return None
+        self.stats.batches += 1
+        return self._deliver(self._route(batch.type, batch.events[0].data), batch)
+
+    def _deliver(self, route: _Route, item: Any) -> Awaitable[None] | None:
+        if route.is_async:
+            return self._call(route.handlers, item)
+        for fn, _ in route.handlers:
+            fn(item)
+        return None
+
+    async def _deliver_after(self, pending: Awaitable[None], route: _Route, item: Any) -> None:
+        await pending
+        later = self._deliver(route, item)
+        if later is not None:
+            await later
+
+    @staticmethod
+    async def _call(handlers: tuple[tuple[Handler, bool], ...], item: Any) -> None:
+        for fn, is_async in handlers:
+            if is_async:
+                await fn(item)
+            else:
+                fn(item)
+
+    def _remaining(self) -> float | None:
+        # Seconds until the open batch's window closes (None: nothing waits on a timer).
+        if self._batch is None or not self.window:
+            return None
+        return max(0.0, self.window - (time.perf_counter() - self._opened))
+
+    # ----- Pump -----
+
+    async def run(self, events: AsyncIterable[Any]) -> RouterStats:
+        """Consume `events` until the stream ends, then flush. Re-raises stream and handler errors."""
+
+        stats = self.stats
+        count = 0
+        if self.queue_size <= 0:
+            try:
+                async for event in events:
+                    count += 1
+                    pending = self._feed(event)
+                    if pending is not None:
+                        await pending
+            finally:
+                stats.events += count
+                await self.flush()
+            return stats
+
+        channel = _Channel(self.queue_size)
+        producer = asyncio.create_task(self._produce(events, channel), name="event-router-producer")
+        try:
+            while True:
+                if not channel.items and not await channel.wait_readable(self._remaining()):
+                    # The window closed while the stream was quiet.
+                    await self.flush()
+                    continue
+                event = channel.get_nowait()
+                if event is _END:
+                    break
+                count += 1
+                pending = self._feed(event)
+                if pending is not None:
+                    await pending
+            await self.flush()
+            await producer  # re-raise a stream error
+        finally:
+            stats.events += count
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except (asyncio.CancelledError, Exception):
+                    pass  # the consumer's error is the one to report
+        return stats
+
+    async def _produce(self, events: AsyncIterable[Any], channel: _Channel) -> None:
+        stats = self.stats
+        items, size = channel.items, channel.size
+        try:
+            async for event in events:
+                if len(items) >= size:
+                    if self.drop_when_full and event.type in self.coalesce:
+                        stats.events += 1
+                        stats.dropped += 1
+                        continue
+                    t0 = time.perf_counter()
+                    await channel.put(event)
+                    stats.blocked_ms += (time.perf_counter() - t0) * 1000.0
+                else:
+                    channel.put_nowait(event)
+                    if len(items) > stats.max_queue_depth:
+                        stats.max_queue_depth = len(items)
+        except asyncio.CancelledError:
+            raise  # the consumer is gone; nobody reads the end marker
+        except BaseException:
+            await channel.put(_END)
+            raise
+        await channel.put(_END)
@@ -0,0 +1,252 @@
+"""Per-executor timing from a workflow's event stream: queue time, TTFT, streaming and total.
+
+Demo 5's progress lines only say which executor is active. `RunTimer` wraps
+the stream (`events = timer.observe(workflow.run(prompt, stream=True))`),
+timestamps every event as it leaves the workflow, and derives for each agent
+executor:
+
+- queue time: from the moment its input was ready (the upstream executor that
+  sent it completed, or the run started) to `executor_invoked`. Includes any
+  handoff or routing stage in between and the framework's superstep hand-over;
+- time to first token (TTFT): from `executor_invoked` to its first streamed
+  update (`output`, or a `data` event carrying text);
+- streaming duration: from the first to the last streamed update;
+- total: from `executor_invoked` to `executor_completed`.
+
+A high TTFT with a normal streaming duration points at work done before the
+answer starts (hosted Bing searches, MCP or code interpreter calls, model
+queueing); a long streaming duration for a short answer points at the model
+itself. Timestamps are taken before any downstream queue, so a slow console
+(see `runtime.event_router`) does not skew them.
+
+In Agent Framework 1.2.2 only the workflow's output executors surface their
+streamed updates, so build the workflow with `stream_agents=True` (see
+`build_event_planning_workflow()`; Demo 5 does with `WORKFLOW_STREAM_AGENTS=1`)
+to time every agent's first token. A
+speculative executor runs its agent without streaming, so it reports no TTFT.
+
+`TimingStats` keeps a histogram per (metric, executor), prints a p50/p90
+table at exit for the configured instance, and records the same values as
+OpenTelemetry histograms (seconds, attribute `executor.id`) when tracing is on:
+
+    workflow.executor.queue_time
+    workflow.executor.time_to_first_token
+    workflow.executor.streaming_duration
+    workflow.executor.duration
+
+`WORKFLOW_TIMING=0` turns it off. Not re-exported from `runtime`; import it
+from `runtime.executor_timing`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Container, NamedTuple
+
+from .config import get_config
+from .histogram import HistogramSet
+from .tracing import tracing_enabled
+
+# metric -> (OpenTelemetry instrument name, description)
+METRICS: dict[str, tuple[str, str]] = {
+    "queue": ("workflow.executor.queue_time", "Time from input ready to executor invoked"),
+    "ttft": ("workflow.executor.time_to_first_token", "Time from executor invoked to its first streamed update"),
+    "stream": ("workflow.executor.streaming_duration", "Time from an executor's first to last streamed update"),
+    "total": ("workflow.executor.duration", "Time from executor invoked to executor completed"),
+}
+
+
+class ExecutorTiming(NamedTuple):
+    """One executor run (milliseconds; TTFT and streaming are None when nothing streamed)."""
+
+    executor_id: str
+    queue_ms: float
+    ttft_ms: float | None
+    stream_ms: float | None
+    total_ms: float
+    updates: int
+
+
+class _Open:
+    __slots__ = ("invoked", "ready", "first", "last", "updates")
+
+    def __init__(self, invoked: float, ready: float) -> None:
+        self.invoked = invoked
+        self.ready = ready
+        self.first: float | None = None
+        self.last = 0.0
+        self.updates = 0
+
+
+class TimingStats:
+    """Timing histograms per executor, mirrored to OpenTelemetry when `otel` is set."""
+
+    def __init__(self, *, otel: bool = False) -> None:
+        self.histograms = HistogramSet()
+        self.otel = otel
+        self._lock = threading.Lock()
+        self._order: list[str] = []
+        self._instruments: dict[str, Any] | None = None
+
+    def record(self, timing: ExecutorTiming) -> None:
+        values = {
+            "queue": timing.queue_ms,
+            "ttft": timing.ttft_ms,
+            "stream": timing.stream_ms,
+            "total": timing.total_ms,
+        }
+        with self._lock:
+            if timing.executor_id not in self._order:
+                self._order.append(timing.executor_id)
+        instruments = self._otel_instruments() if self.otel else None
+        for metric, value in values.items():
+            if value is None:
+                continue
+            self.histograms.record(metric, timing.executor_id, value)
+            if instruments is not None:
+                instruments[metric].record(value / 1000.0, {"executor.id": timing.executor_id})
+
+    def _otel_instruments(self) -> dict[str, Any] | None:
+        with self._lock:
+            if self._instruments is None:
+                try:
+                    from opentelemetry import metrics
+                except Exception:  # pragma: no cover
+                    self.otel = False
+                    return None
+                meter = metrics.get_meter("getting_started.workflow")
+                self._instruments = {
+                    metric: meter.create_histogram(name, unit="s", description=description)
+                    for metric, (name, description) in METRICS.items()
+                }
+            return self._instruments
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """executor -> metric -> count, p50, p90 and max (ms)."""
+
+        result: dict[str, dict[str, dict[str, float]]] = {}
+        for (metric, executor), hist in self.histograms.items():
+            result.setdefault(executor, {})[metric] = {
+                "count": hist.count,
+                "p50": round(hist.quantile(0.5), 1),
+                "p90": round(hist.quantile(0.9), 1),
+                "max": round(hist.max, 1),
+            }
+        return {executor: result[executor] for executor in self._order if executor in result}
+
+    def format_table(self) -> str:
+        snapshot = self.snapshot()
+
+        def cell(metrics: dict[str, dict[str, float]], metric: str, q: str) -> str:
+            return f"{metrics[metric][q]:>9.1f}" if metric in metrics else f"{'-':>9}"
+
+        header = (
+            f"{'executor':<16} {'runs':>5} {'queue p50':>9} {'ttft p50':>9} {'ttft p90':>9} "
+            f"{'stream p50':>10} {'total p50':>9} {'total p90':>9}"
+        )
+        lines = ["Workflow executor timing (ms):", header, "-" * len(header)]
+        for executor, metrics in snapshot.items():
+            lines.append(
+                f"{executor:<16} {metrics['total']['count']:>5} {cell(metrics, 'queue', 'p50')} "
+                f"{cell(metrics, 'ttft', 'p50')} {cell(metrics, 'ttft', 'p90')} "
+                f" {cell(metrics, 'stream', 'p50')} {cell(metrics, 'total', 'p50')} {cell(metrics, 'total', 'p90')}"
+            )
+        return "\n".join(lines)
+
+
+class RunTimer:
+    """Timestamp one run's event stream and record `ExecutorTiming`s; see the module docstring.
+
+    `executors` limits recording to those executor ids (e.g. the agents, not
+    the join or handoff stages). Executors that finish without sending or
+    yielding anything (a speculative executor starting its background run)
+    are not recorded.
+    """
+
+    def __init__(self, stats: TimingStats | None = None, *, executors: Container[str] | None = None) -> None:
+        self.stats = stats
+        self.executors = executors
+        self.timings: list[ExecutorTiming] = []
+        self._open: dict[str, _Open] = {}
+        self._completed: dict[str, float] = {}
+        self._started = 0.0
+
+    async def observe(self, events: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Yield `events` unchanged, timing them on the way through."""
+
+        self._started = time.perf_counter()
+        async for event in events:
+            self.on_event(event, time.perf_counter())
+            yield event
+
+    def on_event(self, event: Any, now: float) -> None:
+        event_type = event.type
+        if event_type == "output" or event_type == "data":
+            run = self._open.get(event.executor_id)
+            if run is not None and (event_type == "output" or hasattr(event.data, "text")):
+                if run.first is None:
+                    run.first = now
+                run.last = now
+                run.updates += 1
+        elif event_type == "executor_invoked":
+            executor_id = event.executor_id
+            if self.executors is None or executor_id in self.executors:
+                self._open[executor_id] = _Open(now, self._ready(event.data))
+        elif event_type == "executor_completed":
+            self._completed[event.executor_id] = now
+            run = self._open.pop(event.executor_id, None)
+            if run is not None and event.data is not None:
+                self._record(event.executor_id, run, now)
+
+    def _ready(self, message: Any) -> float:
+        # When the input was ready: the latest completion among its senders (a fan-in
+        # join receives a list), or the start of the run for the start executor.
+        senders = message if isinstance(message, list) else [message]
+        done = [self._completed[s] for s in (getattr(m, "executor_id", None) for m in senders) if s in self._completed]
+        return max(done) if done else self._started
+
+    def _record(self, executor_id: str, run: _Open, now: float) -> None:
+        first = run.first
+        timing = ExecutorTiming(
+            executor_id,
+            queue_ms=round(max(0.0, run.invoked - run.ready) * 1000.0, 1),
+            ttft_ms=round((first - run.invoked) * 1000.0, 1) if first is not None else None,
+            stream_ms=round((run.last - first) * 1000.0, 1) if first is not None else None,
+            total_ms=round((now - run.invoked) * 1000.0, 1),
+            updates=run.updates,
+        )
+        self.timings.append(timing)
+        if self.stats is not None:
+            self.stats.record(timing)
+
+
+_stats: TimingStats | None = None
+_stats_lock = threading.Lock()
+
+
+def timing_enabled() -> bool:
+    return (get_config().get("WORKFLOW_TIMING") or "1").lower() not in {"0", "false", "no", "off"}
+
+
+def timing_stats_from_config() -> TimingStats | None:
+    """Process-wide `TimingStats` (table printed at exit), or None with `WORKFLOW_TIMING=0`."""
+
+    global _stats
+    if not timing_enabled():
+        return None
+    with _stats_lock:
+        if _stats is None:
+            _stats = TimingStats(otel=tracing_enabled())
+            atexit.register(print_timing_stats, _stats)
+        return _stats
+
+
+def print_timing_stats(stats: TimingStats | None = None) -> None:
+    """Print the executor timing table to stderr (registered at exit for the configured stats)."""
+
+    stats = stats or _stats
+    if stats is not None and len(stats.histograms):
+        print("\n" + stats.format_table(), file=sys.stderr)
@@ -0,0 +1,314 @@
+"""Bounded inter-agent context: trim what each workflow edge hands to the next agent.
+
+By default every agent in the event-planning workflow receives the whole
+conversation so far: the prompt, every earlier agent's reply and all of their
+tool calls and tool results. Booking, at the end, pays for all of it. With a
+handoff policy, `build_event_planning_workflow()` puts a `HandoffStage` on every
+edge into an agent; the stage rewrites the conversation before the next agent
+sees it:
+
+- `full`: unchanged (the stage only counts tokens);
+- `final`: the prompt plus the final text of each earlier agent; tool calls,
+  tool results and intermediate turns are dropped;
+- `summary[:N]`: the prompt plus a structured digest per earlier agent (its
+  headings, bullet points and lines with figures), at most N tokens each
+  (default 200);
+- `tail[:N]`: the prompt plus the most recent messages that fit in N tokens
+  (default 1000); the oldest kept message is cut from the front.
+
+`WORKFLOW_HANDOFF` sets one mode for every edge or per target agent, e.g.
+`final`, `tail:800` or `booking=summary:300,*=final`. Unset keeps the original
+graph with no stages at all.
+
+Every stage records the tokens it received and sent per edge in
+`HandoffStats`; the configured policy prints the table at exit. Tokens are
+estimated as characters / 4, close enough to compare modes.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import re
+import sys
+import threading
+from typing import NamedTuple, Sequence
+
+from agent_framework import AgentExecutorResponse, Executor, Message, WorkflowContext, handler
+
+from .config import get_config
+
+FULL = "full"
+FINAL = "final"
+SUMMARY = "summary"
+TAIL = "tail"
+MODES = (FULL, FINAL, SUMMARY, TAIL)
+DEFAULT_BUDGETS = {FULL: 0, FINAL: 0, SUMMARY: 200, TAIL: 1000}
+
+_MESSAGE_OVERHEAD_TOKENS = 4
+# Lines worth keeping in a digest: markdown headings, list items, anything with a figure.
+_KEY_LINE = re.compile(r"^\s*(#{1,6}\s|[-*+]\s|\d+[.)]\s)|\d")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _content_text(content: object) -> str:
+    text = getattr(content, "text", None)
+    if isinstance(text, str):
+        return text
+    to_dict = getattr(content, "to_dict", None)
+    return json.dumps(to_dict(), default=str) if callable(to_dict) else str(content)
+
+
+def message_tokens(message: Message) -> int:
+    return _MESSAGE_OVERHEAD_TOKENS + sum(estimate_tokens(_content_text(c)) for c in message.contents)
+
+
+def conversation_tokens(messages: Sequence[Message]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def _split(conversation: Sequence[Message]) -> tuple[list[Message], list[tuple[str, list[Message]]]]:
+    """Leading user messages (the prompt), then the later messages grouped by agent, in order."""
+
+    i = 0
+    while i < len(conversation) and conversation[i].role == "user":
+        i += 1
+    turns: list[tuple[str, list[Message]]] = []
+    for message in conversation[i:]:
+        # Tool results carry no author; they belong to the agent that called the tool.
+        author = message.author_name if message.role == "assistant" and message.author_name else None
+        if not turns or (author is not None and author != turns[-1][0]):
+            turns.append((author or message.role, []))
+        turns[-1][1].append(message)
+    return list(conversation[:i]), turns
+
+
+def _final_text(messages: Sequence[Message]) -> str:
+    for message in reversed(messages):
+        if message.role == "assistant" and message.text.strip():
+            return message.text
+    return ""
+
+
+def _head(text: str, budget: int) -> str:
+    limit = budget * 4
+    return text if len(text) <= limit else text[:limit].rstrip() + " ..."
+
+
+def _tail(text: str, budget: int) -> str:
+    limit = budget * 4
+    return text if len(text) <= limit else "... " + text[-limit:].lstrip()
+
+
+def digest(text: str, budget: int) -> str:
+    """Structured digest of an agent reply: headings, list items and lines with figures."""
+
+    lines = [line.rstrip() for line in text.splitlines() if _KEY_LINE.search(line)]
+    if not lines:
+        # Plain prose: keep the opening, which usually states the recommendation.
+        return _head(" ".join(text.split()), budget)
+    kept: list[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            kept.append("- ...")
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+class Handoff(NamedTuple):
+    """What one edge passes on: `mode` (see the module docstring) and its token `budget`."""
+
+    mode: str = FULL
+    budget: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> Handoff:
+        mode, _, raw = spec.strip().lower().partition(":")
+        if mode not in MODES:
+            raise ValueError(f"unknown handoff mode {mode!r}; use one of: {', '.join(MODES)}")
+        if raw and mode in (FULL, FINAL):
+            raise ValueError(f"handoff mode {mode!r} takes no token budget")
+        try:
+            budget = int(raw) if raw else DEFAULT_BUDGETS[mode]
+        except ValueError as ex:
+            raise ValueError(f"handoff budget {raw!r} is not an integer") from ex
+        if mode in (SUMMARY, TAIL) and budget < 1:
+            raise ValueError("handoff budget must be at least 1 token")
+        return cls(mode, budget)
+
+    def __str__(self) -> str:
+        return f"{self.mode}:{self.budget}" if self.mode in (SUMMARY, TAIL) else self.mode
+
+    def apply(self, conversation: Sequence[Message]) -> list[Message]:
+        if self.mode == FULL:
+            return list(conversation)
+        prompt, turns = _split(conversation)
+        if self.mode in (FINAL, SUMMARY):
+            handed: list[Message] = []
+            for author, messages in turns:
+                text = _final_text(messages)
+                if text:
+                    text = digest(text, self.budget) if self.mode == SUMMARY else text
+                    handed.append(Message("assistant", [text], author_name=author))
+            return [*prompt, *handed]
+
+        # TAIL: newest messages first until the budget runs out; text-only for the cut one.
+        kept: list[Message] = []
+        left = self.budget
+        for message in reversed([m for _, messages in turns for m in messages]):
+            cost = message_tokens(message)
+            if cost <= left:
+                kept.append(message)
+                left -= cost
+                continue
+            if message.text.strip() and left > _MESSAGE_OVERHEAD_TOKENS:
+                text = _tail(message.text, left - _MESSAGE_OVERHEAD_TOKENS)
+                kept.append(Message(message.role, [text], author_name=message.author_name))
+            break
+        return [*prompt, *reversed(kept)]
+
+
+class HandoffStats:
+    """Per-edge counts of handoffs and tokens received / sent (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # edge -> [handoffs, tokens received, tokens sent]
+        self._edges: dict[str, list[int]] = {}
+        self._modes: dict[str, str] = {}
+
+    def record(self, edge: str, handoff: Handoff, received: int, sent: int) -> None:
+        with self._lock:
+            row = self._edges.setdefault(edge, [0, 0, 0])
+            row[0] += 1
+            row[1] += received
+            row[2] += sent
+            self._modes[edge] = str(handoff)
+
+    def snapshot(self) -> dict[str, dict[str, int | str]]:
+        with self._lock:
+            return {
+                edge: {"mode": self._modes[edge], "handoffs": n, "tokens_received": received, "tokens_sent": sent}
+                for edge, (n, received, sent) in self._edges.items()
+            }
+
+    def format_table(self) -> str:
+        rows = self.snapshot()
+        lines = [
+            "Workflow handoff context (tokens ~ chars/4):",
+            f"  {'edge':<34} {'mode':<12} {'runs':>5} {'received':>9} {'sent':>8} {'saved':>6}",
+        ]
+        total_in = total_out = 0
+        for edge, row in rows.items():
+            received, sent = int(row["tokens_received"]), int(row["tokens_sent"])
+            total_in += received
+            total_out += sent
+            saved = f"{1 - sent / received:.0%}" if received else "n/a"
+            lines.append(
+                f"  {edge:<34} {row['mode']:<12} {row['handoffs']:>5} {received:>9} {sent:>8} {saved:>6}"
+            )
+        if total_in:
+            lines.append(f"  {'total':<34} {'':<12} {'':>5} {total_in:>9} {total_out:>8} {1 - total_out / total_in:>6.0%}")
+        return "\n".join(lines)
+
+
+class HandoffPolicy:
+    """Handoff per target agent, with a default for the rest, and shared `HandoffStats`."""
+
+    def __init__(self, default: Handoff = Handoff(), per_target: dict[str, Handoff] | None = None) -> None:
+        self.default = default
+        self.per_target = dict(per_target or {})
+        self.stats = HandoffStats()
+
+    @classmethod
+    def parse(cls, spec: str) -> HandoffPolicy:
+        """`mode[:budget]` for every edge, or comma-separated `target=mode[:budget]` (`*` = default)."""
+
+        default = Handoff()
+        per_target: dict[str, Handoff] = {}
+        for entry in filter(None, (part.strip() for part in spec.split(","))):
+            target, sep, value = entry.rpartition("=")
+            if not sep or target.strip() == "*":
+                default = Handoff.parse(value)
+            else:
+                per_target[target.strip()] = Handoff.parse(value)
+        return cls(default, per_target)
+
+    def for_target(self, target: str) -> Handoff:
+        return self.per_target.get(target, self.default)
+
+    def __str__(self) -> str:
+        parts = [f"{target}={handoff}" for target, handoff in self.per_target.items()]
+        return ",".join([*parts, f"*={self.default}"])
+
+
+class HandoffStage(Executor):
+    """Edge stage in front of `target`: rewrite the incoming conversation per the policy."""
+
+    def __init__(self, target: str, policy: HandoffPolicy, id: str | None = None) -> None:
+        super().__init__(id=id or f"handoff_{target}")
+        self.target = target
+        self.policy = policy
+
+    @handler
+    async def hand_off(
+        self,
+        response: AgentExecutorResponse,
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        handoff = self.policy.for_target(self.target)
+        conversation = handoff.apply(response.full_conversation)
+        self.policy.stats.record(
+            f"{response.executor_id} -> {self.target}",
+            handoff,
+            conversation_tokens(response.full_conversation),
+            conversation_tokens(conversation),
+        )
+        await ctx.send_message(
+            AgentExecutorResponse(
+                executor_id=response.executor_id,
+                agent_response=response.agent_response,
+                full_conversation=conversation,
+            )
+        )
+
+
+_policy: HandoffPolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def handoff_policy_from_config() -> HandoffPolicy | None:
+    """Process-wide policy from `WORKFLOW_HANDOFF`, or None when unset."""
+
+    global _policy
+    spec = (get_config().get("WORKFLOW_HANDOFF") or "").strip()
+    if not spec:
+        return None
+    with _policy_lock:
+        if _policy is None:
+            try:
+                _policy = HandoffPolicy.parse(spec)
+            except ValueError as ex:
+                raise RuntimeError(
+                    f"Invalid WORKFLOW_HANDOFF={spec!r}: {ex}. "
+                    "Use e.g. `final`, `summary:200`, `tail:1000` or `booking=summary:300,*=final`."
+                ) from ex
+            atexit.register(print_handoff_stats, _policy)
+        return _policy
+
+
+def print_handoff_stats(policy: HandoffPolicy | None = None) -> None:
+    """Print the per-edge token table to stderr (registered at exit for the configured policy)."""
+
+    policy = policy or _policy
+    if policy is not None and policy.stats.snapshot():
+        print(policy.stats.format_table(), file=sys.stderr)
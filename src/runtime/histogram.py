@@ -0,0 +1,164 @@
+"""Mergeable log-bucketed latency histograms.
+
+`LogHistogram` stores counts in logarithmic buckets, so any quantile is
+reported within a fixed relative error (1% by default) using a few hundred
+integers at most, no matter how many samples are recorded. Histograms with the
+same accuracy merge by adding bucket counts, which lets separate runs or
+processes be combined (`to_dict()` / `from_dict()` round-trip through JSON).
+
+`HistogramSet` keeps one histogram per (dimension, name), e.g.
+`("agent", "venue")` or `("tool", "sequential-thinking")`.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Iterable
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Samples at or below this (ms) are counted in the zero bucket.
+_MIN_VALUE = 1e-3
+
+
+class LogHistogram:
+    """Quantile sketch with relative-error log buckets (not thread-safe; see `HistogramSet`)."""
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "_gamma", "buckets", "zero", "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= _MIN_VALUE:
+            self.zero += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: LogHistogram) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different relative accuracy.")
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.zero += other.zero
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Return the value at quantile `q` (0..1); NaN when empty."""
+
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (in relative terms), clamped to what was observed.
+                estimate = 2.0 * self._gamma ** index / (self._gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "zero": self.zero,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LogHistogram:
+        hist = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        hist.buckets = {int(k): int(v) for k, v in data.get("buckets", {}).items()}
+        hist.zero = int(data.get("zero", 0))
+        hist.count = int(data.get("count", 0))
+        hist.total = float(data.get("total", 0.0))
+        if hist.count:
+            hist.min = float(data["min"])
+            hist.max = float(data["max"])
+        return hist
+
+
+class HistogramSet:
+    """Thread-safe histograms keyed by (dimension, name)."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], LogHistogram] = {}
+
+    def record(self, dimension: str, name: str, value: float) -> None:
+        key = (dimension, name)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = LogHistogram(self.relative_accuracy)
+            hist.record(value)
+
+    def merge(self, other: HistogramSet) -> None:
+        for key, hist in other.items():
+            with self._lock:
+                mine = self._histograms.get(key)
+                if mine is None:
+                    mine = self._histograms[key] = LogHistogram(self.relative_accuracy)
+                mine.merge(hist)
+
+    def items(self) -> list[tuple[tuple[str, str], LogHistogram]]:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._histograms)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {f"{dim}:{name}": hist.to_dict() for (dim, name), hist in self.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HistogramSet:
+        hists = cls()
+        for key, value in data.items():
+            dim, _, name = key.partition(":")
+            hist = LogHistogram.from_dict(value)
+            hists.relative_accuracy = hist.relative_accuracy
+            hists._histograms[(dim, name)] = hist
+        return hists
+
+    def format_table(self, title: str = "Latency summary", quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> str:
+        qs = tuple(quantiles)
+        header = f"{'kind':<10} {'name':<32} {'count':>7}" + "".join(f" {f'p{q * 100:g}':>9}" for q in qs)
+        lines = [f"{title} (ms)", header, "-" * len(header)]
+        for (dim, name), hist in self.items():
+            row = f"{dim:<10} {name[:32]:<32} {hist.count:>7}"
+            row += "".join(f" {hist.quantile(q):9.1f}" for q in qs)
+            lines.append(row)
+        return "\n".join(lines)
@@ -0,0 +1,250 @@
+"""Process-wide pooled HTTP transport for Foundry model traffic.
+
+Every `FoundryChatClient` used to build its own `AIProjectClient`, and through
+it its own `AsyncOpenAI` client with a private connection pool. Five agents in
+Demo 5 meant five pools, five TLS handshakes to the same host, and sockets that
+were dropped as soon as each client went away.
+
+This module keeps one of each per process:
+
+- `get_http_client()` - one `httpx.AsyncClient` over a `PooledTransport`
+  (keep-alive, a total pool size and a per-host connection limit);
+- `get_project_client()` - one `AIProjectClient` per endpoint whose
+  `get_openai_client()` reuses that pooled client.
+
+Pass the project client to `FoundryChatClient(project_client=...)` or
+`FoundryAgent(project_client=...)` and every agent shares the same sockets.
+
+Pool sizes come from the environment (`.env` is honoured):
+    HTTP_POOL_SIZE          total connections (default 100)
+    HTTP_POOL_PER_HOST      concurrent connections per host (default 20)
+    HTTP_KEEPALIVE_SECONDS  idle keep-alive expiry (default 60)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, AsyncIterator, NamedTuple
+
+import httpx
+
+from .config import get_config
+from .credentials import get_credential
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_POOL_PER_HOST = 20
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+
+class PoolSettings(NamedTuple):
+    max_connections: int = DEFAULT_POOL_SIZE
+    max_per_host: int = DEFAULT_POOL_PER_HOST
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_SECONDS
+
+
+def _number(name: str, default: float, cast: type) -> Any:
+    raw = get_config().get(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError as ex:
+        raise RuntimeError(f"{name} must be a number. Got: {raw}") from ex
+    if value <= 0:
+        raise RuntimeError(f"{name} must be greater than zero. Got: {raw}")
+    return value
+
+
+def pool_settings_from_config() -> PoolSettings:
+    """Read `HTTP_POOL_SIZE`, `HTTP_POOL_PER_HOST` and `HTTP_KEEPALIVE_SECONDS`."""
+
+    return PoolSettings(
+        max_connections=_number("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE, int),
+        max_per_host=_number("HTTP_POOL_PER_HOST", DEFAULT_POOL_PER_HOST, int),
+        keepalive_expiry=_number("HTTP_KEEPALIVE_SECONDS", DEFAULT_KEEPALIVE_SECONDS, float),
+    )
+
+
+class _HostSlotStream(httpx.AsyncByteStream):
+    """Response body that gives the per-host slot back once it is closed."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, release: Any) -> None:
+        self._inner = inner
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._inner:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class _LoopPool:
+    __slots__ = ("transport", "slots")
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport) -> None:
+        self.transport = transport
+        self.slots: dict[tuple[bytes, int | None], asyncio.Semaphore] = {}
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """Keep-alive connection pool with a per-host concurrency limit.
+
+    httpx only limits the pool as a whole, so requests first take a per-host
+    slot (held until the response body is closed, which covers streaming).
+    Connections belong to an event loop; each running loop gets its own pool,
+    which keeps clients created at import time (DevUI entities) and repeated
+    `asyncio.run()` calls safe. Extra keyword arguments (e.g. `verify=`) go to
+    `httpx.AsyncHTTPTransport`.
+    """
+
+    def __init__(self, settings: PoolSettings | None = None, **transport_kwargs: Any) -> None:
+        self.settings = settings or PoolSettings()
+        self._transport_kwargs = transport_kwargs
+        self._lock = threading.Lock()
+        self._pools: dict[asyncio.AbstractEventLoop, _LoopPool] = {}
+        self.requests = 0
+
+    def _pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Connections of loops that are gone died with them (e.g. one per `asyncio.run()`).
+            for stale in [k for k in self._pools if k.is_closed()]:
+                del self._pools[stale]
+            pool = self._pools.get(loop)
+            if pool is None:
+                limits = httpx.Limits(
+                    max_connections=self.settings.max_connections,
+                    max_keepalive_connections=self.settings.max_connections,
+                    keepalive_expiry=self.settings.keepalive_expiry,
+                )
+                pool = self._pools[loop] = _LoopPool(
+                    httpx.AsyncHTTPTransport(limits=limits, **self._transport_kwargs)
+                )
+            return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool = self._pool()
+        host = (request.url.raw_host, request.url.port)
+        slot = pool.slots.get(host)
+        if slot is None:
+            slot = pool.slots[host] = asyncio.Semaphore(self.settings.max_per_host)
+        self.requests += 1
+        await slot.acquire()
+        try:
+            response = await pool.transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        response.stream = _HostSlotStream(response.stream, slot.release)  # type: ignore[arg-type]
+        return response
+
+    async def aclose(self) -> None:
+        """Close the pool of the running loop (other loops' pools are simply dropped)."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        pool = pools.get(loop)
+        if pool is not None:
+            await pool.transport.aclose()
+
+
+class _SharedAsyncClient(httpx.AsyncClient):
+    # `AsyncOpenAI.close()` closes its http_client; clients that share this one
+    # must not tear down everybody else's connections. Use `close_http_pool()`.
+    async def aclose(self) -> None:
+        return None
+
+    async def shutdown(self) -> None:
+        await super().aclose()
+
+
+_lock = threading.Lock()
+_http_client: _SharedAsyncClient | None = None
+_project_clients: dict[tuple[str, bool | None, int], Any] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled `httpx.AsyncClient`.
+
+    The timeout matches the OpenAI SDK default (600 s total, 5 s connect).
+    """
+
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = _SharedAsyncClient(
+                transport=PooledTransport(pool_settings_from_config()),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True,
+            )
+        return _http_client
+
+
+@lru_cache(maxsize=1)
+def _pooled_project_client_class() -> type:
+    # Defined on first use so importing `runtime` does not load azure.ai.projects.
+    from agent_framework._telemetry import get_user_agent
+    from azure.ai.projects.aio import AIProjectClient
+
+    class PooledAIProjectClient(AIProjectClient):
+        """`AIProjectClient` whose OpenAI clients use the shared HTTP pool."""
+
+        def __init__(self, **kwargs: Any) -> None:
+            kwargs.setdefault("user_agent", get_user_agent())
+            super().__init__(**kwargs)
+
+        def get_openai_client(self, **kwargs: Any) -> Any:
+            kwargs.setdefault("http_client", get_http_client())
+            return super().get_openai_client(**kwargs)
+
+    return PooledAIProjectClient
+
+
+def get_project_client(
+    project_endpoint: str | None = None,
+    credential: Any = None,
+    *,
+    allow_preview: bool | None = None,
+) -> Any:
+    """Return the shared `AIProjectClient` for `project_endpoint`.
+
+    Defaults to `FOUNDRY_PROJECT_ENDPOINT` and the process-wide Azure CLI
+    credential. Hand the result to `FoundryChatClient(project_client=...)`;
+    the chat client does not close it, so one instance serves every agent.
+    """
+
+    endpoint = project_endpoint or get_config().foundry_project_endpoint
+    cred = credential if credential is not None else get_credential()
+    key = (endpoint, allow_preview, id(cred))
+    with _lock:
+        client = _project_clients.get(key)
+        if client is None:
+            kwargs: dict[str, Any] = {"endpoint": endpoint, "credential": cred}
+            if allow_preview is not None:
+                kwargs["allow_preview"] = allow_preview
+            client = _project_clients[key] = _pooled_project_client_class()(**kwargs)
+        return client
+
+
+async def close_http_pool() -> None:
+    """Close the shared project clients and HTTP pool (at process shutdown)."""
+
+    global _http_client
+    with _lock:
+        clients = list(_project_clients.values())
+        _project_clients.clear()
+        http_client, _http_client = _http_client, None
+    for client in clients:
+        await client.close()
+    if http_client is not None:
+        await http_client.shutdown()
@@ -0,0 +1,59 @@
+"""Lazy-import facade for heavy optional modules.
+
+Demos only need `azure.ai.projects.models` when a Bing grounding tool is
+built, and only need the OpenTelemetry SDK when tracing is switched on.
+`lazy_import()` returns a proxy that imports the real module on first
+attribute access, so entry points that never touch it don't pay for it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Proxy for a module that is imported on first attribute access."""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: ModuleType | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+_registry: dict[str, LazyModule] = {}
+_registry_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return the process-wide lazy proxy for module `name`."""
+
+    with _registry_lock:
+        proxy = _registry.get(name)
+        if proxy is None:
+            proxy = _registry[name] = LazyModule(name)
+        return proxy
@@ -0,0 +1,189 @@
+"""On-disk cache of MCP tool and prompt listings, checked by server fingerprint.
+
+Every time an MCP tool connects, Agent Framework lists the server's tools (and
+prompts, unless `load_prompts=False`), with a ping before each page, and builds
+a `FunctionTool` per entry. For the coordinator's sequential-thinking server
+the listing never changes between runs, yet each agent build pays for it.
+
+`DiscoveryCache` stores each server's listings as JSON, one file per server
+(command, args, env and stdio options), together with a fingerprint: a hash of
+that key, the MCP SDK version and the server's `initialize` result (server
+name and version, protocol version, capabilities, instructions). A connect
+whose `initialize` result has the same fingerprint reuses the stored listing
+and skips the `tools/list` / `prompts/list` round trips; a new server version
+or changed capabilities is a miss and the fresh listing replaces the file.
+A replayed tool listing also fills the session's output-schema cache, as a
+real one does, so the first call of each tool does not list the tools again
+to validate its result.
+
+Loaded listings stay in memory, so every agent in the process builds its
+function tools from the same parsed schema objects instead of re-reading or
+re-listing them. Pooled tools (`runtime.mcp_pool.PooledMCPStdioTool`) use the
+cache, since the pool keeps the `initialize` result of each server; private
+sessions list as usual. A server that announces `list_changed` is not
+affected: a pooled session has no per-tool notification handler, and the next
+server version changes the fingerprint.
+
+    MCP_DISCOVERY_CACHE=0            turn the cache off
+    MCP_DISCOVERY_CACHE_DIR          directory (default `.cache/mcp_discovery`)
+
+Not re-exported from `runtime`; import it from `runtime.mcp_discovery`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Sequence
+
+from .config import REPO_ROOT, get_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = REPO_ROOT / ".cache" / "mcp_discovery"
+KINDS = ("tools", "prompts")
+
+
+def _sdk_version() -> str:
+    try:
+        return metadata.version("mcp")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def fingerprint(key: Sequence[Any], initialize_result: Any) -> str:
+    """Hash of a server key, the MCP SDK version and the server's `initialize` result."""
+
+    return _digest([list(key), _sdk_version(), initialize_result.model_dump(mode="json", exclude_none=True)])
+
+
+def _models() -> dict[str, Any]:
+    from mcp import types
+
+    return {"tools": types.Tool, "prompts": types.Prompt}
+
+
+class DiscoveryCache:
+    """Tool and prompt listings per server key, on disk and in memory (thread-safe)."""
+
+    def __init__(self, directory: str | Path = DEFAULT_DIRECTORY) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        # file name -> {"fingerprint": ..., kind: [parsed MCP models]}
+        self._memory: dict[str, dict[str, Any]] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _name(self, key: Sequence[Any]) -> str:
+        return _digest(list(key))[:32] + ".json"
+
+    def _read(self, name: str) -> dict[str, Any] | None:
+        try:
+            raw = json.loads((self.directory / name).read_text(encoding="utf-8"))
+            models = _models()
+            entry: dict[str, Any] = {"fingerprint": raw["fingerprint"]}
+            for kind in KINDS:
+                if kind in raw:
+                    entry[kind] = [models[kind].model_validate(item) for item in raw[kind]]
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as ex:  # unreadable or written by another SDK version
+            logger.debug("Ignoring MCP discovery cache file %s: %s", name, ex)
+            return None
+
+    def get(self, key: Sequence[Any], fingerprint: str, kind: str) -> list[Any] | None:
+        """The stored `kind` listing for `key`, or None when missing or the fingerprint differs."""
+
+        name = self._name(key)
+        with self._lock:
+            entry = self._memory.get(name)
+            if entry is not None and entry["fingerprint"] == fingerprint and kind in entry:
+                self.memory_hits += 1
+                return entry[kind]
+            entry = self._read(name)
+            if entry is not None and entry["fingerprint"] == fingerprint and kind in entry:
+                self._memory[name] = entry
+                self.disk_hits += 1
+                return entry[kind]
+            self.misses += 1
+            return None
+
+    def put(self, key: Sequence[Any], fingerprint: str, kind: str, items: list[Any]) -> None:
+        """Store a fresh listing; listings of an older fingerprint are dropped."""
+
+        name = self._name(key)
+        with self._lock:
+            entry = self._memory.get(name) or self._read(name) or {}
+            if entry.get("fingerprint") != fingerprint:
+                entry = {"fingerprint": fingerprint}
+            entry[kind] = list(items)
+            self._memory[name] = entry
+            document = {"server": str(key), "fingerprint": fingerprint}
+            for k in KINDS:
+                if k in entry:
+                    document[k] = [item.model_dump(mode="json", by_alias=True, exclude_none=True) for item in entry[k]]
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self.directory / f"{name}.{os.getpid()}.tmp"
+                tmp.write_text(json.dumps(document, indent=2), encoding="utf-8")
+                os.replace(tmp, self.directory / name)
+            except OSError as ex:
+                logger.warning("Could not write MCP discovery cache %s: %s", self.directory / name, ex)
+                return
+            self.stores += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def format_stats(self) -> str:
+        hits = self.memory_hits + self.disk_hits
+        return (
+            f"MCP discovery cache: {hits} hit(s) ({self.disk_hits} from disk), {self.misses} miss(es), "
+            f"{self.stores} stored -> {self.directory}"
+        )
+
+
+_cache: DiscoveryCache | None = None
+_cache_lock = threading.Lock()
+
+
+def discovery_cache_enabled() -> bool:
+    return (get_config().get("MCP_DISCOVERY_CACHE") or "1").lower() not in {"0", "false", "no", "off"}
+
+
+def discovery_cache_from_config() -> DiscoveryCache | None:
+    """Process-wide cache in `MCP_DISCOVERY_CACHE_DIR`, or None with `MCP_DISCOVERY_CACHE=0`."""
+
+    global _cache
+    if not discovery_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiscoveryCache(get_config().get("MCP_DISCOVERY_CACHE_DIR") or DEFAULT_DIRECTORY)
+            atexit.register(print_discovery_cache_stats, _cache)
+        return _cache
+
+
+def print_discovery_cache_stats(cache: DiscoveryCache | None = None) -> None:
+    """Print hit/miss counters to stderr (registered at exit for the configured cache)."""
+
+    cache = cache or _cache
+    if cache is not None and cache.memory_hits + cache.disk_hits + cache.misses:
+        print(cache.format_stats(), file=sys.stderr)
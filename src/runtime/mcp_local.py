@@ -0,0 +1,207 @@
+"""In-process MCP transport for MCP servers implemented in Python.
+
+`MCPStdioTool` talks JSON-RPC over pipes to a child process: every tool call
+is encoded to JSON, written to the server's stdin, parsed there, and the result
+comes back the same way; connecting spawns the process first. For servers
+written in Python that is avoidable. `InProcessMCPTool` runs the server in the
+agent's event loop instead and connects the client session to it through MCP's
+in-memory streams (`mcp.shared.memory`): requests and results pass between the
+two sessions as message objects, with no subprocess, pipes or JSON encoding.
+The tool is otherwise an ordinary `MCPTool` (tool discovery, approval modes,
+result parsing), so agents cannot tell the difference.
+
+The transport is chosen per tool. `LOCAL_SERVERS` maps tool names to Python
+server factories; `sequential_thinking_server()` is a port of
+`@modelcontextprotocol/server-sequential-thinking` (same tool, arguments and
+reply). `MCP_INPROCESS` lists the tools that should run in-process, e.g.
+`MCP_INPROCESS=sequential-thinking`; `sequential_thinking_tool()` returns the
+in-process tool when it is listed and the pooled `npx` stdio tool otherwise.
+
+The same server also runs over stdio, which the transport benchmark uses:
+
+    python3 -m runtime.mcp_local sequential-thinking
+
+Each connection gets a fresh server from the factory, so server state (the
+thought history) is per tool, as with a private stdio server.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+
+from agent_framework._mcp import MCPTool  # base of MCPStdioTool etc.; not exported at top level
+
+from .config import get_config
+from .mcp_pool import PooledMCPStdioTool
+
+
+def _server_class() -> type:
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:  # mcp 2.x renamed FastMCP
+        from mcp.server.mcpserver import MCPServer
+
+        return MCPServer
+    return FastMCP
+
+
+def _lowlevel(server: Any) -> Any:
+    # FastMCP keeps its protocol server in `_mcp_server` (`_lowlevel_server` in mcp 2.x);
+    # a low-level `mcp.server.lowlevel.Server` is used as is.
+    for attr in ("_mcp_server", "_lowlevel_server"):
+        inner = getattr(server, attr, None)
+        if inner is not None:
+            return inner
+    return server
+
+
+@asynccontextmanager
+async def in_process_transport(server: Any) -> AsyncIterator[tuple[Any, Any]]:
+    """Run `server` in a task of the current loop; yield the client's (read, write) streams.
+
+    The server task is cancelled when the context exits. Enter and leave it in
+    the same task (MCP's anyio scopes require it), as `MCPTool` does.
+    """
+
+    import anyio
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    lowlevel = _lowlevel(server)
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                partial(
+                    lowlevel.run,
+                    server_streams[0],
+                    server_streams[1],
+                    lowlevel.create_initialization_options(),
+                    raise_exceptions=False,
+                )
+            )
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
+
+
+class InProcessMCPTool(MCPTool):
+    """`MCPTool` connected to a Python MCP server running in the agent's event loop.
+
+    `server` is a zero-argument factory returning a FastMCP (or low-level MCP)
+    server; it is called on every connect. The other arguments are `MCPTool`'s.
+    """
+
+    def __init__(self, name: str, server: Callable[[], Any], **kwargs: Any) -> None:
+        super().__init__(name=name, **kwargs)
+        self.server_factory = server
+
+    def get_mcp_client(self) -> Any:
+        return in_process_transport(self.server_factory())
+
+
+SEQUENTIAL_THINKING_DESCRIPTION = """\
+A detailed tool for dynamic and reflective problem-solving through thoughts.
+This tool helps analyze problems through a flexible thinking process that can adapt and evolve.
+Each thought can build on, question, or revise previous insights as understanding deepens.
+
+Use it to break a problem into steps, plan with room for revision, and course-correct when
+the full scope is not clear at first. You can adjust total_thoughts up or down as you
+progress, question or revise previous thoughts, branch into alternative approaches, and
+add more thoughts even after reaching what seemed like the end. Set nextThoughtNeeded to
+false only when you are done and have a satisfactory answer."""
+
+
+def sequential_thinking_server() -> Any:
+    """A Python port of the sequential-thinking MCP server (one `sequentialthinking` tool)."""
+
+    server = _server_class()("sequential-thinking")
+    history: list[dict[str, Any]] = []
+    branches: dict[str, list[dict[str, Any]]] = {}
+
+    @server.tool(name="sequentialthinking", description=SEQUENTIAL_THINKING_DESCRIPTION)
+    def sequentialthinking(
+        thought: str,
+        nextThoughtNeeded: bool,
+        thoughtNumber: int,
+        totalThoughts: int,
+        isRevision: bool | None = None,
+        revisesThought: int | None = None,
+        branchFromThought: int | None = None,
+        branchId: str | None = None,
+        needsMoreThoughts: bool | None = None,
+    ) -> str:
+        entry = {
+            "thought": thought,
+            "thoughtNumber": thoughtNumber,
+            "totalThoughts": max(totalThoughts, thoughtNumber),
+            "nextThoughtNeeded": nextThoughtNeeded,
+            "isRevision": isRevision,
+            "revisesThought": revisesThought,
+            "branchFromThought": branchFromThought,
+            "branchId": branchId,
+            "needsMoreThoughts": needsMoreThoughts,
+        }
+        history.append(entry)
+        if branchFromThought and branchId:
+            branches.setdefault(branchId, []).append(entry)
+        return json.dumps(
+            {
+                "thoughtNumber": thoughtNumber,
+                "totalThoughts": entry["totalThoughts"],
+                "nextThoughtNeeded": nextThoughtNeeded,
+                "branches": list(branches),
+                "thoughtHistoryLength": len(history),
+            },
+            indent=2,
+        )
+
+    return server
+
+
+LOCAL_SERVERS: dict[str, Callable[[], Any]] = {
+    "sequential-thinking": sequential_thinking_server,
+}
+
+
+def in_process_tools() -> frozenset[str]:
+    """Tool names listed in `MCP_INPROCESS` (comma-separated); each must be in `LOCAL_SERVERS`."""
+
+    raw = get_config().get("MCP_INPROCESS") or ""
+    names = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    unknown = sorted(names - set(LOCAL_SERVERS))
+    if unknown:
+        raise RuntimeError(
+            f"MCP_INPROCESS lists tools without a Python server: {', '.join(unknown)}. "
+            f"Available: {', '.join(sorted(LOCAL_SERVERS))}"
+        )
+    return names
+
+
+def sequential_thinking_tool() -> MCPTool:
+    """The sequential-thinking tool: in-process when listed in `MCP_INPROCESS`, else the pooled `npx` server."""
+
+    if "sequential-thinking" in in_process_tools():
+        return InProcessMCPTool(name="sequential-thinking", server=sequential_thinking_server, load_prompts=False)
+    # The npx server process is shared through the MCP server pool (see runtime/mcp_pool.py).
+    return PooledMCPStdioTool(
+        name="sequential-thinking",
+        command="npx",
+        load_prompts=False,
+        args=["-y", "@modelcontextprotocol/server-sequential-thinking"],
+    )
+
+
+def main(argv: list[str]) -> None:
+    if len(argv) != 1 or argv[0] not in LOCAL_SERVERS:
+        raise SystemExit(f"usage: python3 -m runtime.mcp_local {{{','.join(sorted(LOCAL_SERVERS))}}}")
+    LOCAL_SERVERS[argv[0]]().run()  # stdio transport
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
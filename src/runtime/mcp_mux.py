@@ -0,0 +1,315 @@
+"""Multiplexed tool calls over one MCP session: in-flight limit, timeouts, cancellation.
+
+With the MCP server pool (`runtime.mcp_pool`) every agent that uses
+sequential-thinking shares one stdio session, and the DevUI
+`event_planning_workflow` entity shares it between concurrent users. The MCP
+SDK's `ClientSession` already pipelines requests: each gets a JSON-RPC id and
+responses are matched by id, in whatever order the server finishes them. What
+it lacks is a bound and a view. `MultiplexedSession` wraps a session and adds:
+
+- an in-flight limit: at most `MCP_MAX_IN_FLIGHT` (default 16) `tools/call`
+  requests are outstanding per session; further calls wait in a FIFO queue
+  instead of piling up in the server's stdin;
+- a per-call timeout: a call that has not answered within
+  `MCP_CALL_TIMEOUT_SECONDS` (default 120; a `read_timeout_seconds` passed to
+  `call_tool` wins) raises `McpCallTimeout`;
+- cancellation: when a call times out or its caller is cancelled (a hedged or
+  deadline-cut agent run, see `runtime.deadlines`), the server is sent
+  `notifications/cancelled` for that request id so it can stop the work, and
+  the slot is freed at once.
+
+Everything else (`initialize`, `list_tools`, pings) is passed through.
+
+`McpMuxStats` counts calls, timeouts, cancellations and failures per server,
+tracks queue depth and in-flight calls (current and peak), and keeps p50/p99
+queue wait and call latency. The configured stats print a table at exit and,
+when tracing is on, export OpenTelemetry instruments (attribute `mcp.server`):
+
+    mcp.client.queue_time       histogram, seconds waiting for a slot
+    mcp.client.call_duration    histogram, seconds from send to result
+    mcp.client.queue_depth      up/down counter, calls waiting for a slot
+    mcp.client.in_flight        up/down counter, calls sent and not answered
+
+`MCP_MULTIPLEX=0` turns the wrapper off. Not re-exported from `runtime`;
+import it from `runtime.mcp_mux`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import sys
+import threading
+import time
+from datetime import timedelta
+from typing import Any, NamedTuple
+
+from .config import get_config
+from .histogram import HistogramSet
+from .tracing import tracing_enabled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_CALL_TIMEOUT_SECONDS = 120.0
+
+# metric -> (OpenTelemetry instrument name, description)
+HISTOGRAMS: dict[str, tuple[str, str]] = {
+    "queue": ("mcp.client.queue_time", "Time an MCP tool call waited for an in-flight slot"),
+    "call": ("mcp.client.call_duration", "Time from sending an MCP tool call to its result"),
+}
+GAUGES: dict[str, tuple[str, str]] = {
+    "queued": ("mcp.client.queue_depth", "MCP tool calls waiting for an in-flight slot"),
+    "in_flight": ("mcp.client.in_flight", "MCP tool calls sent and not yet answered"),
+}
+
+
+class MuxSettings(NamedTuple):
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    call_timeout: float = DEFAULT_CALL_TIMEOUT_SECONDS
+
+
+def _number(name: str, default: float, cast: type) -> Any:
+    raw = get_config().get(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError as ex:
+        raise RuntimeError(f"{name} must be a number. Got: {raw}") from ex
+    if value <= 0:
+        raise RuntimeError(f"{name} must be greater than zero. Got: {raw}")
+    return value
+
+
+def mux_settings_from_config() -> MuxSettings:
+    """Settings from `MCP_MAX_IN_FLIGHT` and `MCP_CALL_TIMEOUT_SECONDS`."""
+
+    return MuxSettings(
+        max_in_flight=_number("MCP_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT, int),
+        call_timeout=_number("MCP_CALL_TIMEOUT_SECONDS", DEFAULT_CALL_TIMEOUT_SECONDS, float),
+    )
+
+
+class McpCallTimeout(TimeoutError):
+    """An MCP tool call did not answer within its timeout."""
+
+    def __init__(self, server: str, tool: str, seconds: float) -> None:
+        super().__init__(f"MCP tool {tool!r} on {server} did not answer within {seconds:g}s")
+        self.server = server
+        self.tool = tool
+        self.seconds = seconds
+
+
+class McpMuxStats:
+    """Per-server call counters, queue/in-flight gauges and latency histograms (thread-safe)."""
+
+    COUNTERS = ("calls", "timeouts", "cancelled", "failed")
+    GAUGES = ("queued", "in_flight")
+
+    def __init__(self, *, otel: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._rows: dict[str, dict[str, int]] = {}
+        self.histograms = HistogramSet()
+        self.otel = otel
+        self._instruments: dict[str, Any] | None = None
+
+    def _row(self, server: str) -> dict[str, int]:
+        row = self._rows.get(server)
+        if row is None:
+            row = self._rows[server] = dict.fromkeys(
+                (*self.COUNTERS, *self.GAUGES, *(f"peak_{g}" for g in self.GAUGES)), 0
+            )
+        return row
+
+    def count(self, server: str, counter: str) -> None:
+        with self._lock:
+            self._row(server)[counter] += 1
+
+    def gauge(self, server: str, gauge: str, delta: int) -> None:
+        with self._lock:
+            row = self._row(server)
+            row[gauge] += delta
+            row[f"peak_{gauge}"] = max(row[f"peak_{gauge}"], row[gauge])
+        instruments = self._otel_instruments() if self.otel else None
+        if instruments is not None:
+            instruments[gauge].add(delta, {"mcp.server": server})
+
+    def record(self, metric: str, server: str, ms: float) -> None:
+        self.histograms.record(metric, server, ms)
+        instruments = self._otel_instruments() if self.otel else None
+        if instruments is not None:
+            instruments[metric].record(ms / 1000.0, {"mcp.server": server})
+
+    def _otel_instruments(self) -> dict[str, Any] | None:
+        with self._lock:
+            if self._instruments is None:
+                try:
+                    from opentelemetry import metrics
+                except Exception:  # pragma: no cover
+                    self.otel = False
+                    return None
+                meter = metrics.get_meter("getting_started.mcp")
+                self._instruments = {
+                    metric: meter.create_histogram(name, unit="s", description=description)
+                    for metric, (name, description) in HISTOGRAMS.items()
+                }
+                self._instruments.update(
+                    {
+                        gauge: meter.create_up_down_counter(name, unit="{call}", description=description)
+                        for gauge, (name, description) in GAUGES.items()
+                    }
+                )
+            return self._instruments
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            result: dict[str, dict[str, float]] = {server: dict(row) for server, row in self._rows.items()}
+        for (metric, server), hist in self.histograms.items():
+            row = result.setdefault(server, {})
+            row[f"{metric}_p50_ms"] = round(hist.quantile(0.5), 1)
+            row[f"{metric}_p99_ms"] = round(hist.quantile(0.99), 1)
+        return result
+
+    def format_table(self) -> str:
+        metrics = ("queue_p50_ms", "queue_p99_ms", "call_p50_ms", "call_p99_ms")
+        header = (
+            f"{'server':<40} {'calls':>6} {'timeout':>7} {'cancel':>6} {'failed':>6} {'peak q':>6} {'peak fl':>7} "
+            f"{'queue p50':>9} {'queue p99':>9} {'call p50':>9} {'call p99':>9}"
+        )
+        lines = ["MCP tool calls (ms; peak q = most calls queued, peak fl = most in flight):", header, "-" * len(header)]
+        for server, s in self.snapshot().items():
+            cells = " ".join(f"{s[m]:>9.1f}" if m in s else f"{'-':>9}" for m in metrics)
+            lines.append(
+                f"{server[:40]:<40} {s['calls']:>6} {s['timeouts']:>7} {s['cancelled']:>6} {s['failed']:>6} "
+                f"{s['peak_queued']:>6} {s['peak_in_flight']:>7} {cells}"
+            )
+        return "\n".join(lines)
+
+
+class MultiplexedSession:
+    """A `ClientSession` whose `call_tool` is bounded, timed out and cancellable; see the module docstring."""
+
+    def __init__(
+        self, session: Any, server: str, settings: MuxSettings | None = None, stats: McpMuxStats | None = None
+    ) -> None:
+        self.session = session
+        self.server = server
+        self.settings = settings or MuxSettings()
+        self.stats = stats or McpMuxStats()
+        self._slots = asyncio.Semaphore(self.settings.max_in_flight)
+        self._notices: set[asyncio.Task[None]] = set()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any] | None = None,
+        read_timeout_seconds: timedelta | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        timeout = read_timeout_seconds.total_seconds() if read_timeout_seconds else self.settings.call_timeout
+        queued = time.perf_counter()
+        self.stats.gauge(self.server, "queued", 1)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats.gauge(self.server, "queued", -1)
+        sent = time.perf_counter()
+        self.stats.record("queue", self.server, (sent - queued) * 1000.0)
+        self.stats.count(self.server, "calls")
+        self.stats.gauge(self.server, "in_flight", 1)
+        request_id: list[Any] = [None]
+
+        async def send() -> Any:
+            # `send_request` takes the next id before its first await, and nothing
+            # else runs on this task in between, so this is the id of this call.
+            request_id[0] = getattr(self.session, "_request_id", None)
+            return await self.session.call_tool(name, arguments, **kwargs)
+
+        try:
+            return await asyncio.wait_for(send(), timeout)
+        except asyncio.TimeoutError as ex:
+            self.stats.count(self.server, "timeouts")
+            self._notify_cancelled(request_id[0], f"timed out after {timeout:g}s")
+            raise McpCallTimeout(self.server, name, timeout) from ex
+        except asyncio.CancelledError:
+            self.stats.count(self.server, "cancelled")
+            self._notify_cancelled(request_id[0], "cancelled by the client")
+            raise
+        except Exception:
+            self.stats.count(self.server, "failed")
+            raise
+        finally:
+            self._slots.release()
+            self.stats.gauge(self.server, "in_flight", -1)
+            self.stats.record("call", self.server, (time.perf_counter() - sent) * 1000.0)
+
+    def _notify_cancelled(self, request_id: Any, reason: str) -> None:
+        # Sent from its own task: the caller may be unwinding a cancellation.
+        if request_id is None:
+            return
+        task = asyncio.ensure_future(self._send_cancelled(request_id, reason))
+        self._notices.add(task)
+        task.add_done_callback(self._notices.discard)
+
+    async def _send_cancelled(self, request_id: Any, reason: str) -> None:
+        from mcp import types
+
+        try:
+            await self.session.send_notification(
+                types.ClientNotification(
+                    types.CancelledNotification(
+                        method="notifications/cancelled",
+                        params=types.CancelledNotificationParams(requestId=request_id, reason=reason),
+                    )
+                )
+            )
+        except Exception as ex:
+            logger.debug("Could not send cancellation for MCP request %s: %s", request_id, ex)
+
+
+class Multiplexer:
+    """Wraps sessions with one `MuxSettings` and records into one `McpMuxStats`."""
+
+    def __init__(self, settings: MuxSettings | None = None, stats: McpMuxStats | None = None) -> None:
+        self.settings = settings or MuxSettings()
+        self.stats = stats or McpMuxStats()
+
+    def wrap(self, session: Any, server: str) -> Any:
+        if isinstance(session, MultiplexedSession):
+            return session
+        return MultiplexedSession(session, server, self.settings, self.stats)
+
+
+_multiplexer: Multiplexer | None = None
+_multiplexer_lock = threading.Lock()
+
+
+def multiplex_enabled() -> bool:
+    return (get_config().get("MCP_MULTIPLEX") or "1").lower() not in {"0", "false", "no", "off"}
+
+
+def multiplexer_from_config() -> Multiplexer | None:
+    """Process-wide `Multiplexer` from `MCP_MAX_IN_FLIGHT` / `MCP_CALL_TIMEOUT_SECONDS`, or None with `MCP_MULTIPLEX=0`."""
+
+    global _multiplexer
+    if not multiplex_enabled():
+        return None
+    with _multiplexer_lock:
+        if _multiplexer is None:
+            _multiplexer = Multiplexer(mux_settings_from_config(), McpMuxStats(otel=tracing_enabled()))
+            atexit.register(print_mux_stats, _multiplexer.stats)
+        return _multiplexer
+
+
+def print_mux_stats(stats: McpMuxStats | None = None) -> None:
+    """Print the per-server call table to stderr (registered at exit for the configured multiplexer)."""
+
+    if stats is None and _multiplexer is not None:
+        stats = _multiplexer.stats
+    if stats is not None and len(stats.histograms):
+        print(stats.format_table(), file=sys.stderr)
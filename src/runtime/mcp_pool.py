@@ -0,0 +1,554 @@
+"""Process-wide pool of long-lived MCP stdio servers.
+
+Every `MCPStdioTool` spawns its own server process when its agent connects:
+for the coordinator's sequential-thinking tool that is a Node process plus
+`npx` package resolution, paid again by each agent that is built (Demo 3,
+Demo 5, the DevUI `event_planning_workflow` entity). `PooledMCPStdioTool` is a
+drop-in `MCPStdioTool` that leases an initialized session from the pool instead:
+
+- servers are keyed by command, args, env and stdio options, so tools that
+  start the same server share it; `MCP_POOL_SIZE` servers per key (default 1)
+  and each lease goes to the least-leased one, since one MCP session already
+  serves concurrent requests;
+- `warm_mcp_servers(tool, ...)` spawns them ahead of time, e.g. in a task at
+  startup while DNS checks and credentials run;
+- a lease pings a server that has not been checked for
+  `MCP_POOL_HEALTH_SECONDS` (default 30) and replaces it when the ping fails;
+  a tool whose calls find the connection closed (Agent Framework's reconnect
+  path) gets a fresh server the same way;
+- closing a tool (its agent's `async with` ending) only returns the lease; the
+  server keeps running for the next agent or run until `close_mcp_pool()` or
+  the end of the event loop.
+
+Each server is owned by one task (the MCP SDK's anyio scopes must be entered
+and left in the same task), and servers belong to the event loop that started
+them. Tools with a sampling `client=` keep a private server, since the pooled
+session has no per-tool callbacks. `MCP_POOL=0` turns pooling off.
+
+Pooled (and private) sessions are wrapped in `runtime.mcp_mux.MultiplexedSession`,
+which bounds the tool calls in flight per server, times them out and cancels
+them; see that module for its settings and metrics.
+
+The pool keeps each server's `initialize` result, so pooled tools can reuse
+their tool and prompt listings from `runtime.mcp_discovery` instead of listing
+them again on every connect.
+
+`McpPoolStats` counts spawns, restarts and cold vs warm leases per server, with
+p50/p99 spawn, lease and tool-call latency (timed on the leased session, so
+direct `session.call_tool()` calls count too); the configured pool prints the
+table at exit.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Iterable, NamedTuple
+
+from agent_framework import MCPStdioTool
+
+from .config import get_config
+from .histogram import HistogramSet
+from .mcp_discovery import discovery_cache_from_config, fingerprint
+from .mcp_mux import Multiplexer, multiplexer_from_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_HEALTH_SECONDS = 30.0
+DEFAULT_SPAWN_TIMEOUT_SECONDS = 120.0
+PING_TIMEOUT_SECONDS = 5.0
+STOP_TIMEOUT_SECONDS = 5.0
+
+
+class McpPoolSettings(NamedTuple):
+    size: int = DEFAULT_POOL_SIZE
+    health_seconds: float = DEFAULT_HEALTH_SECONDS
+    spawn_timeout: float = DEFAULT_SPAWN_TIMEOUT_SECONDS
+
+
+def _number(name: str, default: float, cast: type) -> Any:
+    raw = get_config().get(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError as ex:
+        raise RuntimeError(f"{name} must be a number. Got: {raw}") from ex
+    if value <= 0:
+        raise RuntimeError(f"{name} must be greater than zero. Got: {raw}")
+    return value
+
+
+def mcp_pool_settings_from_config() -> McpPoolSettings:
+    """Pool settings from `MCP_POOL_SIZE`, `MCP_POOL_HEALTH_SECONDS` and `MCP_POOL_SPAWN_TIMEOUT_SECONDS`."""
+
+    return McpPoolSettings(
+        size=_number("MCP_POOL_SIZE", DEFAULT_POOL_SIZE, int),
+        health_seconds=_number("MCP_POOL_HEALTH_SECONDS", DEFAULT_HEALTH_SECONDS, float),
+        spawn_timeout=_number("MCP_POOL_SPAWN_TIMEOUT_SECONDS", DEFAULT_SPAWN_TIMEOUT_SECONDS, float),
+    )
+
+
+class ServerKey(NamedTuple):
+    """What makes two stdio servers interchangeable."""
+
+    command: str
+    args: tuple[str, ...] = ()
+    env: tuple[tuple[str, str], ...] | None = None
+    options: tuple[tuple[str, Any], ...] = ()
+
+    @classmethod
+    def of(cls, tool: MCPStdioTool) -> ServerKey:
+        options = dict(tool._client_kwargs or {})
+        if tool.encoding:
+            options["encoding"] = tool.encoding
+        return cls(
+            tool.command,
+            tuple(tool.args),
+            tuple(sorted(tool.env.items())) if tool.env is not None else None,
+            tuple(sorted((k, str(v) if not isinstance(v, (str, int, float, bool)) else v) for k, v in options.items())),
+        )
+
+    def parameters(self) -> Any:
+        from mcp.client.stdio import StdioServerParameters
+
+        return StdioServerParameters(
+            command=self.command,
+            args=list(self.args),
+            env=dict(self.env) if self.env is not None else None,
+            **dict(self.options),
+        )
+
+    def __str__(self) -> str:
+        return " ".join(" ".join([os.path.basename(self.command), *self.args]).split())
+
+
+class McpPoolStats:
+    """Per-server spawn, restart and lease counters plus latency histograms (thread-safe)."""
+
+    COUNTERS = ("spawns", "restarts", "cold_leases", "warm_leases")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+        self.histograms = HistogramSet()
+
+    def count(self, server: str, counter: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(server, dict.fromkeys(self.COUNTERS, 0))
+            counts[counter] += 1
+
+    def record(self, metric: str, server: str, ms: float) -> None:
+        self.histograms.record(metric, server, ms)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            result: dict[str, dict[str, float]] = {server: dict(counts) for server, counts in self._counts.items()}
+        for (metric, server), hist in self.histograms.items():
+            row = result.setdefault(server, dict.fromkeys(self.COUNTERS, 0))
+            row[f"{metric}_p50_ms"] = round(hist.quantile(0.5), 1)
+            row[f"{metric}_p99_ms"] = round(hist.quantile(0.99), 1)
+        return result
+
+    def format_table(self) -> str:
+        metrics = ("spawn_p50_ms", "cold_lease_p50_ms", "warm_lease_p50_ms", "call_p50_ms", "call_p99_ms")
+        header = (
+            f"{'server':<40} {'spawns':>6} {'restarts':>8} {'cold':>5} {'warm':>5} "
+            f"{'spawn p50':>9} {'cold p50':>9} {'warm p50':>9} {'call p50':>9} {'call p99':>9}"
+        )
+        lines = ["MCP server pool (ms; cold/warm = leases and their latency):", header, "-" * len(header)]
+        for server, s in self.snapshot().items():
+            cells = " ".join(f"{s[m]:>9.1f}" if m in s else f"{'-':>9}" for m in metrics)
+            lines.append(
+                f"{server[:40]:<40} {s['spawns']:>6} {s['restarts']:>8} {s['cold_leases']:>5} {s['warm_leases']:>5} {cells}"
+            )
+        return "\n".join(lines)
+
+
+class _TimedSession:
+    """A pooled session as leased: records every tool call's latency in the pool stats."""
+
+    def __init__(self, session: Any, server: str, stats: McpPoolStats) -> None:
+        self.session = session
+        self.server = server
+        self.stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def call_tool(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await self.session.call_tool(*args, **kwargs)
+        finally:
+            self.stats.record("call", self.server, (time.perf_counter() - started) * 1000.0)
+
+
+class _Server:
+    """One stdio server process and its initialized session, owned by a single task."""
+
+    def __init__(
+        self, key: ServerKey, multiplexer: Multiplexer | None = None, stats: McpPoolStats | None = None
+    ) -> None:
+        self.key = key
+        self.multiplexer = multiplexer
+        self.stats = stats
+        self.session: Any = None
+        self.initialized: Any = None
+        self.leases = 0
+        self.checked = 0.0
+        self._ready: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> Any:
+        self._task = asyncio.create_task(self._own(), name=f"mcp-pool:{self.key.command}")
+        try:
+            session = await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+        except BaseException:
+            await self.stop()
+            raise
+        self.checked = time.monotonic()
+        return session
+
+    async def _own(self) -> None:
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+
+        try:
+            async with stdio_client(self.key.parameters()) as (read, write):
+                async with ClientSession(read, write) as session:
+                    self.initialized = await session.initialize()
+                    if self.multiplexer is not None:
+                        session = self.multiplexer.wrap(session, str(self.key))
+                    if self.stats is not None:
+                        session = _TimedSession(session, str(self.key), self.stats)
+                    self.session = session
+                    self._ready.set_result(session)
+                    await self._stop.wait()
+        except asyncio.CancelledError:
+            if not self._ready.done():
+                self._ready.cancel()
+            raise
+        except BaseException as ex:
+            if not self._ready.done():
+                self._ready.set_exception(ex)
+            else:
+                logger.debug("MCP server %s exited: %s", self.key, ex)
+        finally:
+            self.session = None
+
+    async def healthy(self) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), PING_TIMEOUT_SECONDS)
+        except Exception:
+            return False
+        self.checked = time.monotonic()
+        return True
+
+    async def stop(self) -> None:
+        self._stop.set()
+        task = self._task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            task.cancel()
+        except Exception:
+            pass
+
+
+class McpServerPool:
+    """Long-lived MCP stdio sessions per `ServerKey` and event loop; see the module docstring."""
+
+    def __init__(self, settings: McpPoolSettings | None = None, multiplexer: Multiplexer | None = None) -> None:
+        self.settings = settings or McpPoolSettings()
+        self.multiplexer = multiplexer
+        self.stats = McpPoolStats()
+        self._lock = threading.Lock()
+        self._servers: dict[tuple[asyncio.AbstractEventLoop, ServerKey], list[_Server]] = {}
+        self._spawn_locks: dict[tuple[asyncio.AbstractEventLoop, ServerKey], asyncio.Lock] = {}
+
+    def _slot(self, key: ServerKey) -> tuple[list[_Server], asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Servers of loops that are gone died with them.
+            for stale in [k for k in self._servers if k[0].is_closed()]:
+                del self._servers[stale]
+                self._spawn_locks.pop(stale, None)
+            servers = self._servers.setdefault((loop, key), [])
+            lock = self._spawn_locks.get((loop, key))
+            if lock is None:
+                lock = self._spawn_locks[(loop, key)] = asyncio.Lock()
+            return servers, lock
+
+    async def _spawn(self, key: ServerKey, servers: list[_Server]) -> _Server:
+        started = time.perf_counter()
+        server = _Server(key, self.multiplexer, self.stats)
+        await server.start(self.settings.spawn_timeout)
+        servers.append(server)
+        self.stats.count(str(key), "spawns")
+        self.stats.record("spawn", str(key), (time.perf_counter() - started) * 1000.0)
+        return server
+
+    async def warm(self, key: ServerKey) -> None:
+        """Start `settings.size` servers for `key` (those already running count)."""
+
+        servers, lock = self._slot(key)
+        async with lock:
+            while len([s for s in servers if s.alive]) < self.settings.size:
+                await self._spawn(key, servers)
+
+    async def lease(self, key: ServerKey) -> Any:
+        """An initialized `ClientSession` for `key`; return it with `release()`."""
+
+        started = time.perf_counter()
+        servers, lock = self._slot(key)
+        cold = False
+        async with lock:
+            for server in [s for s in servers if not s.alive]:
+                servers.remove(server)
+                self.stats.count(str(key), "restarts")
+            if len(servers) < self.settings.size and all(s.leases for s in servers):
+                server = await self._spawn(key, servers)
+                cold = True
+            else:
+                server = min(servers, key=lambda s: s.leases)
+                if time.monotonic() - server.checked > self.settings.health_seconds and not await server.healthy():
+                    logger.info("MCP server %s failed its health check; restarting it", key)
+                    servers.remove(server)
+                    self.stats.count(str(key), "restarts")
+                    asyncio.ensure_future(server.stop())
+                    server = await self._spawn(key, servers)
+                    cold = True
+            server.leases += 1
+        self.stats.count(str(key), "cold_leases" if cold else "warm_leases")
+        self.stats.record("cold_lease" if cold else "warm_lease", str(key), (time.perf_counter() - started) * 1000.0)
+        return server.session
+
+    def release(self, key: ServerKey, session: Any) -> None:
+        servers, _ = self._slot(key)
+        for server in servers:
+            if server.session is session and server.leases:
+                server.leases -= 1
+                return
+
+    def initialize_result(self, key: ServerKey, session: Any) -> Any:
+        """The `initialize` result of the pooled server behind `session`, or None."""
+
+        servers, _ = self._slot(key)
+        for server in servers:
+            if server.session is session:
+                return server.initialized
+        return None
+
+    async def replace(self, key: ServerKey, session: Any) -> Any:
+        """Drop the server behind a failing `session` (if still pooled) and lease another."""
+
+        servers, lock = self._slot(key)
+        async with lock:
+            for server in [s for s in servers if s.session is session or not s.alive]:
+                servers.remove(server)
+                self.stats.count(str(key), "restarts")
+                asyncio.ensure_future(server.stop())
+        return await self.lease(key)
+
+    async def close(self) -> None:
+        """Stop every server started on the running loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            keys = [k for k in self._servers if k[0] is loop]
+            servers = [s for k in keys for s in self._servers.pop(k)]
+            for k in keys:
+                self._spawn_locks.pop(k, None)
+        await asyncio.gather(*(server.stop() for server in servers))
+
+
+def _client_session(session: Any) -> Any:
+    """The MCP `ClientSession` under the pool's and multiplexer's wrappers."""
+
+    while "session" in vars(session):
+        session = vars(session)["session"]
+    return session
+
+
+class _Listing:
+    """Session stand-in while a tool lists tools or prompts: replays `cached` or records the fresh pages."""
+
+    def __init__(self, session: Any, cached: list[Any] | None) -> None:
+        self.session = session
+        self.cached = cached
+        self.recorded: list[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def send_ping(self) -> Any:
+        if self.cached is None:
+            return await self.session.send_ping()
+
+    async def list_tools(self, *args: Any, **kwargs: Any) -> Any:
+        from mcp import types
+
+        if self.cached is not None:
+            # What `ClientSession.list_tools()` stores; without it the first call of
+            # each tool would list the tools again to validate its result.
+            schemas = getattr(_client_session(self.session), "_tool_output_schemas", None)
+            if isinstance(schemas, dict):
+                schemas.update((tool.name, tool.outputSchema) for tool in self.cached)
+            return types.ListToolsResult(tools=self.cached)
+        result = await self.session.list_tools(*args, **kwargs)
+        self.recorded.extend(result.tools)
+        return result
+
+    async def list_prompts(self, *args: Any, **kwargs: Any) -> Any:
+        from mcp import types
+
+        if self.cached is not None:
+            return types.ListPromptsResult(prompts=self.cached)
+        result = await self.session.list_prompts(*args, **kwargs)
+        self.recorded.extend(result.prompts)
+        return result
+
+
+class PooledMCPStdioTool(MCPStdioTool):
+    """`MCPStdioTool` whose session is leased from the MCP server pool.
+
+    Takes the same arguments, plus `pool=` to use a specific `McpServerPool`
+    instead of the configured one.
+    """
+
+    def __init__(self, *args: Any, pool: McpServerPool | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pool = pool
+        self._leased: Any = None
+
+    @property
+    def server_key(self) -> ServerKey:
+        return ServerKey.of(self)
+
+    def _server_pool(self) -> McpServerPool | None:
+        if self.client is not None:
+            return None  # sampling callbacks are per tool; keep a private server
+        return self._pool or mcp_pool_from_config()
+
+    async def _connect_on_owner(self, *, reset: bool = False) -> None:
+        pool = self._server_pool()
+        if pool is None:
+            await super()._connect_on_owner(reset=reset)
+            multiplexer = multiplexer_from_config()
+            if multiplexer is not None and self.session is not None:
+                self.session = multiplexer.wrap(self.session, str(self.server_key))
+            return
+        key = self.server_key
+        if reset and self._leased is not None:
+            self.session = self._leased = await pool.replace(key, self._leased)
+        elif self._leased is None:
+            self.session = self._leased = await pool.lease(key)
+        await super()._connect_on_owner()
+
+    async def _close_on_owner(self) -> None:
+        if self._leased is None:
+            await super()._close_on_owner()
+            return
+        pool = self._server_pool()
+        if pool is not None:
+            pool.release(self.server_key, self._leased)
+        self._leased = None
+        self.session = None
+        self.is_connected = False
+
+    async def load_tools(self) -> None:
+        await self._discover("tools", super().load_tools)
+
+    async def load_prompts(self) -> None:
+        await self._discover("prompts", super().load_prompts)
+
+    async def _discover(self, kind: str, load: Any) -> None:
+        # Listings of a pooled server come from the discovery cache when its
+        # `initialize` result matches the stored fingerprint.
+        cache = discovery_cache_from_config()
+        pool = self._server_pool() if self._leased is not None else None
+        initialized = pool.initialize_result(self.server_key, self._leased) if pool is not None else None
+        if cache is None or initialized is None:
+            await load()
+            return
+        key = self.server_key
+        digest = fingerprint(key, initialized)
+        cached = await asyncio.to_thread(cache.get, key, digest, kind)
+        session = self.session
+        listing = self.session = _Listing(session, cached)
+        try:
+            await load()
+        finally:
+            reconnected = self.session is not listing
+            if not reconnected:
+                self.session = session
+        if cached is None and not reconnected:
+            await asyncio.to_thread(cache.put, key, digest, kind, listing.recorded)
+
+
+_pool: McpServerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def mcp_pool_enabled() -> bool:
+    return (get_config().get("MCP_POOL") or "1").lower() not in {"0", "false", "no", "off"}
+
+
+def mcp_pool_from_config() -> McpServerPool | None:
+    """Process-wide pool from `MCP_POOL*` settings, or None with `MCP_POOL=0`."""
+
+    global _pool
+    if not mcp_pool_enabled():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = McpServerPool(mcp_pool_settings_from_config(), multiplexer_from_config())
+            atexit.register(print_mcp_pool_stats, _pool)
+        return _pool
+
+
+async def warm_mcp_servers(*tools: MCPStdioTool) -> None:
+    """Start the pooled servers behind `tools` now; failures surface when the tools connect."""
+
+    pool = mcp_pool_from_config()
+    if pool is None:
+        return
+    # Other MCP tools (e.g. in-process ones) have no server to start.
+    keys: Iterable[ServerKey] = dict.fromkeys(ServerKey.of(tool) for tool in tools if isinstance(tool, MCPStdioTool))
+    results = await asyncio.gather(*(pool.warm(key) for key in keys), return_exceptions=True)
+    for key, result in zip(keys, results):
+        if isinstance(result, BaseException):
+            logger.warning("Could not prewarm MCP server %s: %s", key, result)
+
+
+async def close_mcp_pool() -> None:
+    """Stop the configured pool's servers on the running loop (at shutdown)."""
+
+    if _pool is not None:
+        await _pool.close()
+
+
+def print_mcp_pool_stats(pool: McpServerPool | None = None) -> None:
+    """Print the per-server table to stderr (registered at exit for the configured pool)."""
+
+    pool = pool or _pool
+    if pool is not None and pool.stats.snapshot():
+        print(pool.stats.format_table(), file=sys.stderr)
@@ -0,0 +1,310 @@
+"""Persistent per-agent result cache for workflow runs (SQLite).
+
+Re-running the event-planning workflow with the same prompt repeats every
+model and hosted-tool call. `ResultCacheMiddleware` is an Agent Framework agent
+middleware: attach it to each agent (`middleware=[...]`) and an agent run whose
+inputs match a stored run returns the stored `AgentResponse` (streamed back as
+updates when the caller streams) instead of calling the model. Workflow edges
+are untouched; executors simply finish faster.
+
+The cache key is the SHA-256 of:
+- the agent name,
+- its instructions,
+- its tool configuration (hosted tool dicts, function schemas, MCP commands),
+- the model and run options (e.g. `response_format`),
+- the input messages.
+
+Entries expire after a TTL and the store keeps at most `max_entries` rows,
+evicting the least recently used. Configuration (see `result_cache_from_config()`):
+
+    RESULT_CACHE=1                   enable (off by default)
+    RESULT_CACHE_PATH                SQLite file (default `.cache/agent_results.sqlite`)
+    RESULT_CACHE_TTL_SECONDS         entry lifetime (default 86400; 0 = never expire)
+    RESULT_CACHE_MAX_ENTRIES         LRU bound (default 1000)
+    RESULT_CACHE_BYPASS=1            skip lookups but store fresh results (refresh)
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+from agent_framework import AgentContext, AgentMiddleware, AgentResponse, AgentResponseUpdate, ResponseStream
+
+from .config import REPO_ROOT, get_config
+
+DEFAULT_PATH = REPO_ROOT / ".cache" / "agent_results.sqlite"
+DEFAULT_TTL_SECONDS = 86400.0
+DEFAULT_MAX_ENTRIES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-friendly, order-stable form of tool and option values."""
+
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, type) and hasattr(value, "model_json_schema"):
+        return {"schema": _canonical(value.model_json_schema())}
+    to_dict = getattr(value, "to_dict", None)
+    if callable(to_dict):
+        try:
+            return _canonical(to_dict())
+        except Exception:
+            pass
+    # MCP tools and other objects: identify by type and their defining attributes.
+    attrs = {
+        name: getattr(value, name)
+        for name in ("name", "command", "args", "url", "description")
+        if isinstance(getattr(value, name, None), (str, list, tuple))
+    }
+    return {"type": type(value).__name__, **_canonical(attrs)}
+
+
+# Per-run identifiers that differ between otherwise identical conversations.
+_VOLATILE_KEYS = frozenset({"message_id", "response_id", "created_at", "additional_properties", "raw_representation"})
+
+
+def _without_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _without_volatile(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_without_volatile(v) for v in value]
+    return value
+
+
+def _digest(value: Any) -> str:
+    data = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite store of agent responses with TTL expiry and LRU eviction (thread-safe)."""
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_PATH,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        bypass: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            if str(self.path) != ":memory:":
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        """Stored value for `key`, or None (missing, expired or bypassed)."""
+
+        if self.bypass:
+            self.misses += 1
+            return None
+        now = self._clock()
+        with self._lock:
+            db = self._conn()
+            row = db.execute("SELECT created, value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl > 0 and now - row[0] > self.ttl:
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[1]
+
+    def put(self, key: str, agent: str, value: str) -> None:
+        now = self._clock()
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, agent, created, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                (key, agent, now, now, value),
+            )
+            self.stores += 1
+            (count,) = db.execute("SELECT COUNT(*) FROM results").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn().execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores, "evictions": self.evictions}
+
+    def format_stats(self) -> str:
+        lookups = self.hits + self.misses
+        rate = f"{self.hits / lookups:.0%}" if lookups else "n/a"
+        mode = " (bypass)" if self.bypass else ""
+        return (
+            f"Result cache{mode}: {self.hits} hit(s), {self.misses} miss(es) ({rate} hit rate), "
+            f"{self.stores} stored, {self.evictions} evicted -> {self.path}"
+        )
+
+
+def cache_key(context: AgentContext) -> str:
+    """Key for an agent run: agent name, instructions, tools, options and input hashes."""
+
+    agent = context.agent
+    defaults = dict(getattr(agent, "default_options", None) or {})
+    instructions = defaults.pop("instructions", None)
+    tools = [defaults.pop("tools", None), getattr(agent, "mcp_tools", None), context.tools]
+    options = {**defaults, **dict(context.options or {})}
+    options.pop("instructions", None)
+    parts = {
+        "agent": getattr(agent, "name", None) or getattr(agent, "id", ""),
+        "instructions": _digest(instructions),
+        "tools": _digest(tools),
+        "options": _digest(options),
+        "input": _digest([_without_volatile(m.to_dict()) for m in context.messages]),
+    }
+    return _digest(parts)
+
+
+def _replay(response: AgentResponse) -> ResponseStream[AgentResponseUpdate, AgentResponse]:
+    async def updates() -> AsyncIterable[AgentResponseUpdate]:
+        for message in response.messages:
+            yield AgentResponseUpdate(
+                contents=list(message.contents),
+                role=message.role,
+                author_name=message.author_name,
+                response_id=response.response_id,
+                message_id=message.message_id,
+            )
+
+    return ResponseStream(updates(), finalizer=lambda _: response)
+
+
+class ResultCacheMiddleware(AgentMiddleware):
+    """Agent middleware that serves and records runs through a `ResultCache`."""
+
+    def __init__(self, cache: ResultCache) -> None:
+        self.cache = cache
+
+    async def process(self, context: AgentContext, call_next: Callable[[], Awaitable[None]]) -> None:
+        cache = self.cache
+        key = cache_key(context)
+        agent_name = getattr(context.agent, "name", None) or "agent"
+
+        stored = await asyncio.to_thread(cache.get, key)
+        if stored is not None:
+            response = AgentResponse.from_json(stored)
+            context.result = _replay(response) if context.stream else response
+            return
+
+        async def store(response: AgentResponse) -> AgentResponse:
+            # Runs that stop for approvals or produce nothing are not worth replaying.
+            if response.messages and not response.user_input_requests:
+                await asyncio.to_thread(cache.put, key, agent_name, response.to_json())
+            return response
+
+        await call_next()
+        if isinstance(context.result, ResponseStream):
+            context.result.with_result_hook(store)
+        elif isinstance(context.result, AgentResponse):
+            await store(context.result)
+
+
+_cache: ResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def result_cache_from_config() -> ResultCache | None:
+    """Process-wide cache from `RESULT_CACHE*` settings, or None when disabled."""
+
+    global _cache
+    config = get_config()
+    if (config.get("RESULT_CACHE") or "").lower() not in {"1", "true", "yes", "on"}:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ResultCache(
+                    config.get("RESULT_CACHE_PATH") or DEFAULT_PATH,
+                    ttl=float(config.get("RESULT_CACHE_TTL_SECONDS") or DEFAULT_TTL_SECONDS),
+                    max_entries=int(config.get("RESULT_CACHE_MAX_ENTRIES") or DEFAULT_MAX_ENTRIES),
+                    bypass=(config.get("RESULT_CACHE_BYPASS") or "").lower() in {"1", "true", "yes", "on"},
+                )
+            except ValueError as ex:
+                raise RuntimeError(
+                    f"Invalid result cache settings: {ex}. "
+                    "RESULT_CACHE_TTL_SECONDS must be a number and RESULT_CACHE_MAX_ENTRIES a positive integer."
+                ) from ex
+            atexit.register(print_result_cache_stats, _cache)
+        return _cache
+
+
+def result_cache_middleware() -> list[ResultCacheMiddleware]:
+    """`middleware=` list for an agent: the configured cache, or empty when disabled."""
+
+    cache = result_cache_from_config()
+    return [ResultCacheMiddleware(cache)] if cache is not None else []
+
+
+def print_result_cache_stats(cache: ResultCache | None = None) -> None:
+    """Print hit/miss counters to stderr (registered at exit for the configured cache)."""
+
+    cache = cache or _cache
+    if cache is not None and cache.hits + cache.misses:
+        print(cache.format_stats(), file=sys.stderr)
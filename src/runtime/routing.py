@@ -0,0 +1,160 @@
+"""Conditional routing for the event-planning workflow: skip specialists a request does not need.
+
+The workflow runs every agent by default, even for a virtual event (no venue
+to find) or a question that is only about the budget. With routing on
+(`WORKFLOW_ROUTING=1`), a `SpecialistRouter` executor sits right after the
+coordinator. It classifies the user's request with `classify_request()`,
+which uses keyword rules and no model call, and records
+which specialists to run. The edges out of the router and out of each
+specialist are conditional on that decision: `build_event_planning_workflow()`
+wires switch-case edges in the chain topology and a multi-selection fan-out in
+the parallel one. A skipped specialist never runs, which saves its model round
+trip and its Bing calls.
+
+Each skipped specialist is reported as an `executor_bypassed` event
+(`event.executor_id` is the specialist, `event.data` is a `SkippedSpecialist`).
+
+The rules only fire on explicit, affirmative statements in the request
+(`virtual event`, `webinar`, `the venue is already booked`, `no catering
+needed`, `budget only`, ...), so an ambiguous request still runs every
+specialist. A match inside a question ("Is the venue booked?") or after a
+negation or open need in the same clause ("we still need", "not sure if")
+does not count, and neither does a virtual mention when the request is also
+in person or hybrid. The coordinator's
+free-text plan is not classified: it restates and elaborates the request
+("livestream for remote staff", "confirm the venue is reserved") and would
+skip specialists the user needs. Pass your own `classify` to the router for
+anything smarter; it receives the plan too.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Mapping, NamedTuple, Sequence
+
+from agent_framework import AgentExecutorResponse, Executor, WorkflowContext, WorkflowEvent, handler
+
+ROUTER_EXECUTOR_ID = "specialists_router"
+
+_GATHERING = r"event|meeting|conference|celebration|party|gathering|summit|session|workshop|meetup|offsite|kickoff"
+_VIRTUAL = (
+    rf"virtual(?:[- ][\w-]+)? (?:{_GATHERING})s?|webinar|video call|online (?:{_GATHERING})"
+    r"|(?:fully|entirely|completely) (?:virtual|online|remote)"
+)
+_IN_PERSON = re.compile(r"\bin[- ]person\b|\bhybrid\b|\bon[- ]?site\b", re.I)
+# Stated as done: "is already booked", "has been arranged", not "venue booked?" or "need the venue confirmed".
+_BOOKED = r"(?:is|was|has been|will be)(?: already)? (?:booked|reserved|confirmed|sorted|arranged|provided|covered)"
+# In the clause before a match: the statement is negated, hedged or still open.
+_NOT_STATED = re.compile(
+    r"\b(?:no|not|never|need|needs|still|yet|if|whether|unless|until|maybe|hope|hoping)\b|n't\b", re.I
+)
+
+# specialist -> (pattern, reason, unless); a match in the request skips the
+# specialist, unless `unless` matches too.
+SKIP_RULES: dict[str, list[tuple[re.Pattern[str], str, re.Pattern[str] | None]]] = {
+    "venue": [
+        (re.compile(rf"\b(?:{_VIRTUAL})\b", re.I), "virtual event", _IN_PERSON),
+        (re.compile(rf"\bno (?:venue|location) (?:is )?(?:needed|required)\b|\bvenue {_BOOKED}\b", re.I),
+         "venue already arranged", None),
+    ],
+    "catering": [
+        (re.compile(rf"\bno catering (?:is )?(?:needed|required)\b|\bcatering {_BOOKED}\b", re.I),
+         "catering already arranged", None),
+        (re.compile(r"\bpotluck\b", re.I), "potluck", None),
+    ],
+}
+_BUDGET_ONLY = re.compile(
+    r"\b(?:budget|cost)[- ]only\b|\bonly (?:need |want )?(?:a |the )?(?:budget|cost estimate)\b"
+    r"|\bjust (?:a |the )?(?:budget|cost estimate)\b",
+    re.I,
+)
+
+
+class SkippedSpecialist(NamedTuple):
+    """Payload of the `executor_bypassed` event for a specialist the router skipped."""
+
+    executor_id: str
+    reason: str
+
+    def __str__(self) -> str:
+        return self.reason
+
+
+def _stated(pattern: re.Pattern[str], request: str, hedges: re.Pattern[str] | None = _NOT_STATED) -> bool:
+    """Whether `pattern` matches an affirmative statement: not in a question, not negated or hedged before it."""
+
+    for match in pattern.finditer(request):
+        end = re.search(r"[.!?;\n]", request[match.end():])
+        if end is not None and end.group(0) == "?":
+            continue
+        clause = re.split(r"[.!?;,\n]", request[: match.start()])[-1]
+        if hedges is not None and hedges.search(clause):
+            continue
+        return True
+    return False
+
+
+def classify_request(request: str, plan: str, specialists: Sequence[str]) -> dict[str, str]:
+    """Specialists to skip (name -> reason) for this request; `plan` is not used (see the module docstring)."""
+
+    # "We need just a budget" is still budget-only: only questions are ruled out here.
+    if _stated(_BUDGET_ONLY, request, hedges=None):
+        return {name: "budget-only request" for name in specialists}
+    skipped: dict[str, str] = {}
+    for name in specialists:
+        for pattern, reason, unless in SKIP_RULES.get(name, ()):
+            if _stated(pattern, request) and not (unless is not None and unless.search(request)):
+                skipped[name] = reason
+                break
+    return skipped
+
+
+class SpecialistRouter(Executor):
+    """Decide which specialists run for this request; the edges around it read the decision.
+
+    Holds the decision for the current run (saved in checkpoints), so one
+    workflow instance runs one request at a time, as Agent Framework requires.
+    """
+
+    def __init__(
+        self,
+        specialists: Sequence[str],
+        classify: Callable[[str, str, Sequence[str]], Mapping[str, str]] = classify_request,
+        id: str = ROUTER_EXECUTOR_ID,
+    ) -> None:
+        super().__init__(id=id)
+        self.specialists = list(specialists)
+        self._classify = classify
+        self.selected: list[str] = list(specialists)
+        # Bumped on every decision, so state collected under an older one can be dropped.
+        self.decisions = 0
+
+    @handler
+    async def route(
+        self,
+        response: AgentExecutorResponse,
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        request = "\n".join(m.text for m in response.full_conversation if m.role == "user")
+        skipped = self._classify(request, response.agent_response.text, self.specialists)
+        self.selected = [name for name in self.specialists if name not in skipped]
+        self.decisions += 1
+        for name in self.specialists:
+            if name in skipped:
+                await ctx.add_event(WorkflowEvent.executor_bypassed(name, SkippedSpecialist(name, skipped[name])))
+        await ctx.send_message(response)
+
+    def next_after(self, source: str | None) -> str | None:
+        """First selected specialist after `source` (None = from the router), or None when none is left."""
+
+        start = 0 if source is None else self.specialists.index(source) + 1
+        return next((name for name in self.specialists[start:] if name in self.selected), None)
+
+    async def on_checkpoint_save(self) -> dict[str, Any]:
+        return {"selected": list(self.selected)}
+
+    async def on_checkpoint_restore(self, state: dict[str, Any]) -> None:
+        self.selected = list(state.get("selected", self.specialists))
+        self.decisions += 1
@@ -0,0 +1,166 @@
+"""Console / JSONL span exporter used by the demos.
+
+This module imports the OpenTelemetry SDK at top level on purpose: it is only
+imported by `runtime.tracing.configure_demo_tracing()`, i.e. when tracing is on.
+
+`DemoSpanExporter.export()` runs on the `BatchSpanProcessor` worker. It only
+picks the few fields it needs off agent/tool spans and appends them to a
+bounded buffer; formatting and I/O happen on a background writer thread. When
+the buffer is full, new spans are dropped (and counted) instead of blocking.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from collections import deque
+from typing import IO, NamedTuple, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from .spans import SpanClassifier, get_span_classifier
+
+DEFAULT_CAPACITY = 4096
+# Upper bound on how long the writer sleeps before checking for work again.
+_WRITER_IDLE_SECONDS = 0.5
+
+
+class SpanRecord(NamedTuple):
+    kind: str
+    name: str
+    op: str
+    agent: str
+    tool: str
+    trace_id: int
+    span_id: int
+    start_ns: int
+    end_ns: int
+
+
+def _record(span: ReadableSpan, classifier: SpanClassifier) -> SpanRecord | None:
+    """Return the fields we print for agent/tool spans, None for everything else."""
+
+    info = classifier.classify(span)
+    if info is None:
+        return None
+    ctx = span.context
+    return SpanRecord(
+        kind=info.kind,
+        name=str(span.name),
+        op=info.op,
+        agent=info.agent,
+        tool=info.tool,
+        trace_id=ctx.trace_id if ctx else 0,
+        span_id=ctx.span_id if ctx else 0,
+        start_ns=span.start_time or 0,
+        end_ns=span.end_time or 0,
+    )
+
+
+def format_console(record: SpanRecord) -> str:
+    return f"[{record.kind}] name={record.name} op={record.op} agent={record.agent} tool={record.tool}"
+
+
+def format_jsonl(record: SpanRecord) -> str:
+    return json.dumps(
+        {
+            "kind": record.kind,
+            "name": record.name,
+            "op": record.op,
+            "agent": record.agent,
+            "tool": record.tool,
+            "trace_id": f"{record.trace_id:032x}",
+            "span_id": f"{record.span_id:016x}",
+            "start_ns": record.start_ns,
+            "duration_ms": round((record.end_ns - record.start_ns) / 1e6, 3),
+        },
+        separators=(",", ":"),
+    )
+
+
+_FORMATTERS = {"console": format_console, "jsonl": format_jsonl}
+
+
+class DemoSpanExporter(SpanExporter):
+    """Write one concise line per span (agent runs + tool calls) without blocking.
+
+    `fmt` is `"console"` (the `[AGENT]` / `[TOOL]` lines) or `"jsonl"`. Lines go to
+    `stream` (stdout by default). At most `capacity` spans wait for the writer;
+    beyond that they are dropped and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        *,
+        fmt: str = "console",
+        stream: IO[str] | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+        classifier: SpanClassifier | None = None,
+    ) -> None:
+        if fmt not in _FORMATTERS:
+            raise ValueError(f"Unknown span format {fmt!r}; expected one of: {', '.join(_FORMATTERS)}")
+        self._format = _FORMATTERS[fmt]
+        self._classifier = classifier or get_span_classifier()
+        self._stream = stream
+        self._capacity = capacity
+        self._buffer: deque[SpanRecord] = deque()
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self.exported = 0
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._run, name="demo-span-writer", daemon=True)
+        self._writer.start()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        classifier = self._classifier
+        records = [r for r in (_record(s, classifier) for s in spans) if r is not None]
+        if not records:
+            return SpanExportResult.SUCCESS
+        with self._cond:
+            if self._closed:
+                return SpanExportResult.FAILURE
+            room = self._capacity - len(self._buffer)
+            if room < len(records):
+                self.dropped += len(records) - max(room, 0)
+                records = records[: max(room, 0)]
+            self._buffer.extend(records)
+            self._pending += len(records)
+            self._cond.notify()
+        return SpanExportResult.SUCCESS
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait(_WRITER_IDLE_SECONDS)
+                if not self._buffer and self._closed:
+                    return
+                batch = list(self._buffer)
+                self._buffer.clear()
+            try:
+                stream = self._stream or sys.stdout
+                stream.write("".join(self._format(r) + "\n" for r in batch))
+                stream.flush()
+            except Exception:  # noqa: BLE001 - tracing must never break the demo
+                pass
+            with self._cond:
+                self.exported += len(batch)
+                self._pending -= len(batch)
+                self._cond.notify_all()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout_millis / 1000.0)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join(timeout=5.0)
+        if self.dropped:
+            print(f"[tracing] dropped {self.dropped} span(s): writer buffer full", file=sys.stderr)
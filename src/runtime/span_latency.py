@@ -0,0 +1,62 @@
+"""Span processor that turns agent/tool spans into latency histograms.
+
+Like `span_console`, this imports the OpenTelemetry SDK at top level and is only
+loaded by `runtime.tracing` when tracing is on.
+
+Each finished span is recorded (duration in ms) under every dimension it has:
+- `agent`:     agent runs, by `gen_ai.agent.name` (e.g. `venue`)
+- `tool`:      tool calls, by tool name (e.g. `sequential-thinking`, `code_interpreter`)
+- `executor`:  workflow executor spans, by `executor.id`
+- `operation`: any span with `gen_ai.operation.name` (e.g. `chat`, `invoke_agent`)
+"""
+
+from __future__ import annotations
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+
+from .histogram import HistogramSet
+from .spans import AGENT, OPERATION_KEYS, TOOL, SpanClassifier, get_span_classifier, span_attributes
+
+
+class LatencyHistogramProcessor(SpanProcessor):
+    """Record span durations into a `HistogramSet` as spans end."""
+
+    def __init__(self, histograms: HistogramSet | None = None, classifier: SpanClassifier | None = None) -> None:
+        self.histograms = histograms or HistogramSet()
+        self._classifier = classifier or get_span_classifier()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        return None
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.start_time is None or span.end_time is None:
+            return
+        duration_ms = (span.end_time - span.start_time) / 1e6
+        record = self.histograms.record
+
+        info = self._classifier.classify(span)
+        if info is not None:
+            if info.kind == AGENT and info.agent != "-":
+                record("agent", info.agent, duration_ms)
+            elif info.kind == TOOL and info.tool != "-":
+                record("tool", info.tool, duration_ms)
+            if info.op != "-":
+                record("operation", info.op, duration_ms)
+            return
+
+        attrs = span_attributes(span)
+        executor = attrs.get("executor.id")
+        if executor:
+            record("executor", str(executor), duration_ms)
+        for key in OPERATION_KEYS:
+            op = attrs.get(key)
+            if op:
+                record("operation", str(op), duration_ms)
+                break
+
+    def shutdown(self) -> None:
+        return None
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
@@ -0,0 +1,125 @@
+"""Shared agent/tool span classifier.
+
+The demos used to decide "is this an agent or tool span?" inline, per span:
+copy the attributes into a dict, test up to five keys one by one, then run
+several `startswith` checks on the span name. `SpanClassifier` builds its key
+sets and prefix tuples once, reads the span's attribute mapping in place, and
+memoizes the name-prefix result (span names repeat constantly).
+
+It only needs `span.name` and `span.attributes`, so importing it does not pull
+in the OpenTelemetry SDK.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterable, Mapping, NamedTuple
+
+AGENT = "AGENT"
+TOOL = "TOOL"
+
+DEFAULT_AGENT_KEYS = ("gen_ai.agent.name",)
+DEFAULT_TOOL_KEYS = ("gen_ai.tool.name", "gen_ai.tool.call.id", "tool.name", "function.name")
+DEFAULT_AGENT_PREFIXES = ("invoke_agent",)
+DEFAULT_TOOL_PREFIXES = ("run_tool", "invoke_tool")
+
+# Lookup order for the printed fields (first non-empty wins).
+AGENT_NAME_KEYS = ("gen_ai.agent.name", "agent.name")
+TOOL_NAME_KEYS = ("gen_ai.tool.name", "tool.name", "function.name")
+OPERATION_KEYS = ("gen_ai.operation.name", "operation.name")
+
+# Distinct span names remembered before the memo is reset.
+_NAME_CACHE_SIZE = 4096
+
+
+class SpanInfo(NamedTuple):
+    kind: str
+    agent: str
+    tool: str
+    op: str
+
+
+def span_attributes(span: Any) -> Mapping[str, Any]:
+    """Return the span's attributes without copying them.
+
+    SDK spans expose `attributes` as a read-only proxy over `BoundedAttributes`,
+    whose lookups run in Python; reach the plain dict underneath when it is there.
+    """
+
+    attrs = getattr(span, "_attributes", None)
+    if attrs is None:
+        attrs = getattr(span, "attributes", None) or {}
+    return getattr(attrs, "_dict", attrs)
+
+
+def _first(attrs: Mapping[str, Any], keys: tuple[str, ...]) -> str:
+    for key in keys:
+        value = attrs.get(key)
+        if value:
+            return str(value)
+    return "-"
+
+
+class SpanClassifier:
+    """Classify spans as agent runs, tool calls, or neither (`None`)."""
+
+    def __init__(
+        self,
+        *,
+        agent_keys: Iterable[str] = DEFAULT_AGENT_KEYS,
+        tool_keys: Iterable[str] = DEFAULT_TOOL_KEYS,
+        agent_prefixes: Iterable[str] = DEFAULT_AGENT_PREFIXES,
+        tool_prefixes: Iterable[str] = DEFAULT_TOOL_PREFIXES,
+    ) -> None:
+        self._agent_keys = frozenset(agent_keys)
+        self._tool_keys = frozenset(tool_keys)
+        self._agent_prefixes = tuple(agent_prefixes)
+        self._tool_prefixes = tuple(tool_prefixes)
+        self._lock = threading.Lock()
+        # span name -> (name marks an agent span, name marks a tool span)
+        self._names: dict[str, tuple[bool, bool]] = {}
+
+    def _name_flags(self, name: str) -> tuple[bool, bool]:
+        flags = self._names.get(name)
+        if flags is None:
+            flags = (name.startswith(self._agent_prefixes), name.startswith(self._tool_prefixes))
+            with self._lock:
+                if len(self._names) >= _NAME_CACHE_SIZE:
+                    self._names.clear()
+                self._names[name] = flags
+        return flags
+
+    def kind(self, name: str, attrs: Mapping[str, Any]) -> str | None:
+        """Return `TOOL`, `AGENT` or None; tool wins when a span looks like both."""
+
+        by_agent_name, by_tool_name = self._name_flags(name)
+        # dict_keys.isdisjoint() walks whichever side is shorter, in C.
+        keys = attrs.keys()
+        if by_tool_name or not keys.isdisjoint(self._tool_keys):
+            return TOOL
+        if by_agent_name or not keys.isdisjoint(self._agent_keys):
+            return AGENT
+        return None
+
+    def classify(self, span: Any) -> SpanInfo | None:
+        """Return the printed fields for agent/tool spans, None for everything else."""
+
+        attrs = span_attributes(span)
+        kind = self.kind(str(span.name), attrs)
+        if kind is None:
+            return None
+        return SpanInfo(
+            kind,
+            _first(attrs, AGENT_NAME_KEYS),
+            _first(attrs, TOOL_NAME_KEYS),
+            _first(attrs, OPERATION_KEYS),
+        )
+
+
+_default = SpanClassifier()
+
+
+def get_span_classifier() -> SpanClassifier:
+    """Return the process-wide classifier with the demos' key and prefix rules."""
+
+    return _default
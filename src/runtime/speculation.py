@@ -0,0 +1,307 @@
+"""Speculative execution of downstream specialists in the chain topology.
+
+In the chain, catering waits for venue although most of its work only needs
+the coordinator's plan. With a speculation policy (`WORKFLOW_SPECULATION=1`),
+`build_event_planning_workflow()` replaces every specialist after the first
+with a `SpeculativeAgentExecutor`. That executor gets two edges:
+
+- from the coordinator: start the agent right away, in a background task, on
+  the conversation so far (the speculation);
+- from its upstream specialist: validate the speculation against what the
+  upstream agent said, then either use the speculative result (waiting for it
+  if it is still running) or cancel it and re-run the agent on the full
+  conversation.
+
+`SpeculationPolicy.validate` decides. The default (`needs_rerun()`) re-runs
+when the upstream reply states a constraint the downstream agent must honour,
+e.g. a venue with in-house catering or a food-and-beverage minimum. A hit
+passes on a reply that did not see the upstream output; that trade-off is what
+buys the overlap.
+
+`SpeculationStats` counts hits, misses, cancelled calls, the time saved (the
+overlap of the speculation with the upstream agent) and the model time wasted
+on misses. The configured policy prints them at exit. A speculation in flight
+is not checkpointed: a resumed run simply runs the agent again. When a run
+ends before the upstream agent lands (it failed, or the caller stopped early),
+`cancel_speculations_after_runs()` cancels what is still pending, so a
+long-lived workflow (e.g. the DevUI entity) does not keep it around.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import re
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from agent_framework import (
+    AgentExecutorResponse,
+    AgentResponse,
+    Executor,
+    Message,
+    ResponseStream,
+    Workflow,
+    WorkflowContext,
+    WorkflowEvent,
+    handler,
+)
+
+from .config import get_config
+
+# target agent -> upstream statements that change its answer.
+DEPENDENCY_SIGNALS: dict[str, re.Pattern[str]] = {
+    "catering": re.compile(
+        r"in-house catering|catering (?:is )?included|exclusive caterer|preferred caterers?"
+        r"|no outside (?:food|catering|caterers)|(?:food and beverage|f&b|catering) minimum"
+        r"|no kitchen|kitchen is not available",
+        re.I,
+    ),
+}
+
+
+def needs_rerun(target: str, upstream: AgentExecutorResponse) -> str | None:
+    """Default validator: why `target` must re-run after `upstream` landed, or None to keep the speculation."""
+
+    pattern = DEPENDENCY_SIGNALS.get(target)
+    match = pattern.search(upstream.agent_response.text) if pattern is not None else None
+    return f"{upstream.executor_id} said {match.group(0)!r}" if match else None
+
+
+class SpeculationStats:
+    """Outcome counters and timings across speculative executors (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.saved_ms = 0.0
+        self.wasted_ms = 0.0
+
+    def record(
+        self,
+        *,
+        hit: bool,
+        cancelled: bool = False,
+        failed: bool = False,
+        saved_ms: float = 0.0,
+        wasted_ms: float = 0.0,
+    ) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.cancelled += cancelled
+            self.failed += failed
+            self.saved_ms += saved_ms
+            self.wasted_ms += wasted_ms
+
+    def started_one(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            decided = self.hits + self.misses
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+                "hit_rate": round(self.hits / decided, 3) if decided else 0.0,
+                "saved_ms": round(self.saved_ms, 1),
+                "wasted_ms": round(self.wasted_ms, 1),
+            }
+
+    def format_stats(self) -> str:
+        s = self.snapshot()
+        return (
+            f"Speculation: {s['hits']} hit(s), {s['misses']} miss(es) ({s['hit_rate']:.0%} hit rate), "
+            f"{s['cancelled']} cancelled, {s['saved_ms'] / 1000.0:.1f}s saved, "
+            f"{s['wasted_ms'] / 1000.0:.1f}s of model time wasted on misses"
+        )
+
+
+class SpeculationPolicy:
+    """Validator for speculative results plus shared `SpeculationStats`."""
+
+    def __init__(self, validate: Callable[[str, AgentExecutorResponse], str | None] = needs_rerun) -> None:
+        self.validate = validate
+        self.stats = SpeculationStats()
+
+
+class SpeculationOutcome(NamedTuple):
+    """Payload of the `data` event a speculative executor emits when it decides."""
+
+    executor_id: str
+    hit: bool
+    reason: str
+    saved_ms: float
+
+
+class _Speculation(NamedTuple):
+    # Resolves to (response, perf_counter() when the agent finished).
+    task: asyncio.Task[tuple[AgentResponse, float]]
+    started: float
+
+
+def _consume(task: asyncio.Task[Any]) -> None:
+    # A speculation abandoned by a failed run must not log "exception was never retrieved".
+    if not task.cancelled():
+        task.exception()
+
+
+class SpeculativeAgentExecutor(Executor):
+    """Run `agent` early on `speculate_from`'s conversation; validate once its upstream lands."""
+
+    def __init__(self, agent: Any, *, speculate_from: str, policy: SpeculationPolicy, id: str | None = None) -> None:
+        super().__init__(id=id or getattr(agent, "name", None) or "speculative")
+        self.agent = agent
+        self.speculate_from = speculate_from
+        self.policy = policy
+        self._pending: _Speculation | None = None
+
+    @handler
+    async def on_response(
+        self,
+        response: AgentExecutorResponse,
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        if response.executor_id == self.speculate_from:
+            self._start(response.full_conversation)
+            return
+        result = await self._finish(response, ctx)
+        await ctx.send_message(
+            AgentExecutorResponse(
+                executor_id=self.id,
+                agent_response=result,
+                full_conversation=[*response.full_conversation, *result.messages],
+            )
+        )
+
+    def _start(self, conversation: list[Message]) -> None:
+        self.cancel()
+
+        async def run() -> tuple[AgentResponse, float]:
+            response = await self.agent.run(list(conversation))
+            return response, time.perf_counter()
+
+        task = asyncio.create_task(run(), name=f"speculate-{self.id}")
+        task.add_done_callback(_consume)
+        self._pending = _Speculation(task, time.perf_counter())
+        self.policy.stats.started_one()
+
+    async def _finish(self, upstream: AgentExecutorResponse, ctx: WorkflowContext[Any]) -> AgentResponse:
+        speculation, self._pending = self._pending, None
+        landed = time.perf_counter()
+        if speculation is None:
+            # Resumed from a checkpoint, or the plan never reached us: nothing to validate.
+            return await self.agent.run(list(upstream.full_conversation))
+
+        reason = self.policy.validate(self.id, upstream)
+        if reason is None:
+            try:
+                result, done = await speculation.task
+            except Exception as ex:
+                reason = f"speculative run failed: {type(ex).__name__}"
+                wasted = (time.perf_counter() - speculation.started) * 1000.0
+                self.policy.stats.record(hit=False, failed=True, wasted_ms=wasted)
+            else:
+                # Without speculation the agent would have started when upstream landed,
+                # so the saving is the part of its run that overlapped the upstream agent.
+                saved = (min(done, landed) - speculation.started) * 1000.0
+                self.policy.stats.record(hit=True, saved_ms=saved)
+                await ctx.add_event(_outcome_event(self.id, True, "upstream did not change the inputs", saved))
+                return result
+        else:
+            cancelled = not speculation.task.done()
+            speculation.task.cancel()
+            try:
+                await speculation.task
+            except (asyncio.CancelledError, Exception):
+                pass  # cancelled or failed; discarded either way
+            wasted = (landed - speculation.started) * 1000.0
+            self.policy.stats.record(hit=False, cancelled=cancelled, wasted_ms=wasted)
+
+        result = await self.agent.run(list(upstream.full_conversation))
+        # Reported after the re-run: an event followed by a long quiet handler makes the
+        # framework's event poll notice the end of the superstep up to 50 ms late.
+        await ctx.add_event(_outcome_event(self.id, False, reason, 0.0))
+        return result
+
+    def cancel(self) -> None:
+        """Abandon a speculation still in flight (e.g. left over from a failed run)."""
+
+        if self._pending is not None:
+            self._pending.task.cancel()
+            self._pending = None
+
+    async def on_checkpoint_restore(self, state: dict[str, Any]) -> None:
+        # A resumed run must not validate a speculation started by another run.
+        self.cancel()
+
+
+def cancel_speculations_after_runs(workflow: Workflow) -> Workflow:
+    """Make every run of `workflow` cancel its pending speculations when it ends, failed or not."""
+
+    executors = [e for e in workflow.get_executors_list() if isinstance(e, SpeculativeAgentExecutor)]
+    run = workflow.run
+
+    def cancel() -> None:
+        for executor in executors:
+            executor.cancel()
+
+    async def finish(result: Awaitable[Any]) -> Any:
+        try:
+            return await result
+        finally:
+            cancel()
+
+    def run_and_cancel(*args: Any, **kwargs: Any) -> Any:
+        result = run(*args, **kwargs)
+        if isinstance(result, ResponseStream):
+            # Cleanup hooks run once the stream is exhausted or raised.
+            return result.with_cleanup_hook(cancel)
+        return finish(result)
+
+    if executors:
+        workflow.run = run_and_cancel  # type: ignore[method-assign]
+    return workflow
+
+
+def _outcome_event(executor_id: str, hit: bool, reason: str, saved_ms: float) -> WorkflowEvent[SpeculationOutcome]:
+    return WorkflowEvent.emit(executor_id, SpeculationOutcome(executor_id, hit, reason, round(saved_ms, 1)))
+
+
+_policy: SpeculationPolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def speculation_from_config() -> SpeculationPolicy | None:
+    """Process-wide policy when `WORKFLOW_SPECULATION` is on, else None."""
+
+    global _policy
+    if not get_config().workflow_speculation:
+        return None
+    with _policy_lock:
+        if _policy is None:
+            _policy = SpeculationPolicy()
+            atexit.register(print_speculation_stats, _policy)
+        return _policy
+
+
+def print_speculation_stats(policy: SpeculationPolicy | None = None) -> None:
+    """Print the speculation counters to stderr (registered at exit for the configured policy)."""
+
+    policy = policy or _policy
+    if policy is not None and policy.stats.started:
+        print(policy.stats.format_stats(), file=sys.stderr)
@@ -0,0 +1,350 @@
+"""Local stand-in for the Foundry / Azure OpenAI model endpoints.
+
+`StandInServer` answers the two APIs the demos and entities call:
+
+- Responses (`.../openai/v1/responses`), used by `FoundryChatClient`;
+- Chat Completions (`.../chat/completions`), used by `OpenAIChatCompletionClient`.
+
+Both support streaming (SSE) and non-streaming calls. Behaviour is configured
+with `StandInSettings`:
+
+- `latency`: time to first token, drawn from a `runtime.synthetic.LatencyModel`
+  (`fixed:200`, `uniform:100:400`, `normal:250:50`, `lognormal:250:0.5`; ms);
+- `tokens_per_sec`: streaming rate (0 = send everything at once);
+- `reply_tokens`: length of the generated text reply;
+- `tool_call_turns`: when the request carries function tools, answer the first
+  N turns with a function call (arguments synthesized from its JSON schema);
+- `canned`: structured outputs by JSON-schema name; schemas without an entry
+  get a synthesized instance that validates against the schema.
+
+Hosted tools (web search, code interpreter, hosted MCP) are accepted and
+ignored. Project-level APIs (toolboxes, hosted agents) are not emulated.
+
+Point the demos and entities at a running server with `LOCAL_STANDIN_URL`
+(see `runtime.config`); run one with `python3 src/standin_server.py`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from aiohttp import web
+
+from .synthetic import LatencyModel, example_from_schema, reply_text, text_tokens
+
+
+@dataclass
+class StandInSettings:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    tokens_per_sec: float = 0.0
+    reply_tokens: int = 60
+    tool_call_turns: int = 0
+    canned: dict[str, Any] = field(default_factory=dict)
+
+
+# ----- Request inspection -----
+
+
+def _last_user_text(items: Any) -> str:
+    if isinstance(items, str):
+        return items
+    for item in reversed(items or []):
+        if not isinstance(item, dict) or item.get("role") != "user":
+            continue
+        content = item.get("content")
+        if isinstance(content, str):
+            return content
+        for part in content or []:
+            if isinstance(part, dict) and isinstance(part.get("text"), str):
+                return part["text"]
+    return ""
+
+
+class _Turn:
+    """What to answer for one request: a function call, structured JSON or text."""
+
+    def __init__(self, text: str, call: tuple[str, str] | None = None) -> None:
+        self.text = text
+        self.call = call  # (function name, JSON arguments)
+
+
+class StandInServer:
+    """aiohttp application serving the stand-in endpoints; see the module docstring."""
+
+    def __init__(self, settings: StandInSettings | None = None) -> None:
+        self.settings = settings or StandInSettings()
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._runner: web.AppRunner | None = None
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ----- lifecycle -----
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", self._dispatch)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> StandInServer:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.host = host
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> StandInServer:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    # ----- shared behaviour -----
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}_standin{next(self._ids):08d}"
+
+    def _turn(self, prompt: str, functions: list[dict[str, Any]], tool_results: int, schema: Any) -> _Turn:
+        if functions and tool_results < self.settings.tool_call_turns:
+            fn = functions[tool_results % len(functions)]
+            args = example_from_schema(fn.get("parameters") or {"type": "object"})
+            return _Turn("", (fn["name"], json.dumps(args)))
+        if schema is not None:
+            name, body = schema
+            value = self.settings.canned.get(name)
+            if value is None:
+                value = example_from_schema(body or {"type": "object"})
+            return _Turn(json.dumps(value))
+        return _Turn(reply_text(prompt, self.settings.reply_tokens))
+
+    async def _pace(self, tokens: list[str]) -> AsyncIterator[str]:
+        """Yield tokens at `tokens_per_sec`, sleeping only when ahead of schedule."""
+
+        rate = self.settings.tokens_per_sec
+        start = time.perf_counter()
+        for i, token in enumerate(tokens):
+            if rate > 0:
+                ahead = start + i / rate - time.perf_counter()
+                if ahead > 0.001:
+                    await asyncio.sleep(ahead)
+            yield token
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        path = request.path.rstrip("/")
+        body = await request.json()
+        await asyncio.sleep(self.settings.latency.sample() / 1000.0)
+        if path.endswith("/responses"):
+            return await self._responses(request, body)
+        if path.endswith("/chat/completions"):
+            return await self._chat_completions(request, body)
+        return web.json_response(
+            {"error": {"message": f"Stand-in server does not implement {request.path}", "type": "not_found"}},
+            status=404,
+        )
+
+    async def _sse(self, request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        return resp
+
+    # ----- Responses API -----
+
+    async def _responses(self, request: web.Request, body: dict[str, Any]) -> web.StreamResponse:
+        items = body.get("input")
+        functions = [t for t in body.get("tools") or [] if t.get("type") == "function"]
+        tool_results = sum(
+            1 for i in (items if isinstance(items, list) else []) if isinstance(i, dict) and i.get("type") == "function_call_output"
+        )
+        fmt = (body.get("text") or {}).get("format") or {}
+        schema = (fmt.get("name", "output"), fmt.get("schema")) if fmt.get("type") == "json_schema" else None
+        turn = self._turn(_last_user_text(items), functions, tool_results, schema)
+
+        model = body.get("model") or "standin-model"
+        response = {
+            "id": self._id("resp"),
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "in_progress",
+            "model": model,
+            "output": [],
+            "parallel_tool_calls": True,
+            "tool_choice": body.get("tool_choice", "auto"),
+            "tools": body.get("tools") or [],
+            "text": body.get("text") or {"format": {"type": "text"}},
+            "usage": None,
+        }
+        input_tokens = len(json.dumps(items or "")) // 4
+        if turn.call is not None:
+            name, arguments = turn.call
+            item: dict[str, Any] = {
+                "type": "function_call",
+                "id": self._id("fc"),
+                "call_id": self._id("call"),
+                "name": name,
+                "arguments": arguments,
+                "status": "completed",
+            }
+            output_tokens = len(arguments) // 4 + 1
+        else:
+            item = {
+                "type": "message",
+                "id": self._id("msg"),
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": turn.text, "annotations": []}],
+            }
+            output_tokens = len(text_tokens(turn.text))
+        usage = {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+        if not body.get("stream"):
+            return web.json_response({**response, "status": "completed", "output": [item], "usage": usage})
+
+        resp = await self._sse(request)
+        seq = itertools.count()
+
+        async def send(event_type: str, **payload: Any) -> None:
+            event = {"type": event_type, "sequence_number": next(seq), **payload}
+            await resp.write(f"event: {event_type}\ndata: {json.dumps(event)}\n\n".encode())
+
+        await send("response.created", response=response)
+        await send("response.in_progress", response=response)
+        if turn.call is not None:
+            await send("response.output_item.added", output_index=0, item={**item, "arguments": "", "status": "in_progress"})
+            async for chunk in self._pace(text_tokens(item["arguments"])):
+                await send("response.function_call_arguments.delta", item_id=item["id"], output_index=0, delta=chunk)
+            await send(
+                "response.function_call_arguments.done",
+                item_id=item["id"],
+                output_index=0,
+                name=item["name"],
+                arguments=item["arguments"],
+            )
+        else:
+            await send("response.output_item.added", output_index=0, item={**item, "status": "in_progress", "content": []})
+            part = {"type": "output_text", "text": "", "annotations": []}
+            await send("response.content_part.added", item_id=item["id"], output_index=0, content_index=0, part=part)
+            async for token in self._pace(text_tokens(turn.text)):
+                await send(
+                    "response.output_text.delta",
+                    item_id=item["id"],
+                    output_index=0,
+                    content_index=0,
+                    delta=token,
+                    logprobs=[],
+                )
+            await send(
+                "response.output_text.done",
+                item_id=item["id"],
+                output_index=0,
+                content_index=0,
+                text=turn.text,
+                logprobs=[],
+            )
+            await send(
+                "response.content_part.done",
+                item_id=item["id"],
+                output_index=0,
+                content_index=0,
+                part={**part, "text": turn.text},
+            )
+        await send("response.output_item.done", output_index=0, item=item)
+        await send("response.completed", response={**response, "status": "completed", "output": [item], "usage": usage})
+        await resp.write_eof()
+        return resp
+
+    # ----- Chat Completions API -----
+
+    async def _chat_completions(self, request: web.Request, body: dict[str, Any]) -> web.StreamResponse:
+        messages = body.get("messages") or []
+        functions = [t["function"] for t in body.get("tools") or [] if t.get("type") == "function" and "function" in t]
+        tool_results = sum(1 for m in messages if isinstance(m, dict) and m.get("role") == "tool")
+        fmt = body.get("response_format") or {}
+        schema = None
+        if fmt.get("type") == "json_schema":
+            spec = fmt.get("json_schema") or {}
+            schema = (spec.get("name", "output"), spec.get("schema"))
+        turn = self._turn(_last_user_text(messages), functions, tool_results, schema)
+
+        base = {
+            "id": self._id("chatcmpl"),
+            "created": int(time.time()),
+            "model": body.get("model") or "standin-model",
+        }
+        prompt_tokens = len(json.dumps(messages)) // 4
+        if turn.call is not None:
+            name, arguments = turn.call
+            call = {"id": self._id("call"), "type": "function", "function": {"name": name, "arguments": arguments}}
+            message: dict[str, Any] = {"role": "assistant", "content": None, "tool_calls": [call]}
+            finish_reason = "tool_calls"
+            completion_tokens = len(arguments) // 4 + 1
+        else:
+            message = {"role": "assistant", "content": turn.text}
+            finish_reason = "stop"
+            completion_tokens = len(text_tokens(turn.text))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        if not body.get("stream"):
+            return web.json_response(
+                {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                    "usage": usage,
+                }
+            )
+
+        resp = await self._sse(request)
+
+        async def send(delta: dict[str, Any], finish: str | None = None, **extra: Any) -> None:
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra,
+            }
+            await resp.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        if turn.call is not None:
+            call = message["tool_calls"][0]
+            await send({"role": "assistant", "tool_calls": [{"index": 0, **call, "function": {**call["function"], "arguments": ""}}]})
+            async for chunk in self._pace(text_tokens(call["function"]["arguments"])):
+                await send({"tool_calls": [{"index": 0, "function": {"arguments": chunk}}]})
+        else:
+            await send({"role": "assistant", "content": ""})
+            async for token in self._pace(text_tokens(turn.text)):
+                await send({"content": token})
+        await send({}, finish_reason)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            await resp.write(
+                f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n".encode()
+            )
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
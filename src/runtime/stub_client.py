@@ -0,0 +1,149 @@
+"""In-process stand-in chat client for benchmarks and failure drills.
+
+`StubChatClient` behaves like `FoundryChatClient` as far as agents and
+workflows can tell (same middleware, function-invocation and telemetry layers,
+streaming and non-streaming), but never leaves the process: each call sleeps
+for a time to first token drawn from a `LatencyModel`, then streams a
+deterministic reply at `tokens_per_sec`. Structured outputs are synthesized
+from the `response_format` schema.
+
+Unlike `runtime.standin`, there is no HTTP hop, so measurements isolate the
+workflow runtime (edges, event streaming, serialization) from the network
+stack. Not re-exported from `runtime`; import it from `runtime.stub_client`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, ClassVar, Mapping, Sequence
+
+from agent_framework import (
+    BaseChatClient,
+    ChatMiddlewareLayer,
+    ChatResponse,
+    ChatResponseUpdate,
+    Content,
+    FunctionInvocationLayer,
+    Message,
+    UsageDetails,
+)
+from agent_framework.observability import ChatTelemetryLayer
+
+from .synthetic import LatencyModel, example_from_schema, reply_text, text_tokens
+
+# (call index, messages, options) -> reply text
+ReplyFn = Callable[[int, Sequence[Message], Mapping[str, Any]], str]
+# (call index, messages, options) -> exception to raise after the first-token delay, or None
+FaultFn = Callable[[int, Sequence[Message], Mapping[str, Any]], BaseException | None]
+
+
+def _last_user_text(messages: Sequence[Message]) -> str:
+    for message in reversed(messages):
+        if message.role == "user" and message.text:
+            return message.text
+    return ""
+
+
+def _schema_of(response_format: Any) -> dict[str, Any] | None:
+    if response_format is None:
+        return None
+    if isinstance(response_format, Mapping):
+        return dict(response_format.get("schema") or response_format)
+    model_json_schema = getattr(response_format, "model_json_schema", None)
+    return model_json_schema() if callable(model_json_schema) else None
+
+
+class StubChatClient(FunctionInvocationLayer, ChatMiddlewareLayer, ChatTelemetryLayer, BaseChatClient):
+    """Chat client that answers locally with synthetic latency; see the module docstring."""
+
+    OTEL_PROVIDER_NAME: ClassVar[str] = "stub"
+
+    def __init__(
+        self,
+        *,
+        latency: LatencyModel | str = "fixed:0",
+        tokens_per_sec: float = 0.0,
+        reply_tokens: int = 60,
+        reply: ReplyFn | None = None,
+        fault: FaultFn | None = None,
+        model: str = "stub-model",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.latency = LatencyModel(latency) if isinstance(latency, str) else latency
+        self.tokens_per_sec = tokens_per_sec
+        self.reply_tokens = reply_tokens
+        self.model = model
+        self._reply = reply
+        self._fault = fault
+        self.calls = 0
+
+    def _answer(self, index: int, messages: Sequence[Message], options: Mapping[str, Any]) -> str:
+        schema = _schema_of(options.get("response_format"))
+        if schema is not None:
+            return json.dumps(example_from_schema(schema))
+        if self._reply is not None:
+            return self._reply(index, messages, options)
+        return reply_text(_last_user_text(messages), self.reply_tokens)
+
+    async def _first_token(self, index: int, messages: Sequence[Message], options: Mapping[str, Any]) -> None:
+        await asyncio.sleep(self.latency.sample() / 1000.0)
+        if self._fault is not None:
+            error = self._fault(index, messages, options)
+            if error is not None:
+                raise error
+
+    def _usage(self, messages: Sequence[Message], text: str) -> UsageDetails:
+        prompt = sum(len(m.text or "") for m in messages) // 4
+        output = len(text_tokens(text))
+        return UsageDetails(input_token_count=prompt, output_token_count=output, total_token_count=prompt + output)
+
+    def _inner_get_response(
+        self,
+        *,
+        messages: Sequence[Message],
+        options: Mapping[str, Any],
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Awaitable[ChatResponse] | Any:
+        index = self.calls
+        self.calls += 1
+
+        if stream:
+
+            async def _stream() -> AsyncIterable[ChatResponseUpdate]:
+                await self._first_token(index, messages, options)
+                text = self._answer(index, messages, options)
+                rate = self.tokens_per_sec
+                start = time.perf_counter()
+                for i, token in enumerate(text_tokens(text)):
+                    if rate > 0:
+                        ahead = start + i / rate - time.perf_counter()
+                        if ahead > 0.001:
+                            await asyncio.sleep(ahead)
+                    yield ChatResponseUpdate(contents=[Content.from_text(token)], role="assistant", model=self.model)
+                yield ChatResponseUpdate(
+                    contents=[Content.from_usage(self._usage(messages, text))],
+                    role="assistant",
+                    model=self.model,
+                    finish_reason="stop",
+                )
+
+            return self._build_response_stream(_stream(), response_format=options.get("response_format"))
+
+        async def _get_response() -> ChatResponse:
+            await self._first_token(index, messages, options)
+            text = self._answer(index, messages, options)
+            if self.tokens_per_sec > 0:
+                await asyncio.sleep(len(text_tokens(text)) / self.tokens_per_sec)
+            return ChatResponse(
+                messages=[Message(role="assistant", contents=[text])],
+                model=self.model,
+                finish_reason="stop",
+                usage_details=self._usage(messages, text),
+                response_format=options.get("response_format"),
+            )
+
+        return _get_response()
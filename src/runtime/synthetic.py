@@ -0,0 +1,114 @@
+"""Synthetic model behaviour shared by the stand-in server and the stub chat client.
+
+- `LatencyModel`: millisecond latency distributions parsed from a short spec;
+- `reply_text()` / `text_tokens()`: deterministic replies and their stream chunks;
+- `example_from_schema()`: a small instance that validates against a JSON schema
+  (structured outputs, tool-call arguments).
+
+Standard library only, so both `runtime.standin` (aiohttp) and
+`runtime.stub_client` (Agent Framework) can use it.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from typing import Any
+
+_FILLER = (
+    "stand-in reply with plausible length so streaming, parsing and handoff costs "
+    "match a real model turn without calling one"
+).split()
+
+
+class LatencyModel:
+    """Millisecond latency distribution parsed from `kind:arg[:arg]`.
+
+    `fixed:MS`, `uniform:LO:HI`, `normal:MEAN:STDDEV` or `lognormal:MEDIAN:SIGMA`.
+    """
+
+    def __init__(self, spec: str = "fixed:0", *, seed: int | None = None) -> None:
+        kind, *raw = spec.split(":")
+        try:
+            args = [float(x) for x in raw]
+        except ValueError as ex:
+            raise ValueError(f"Invalid latency spec {spec!r}: arguments must be numbers") from ex
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(args) != expected[kind]:
+            raise ValueError(
+                f"Invalid latency spec {spec!r}; use fixed:MS, uniform:LO:HI, "
+                "normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA"
+            )
+        self.spec = spec
+        self._kind = kind
+        self._args = args
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        a = self._args
+        if self._kind == "fixed":
+            value = a[0]
+        elif self._kind == "uniform":
+            value = self._rng.uniform(a[0], a[1])
+        elif self._kind == "normal":
+            value = self._rng.gauss(a[0], a[1])
+        else:
+            value = a[0] * self._rng.lognormvariate(0.0, a[1])
+        return max(0.0, value)
+
+    def __repr__(self) -> str:
+        return f"LatencyModel({self.spec!r})"
+
+
+def reply_text(prompt: str, tokens: int) -> str:
+    """Deterministic reply of about `tokens` words that echoes the start of `prompt`."""
+
+    head = " ".join(prompt.split()[:12])
+    words = [f"Stand-in reply to: {head}."] if head else ["Stand-in reply."]
+    words.extend(itertools.islice(itertools.cycle(_FILLER), max(0, tokens - len(words[0].split()))))
+    return " ".join(words)
+
+
+def text_tokens(text: str) -> list[str]:
+    """Split `text` into word-sized stream chunks that concatenate back to it."""
+
+    parts = text.split(" ")
+    return [p + " " for p in parts[:-1]] + parts[-1:]
+
+
+def example_from_schema(schema: dict[str, Any], root: dict[str, Any] | None = None) -> Any:
+    """Build a small instance that satisfies `schema` (objects, arrays, enums, refs)."""
+
+    root = root or schema
+    if "$ref" in schema:
+        target: Any = root
+        for part in schema["$ref"].lstrip("#/").split("/"):
+            target = target[part]
+        return example_from_schema(target, root)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return example_from_schema(options[0], root)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {name: example_from_schema(sub, root) for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = max(1, int(schema.get("minItems", 1)))
+        return [example_from_schema(schema.get("items", {}), root) for _ in range(count)]
+    if kind == "integer":
+        return int(schema.get("minimum", 1))
+    if kind == "number":
+        return float(schema.get("minimum", 1.0))
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "stand-in"
@@ -0,0 +1,130 @@
+"""Opt-out console tracing for the demos, with the OTel SDK loaded on demand.
+
+`configure_demo_tracing()` replaces the module-level
+`try: from agent_framework.observability import ...` block each demo used to
+carry. Nothing from `agent_framework.observability` or `opentelemetry.sdk` is
+imported until it is called, and it is a no-op when `DEMO_TRACING` is
+`0` / `false` / `no` / `off`.
+
+Output is written off the export path by `DemoSpanExporter`:
+    DEMO_TRACING_FORMAT  `console` (default) or `jsonl`
+    DEMO_TRACING_FILE    append lines to this file instead of stdout
+    DEMO_TRACING_BUFFER  spans held for the writer before new ones are dropped
+
+`configure_latency_summary()` adds per-agent / per-tool latency histograms and
+prints p50/p90/p99 at exit (`DEMO_LATENCY_SUMMARY=0` turns just that off).
+"""
+
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+from typing import Any
+
+from .config import get_config
+
+_DISABLED_VALUES = {"0", "false", "no", "off"}
+
+_latency_lock = threading.Lock()
+_latency_processor: Any = None
+
+
+def tracing_enabled() -> bool:
+    return (get_config().get("DEMO_TRACING") or "1").lower() not in _DISABLED_VALUES
+
+
+def latency_summary_enabled() -> bool:
+    if not tracing_enabled():
+        return False
+    return (get_config().get("DEMO_LATENCY_SUMMARY") or "1").lower() not in _DISABLED_VALUES
+
+
+def configure_demo_tracing() -> bool:
+    """Emit concise OpenTelemetry lines for agent/tool spans.
+
+    Returns False (and skips) when tracing is disabled or OpenTelemetry isn't
+    available in this environment.
+    """
+
+    if not tracing_enabled():
+        return False
+    try:
+        from agent_framework.observability import configure_otel_providers
+
+        from .span_console import DemoSpanExporter
+    except Exception:  # pragma: no cover
+        return False
+
+    config = get_config()
+    fmt = (config.get("DEMO_TRACING_FORMAT") or "console").lower()
+    path = config.get("DEMO_TRACING_FILE")
+    capacity = config.get("DEMO_TRACING_BUFFER")
+    try:
+        exporter = DemoSpanExporter(
+            fmt=fmt,
+            stream=open(path, "a", encoding="utf-8") if path else None,  # noqa: SIM115 - lives until exit
+            **({"capacity": int(capacity)} if capacity else {}),
+        )
+    except (OSError, ValueError) as ex:
+        raise RuntimeError(
+            f"Invalid console tracing settings: {ex}. "
+            "Check DEMO_TRACING_FORMAT (console|jsonl), DEMO_TRACING_FILE and DEMO_TRACING_BUFFER, "
+            "or set DEMO_TRACING=0."
+        ) from ex
+
+    # configure_otel_providers wraps each span exporter in a BatchSpanProcessor.
+    configure_otel_providers(exporters=[exporter])
+    configure_latency_summary()
+    return True
+
+
+def _print_latency_summary(processor: Any) -> None:
+    if not len(processor.histograms):
+        return
+    from opentelemetry import trace
+
+    # Let queued span lines print first so the table comes last.
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        provider.force_flush()
+    print("\n" + processor.histograms.format_table(), file=sys.stderr)
+
+
+def configure_latency_summary() -> Any:
+    """Record agent/tool/executor span latencies and print a summary at exit.
+
+    Attaches a `LatencyHistogramProcessor` to the global SDK tracer provider
+    (setting one up via `configure_otel_providers()` if needed) and returns it,
+    so callers can read or merge `processor.histograms`. Safe to call twice;
+    returns None when disabled or OpenTelemetry isn't available.
+    """
+
+    global _latency_processor
+    if not latency_summary_enabled():
+        return None
+    with _latency_lock:
+        if _latency_processor is not None:
+            return _latency_processor
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.trace import TracerProvider
+
+            from .span_latency import LatencyHistogramProcessor
+        except Exception:  # pragma: no cover
+            return None
+
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            from agent_framework.observability import configure_otel_providers
+
+            configure_otel_providers()
+            provider = trace.get_tracer_provider()
+            if not isinstance(provider, TracerProvider):
+                return None
+
+        processor = LatencyHistogramProcessor()
+        provider.add_span_processor(processor)
+        atexit.register(_print_latency_summary, processor)
+        _latency_processor = processor
+        return processor
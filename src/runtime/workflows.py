@@ -0,0 +1,281 @@
+"""Event-planning workflow topologies shared by Demo 5, the DevUI entity and benchmarks.
+
+`build_event_planning_workflow()` wires the five agents in one of two shapes:
+
+- `chain` (default): coordinator -> venue -> catering -> budget_analyst -> booking.
+  Each specialist sees everything before it (catering sees the venue pick), and
+  wall time is the sum of every agent's latency.
+- `parallel`: the coordinator fans out to the independent specialists (venue
+  and catering), which run at the same time; a `SpecialistJoin` executor waits
+  for all of them and hands one merged conversation to budget_analyst -> booking.
+  Wall time for the specialist stage is the slowest specialist, not the sum.
+
+Select it with `WORKFLOW_TOPOLOGY=chain|parallel` (see `RuntimeConfig`).
+
+With a `handoff` policy (`WORKFLOW_HANDOFF`, see `runtime.handoff`) every edge
+into an agent goes through a `HandoffStage` that bounds the context passed on.
+With `routing` (`WORKFLOW_ROUTING=1`, see `runtime.routing`) a `SpecialistRouter`
+after the coordinator skips specialists the request does not need, and the
+edges after it are conditional. With a `speculation` policy
+(`WORKFLOW_SPECULATION=1`, see `runtime.speculation`) the chain starts later
+specialists on the coordinator's plan while the earlier ones run.
+
+Imports Agent Framework at top level, so it is not re-exported from `runtime`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence
+
+from agent_framework import (
+    AgentExecutorRequest,
+    AgentExecutorResponse,
+    AgentResponse,
+    Case,
+    Default,
+    Executor,
+    Message,
+    Workflow,
+    WorkflowBuilder,
+    WorkflowContext,
+    handler,
+)
+
+from .routing import SpecialistRouter
+
+if TYPE_CHECKING:
+    from .handoff import HandoffPolicy
+    from .speculation import SpeculationPolicy
+
+CHAIN = "chain"
+PARALLEL = "parallel"
+TOPOLOGIES = (CHAIN, PARALLEL)
+
+WORKFLOW_NAME = "Event Planning Workflow"
+JOIN_EXECUTOR_ID = "specialists_join"
+INTAKE_EXECUTOR_ID = "intake"
+
+
+class PromptIntake(Executor):
+    """Start executor that forwards the prompt to the coordinator.
+
+    Agent Framework runs the start executor before it begins streaming events,
+    so a coordinator in that position reaches the caller in one burst once it
+    has finished. Behind this pass-through it streams (and can be timed) like
+    every other agent.
+    """
+
+    def __init__(self, id: str = INTAKE_EXECUTOR_ID) -> None:
+        super().__init__(id=id)
+
+    @handler
+    async def forward(self, prompt: str, ctx: WorkflowContext[AgentExecutorRequest]) -> None:
+        await ctx.send_message(AgentExecutorRequest(messages=[Message("user", [prompt])], should_respond=True))
+
+
+class SpecialistJoin(Executor):
+    """Fan-in point: merge the specialists' responses into one conversation.
+
+    The merged `AgentExecutorResponse` carries the shared prefix (prompt and
+    coordinator plan) once, followed by each specialist's reply in `order`,
+    so the next agent receives it through its normal `from_response` handler.
+
+    With a `router`, specialists reach the join over plain edges (a fan-in
+    edge group would wait for skipped ones too); it merges once every
+    specialist the router selected has replied.
+    """
+
+    def __init__(
+        self,
+        order: Sequence[str],
+        id: str = JOIN_EXECUTOR_ID,
+        router: SpecialistRouter | None = None,
+    ) -> None:
+        super().__init__(id=id)
+        self._order = {name: i for i, name in enumerate(order)}
+        self._router = router
+        # The selected specialists share a superstep, so their replies arrive together
+        # and this never has to survive a checkpoint. Replies left by a failed run
+        # belong to an older router decision and are dropped.
+        self._pending: list[AgentExecutorResponse] = []
+        self._decision = 0
+
+    @handler
+    async def join(
+        self,
+        responses: list[AgentExecutorResponse],
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        await self._merge(responses, ctx)
+
+    @handler
+    async def collect(
+        self,
+        response: AgentExecutorResponse,
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        if self._router is not None and self._decision != self._router.decisions:
+            self._pending, self._decision = [], self._router.decisions
+        self._pending.append(response)
+        if self._router is None or len(self._pending) >= len(self._router.selected):
+            responses, self._pending = self._pending, []
+            await self._merge(responses, ctx)
+
+    async def _merge(
+        self,
+        responses: list[AgentExecutorResponse],
+        ctx: WorkflowContext[AgentExecutorResponse],
+    ) -> None:
+        ranked = sorted(responses, key=lambda r: self._order.get(r.executor_id, len(self._order)))
+        # Every specialist started from the same coordinator conversation.
+        first = ranked[0]
+        prefix = first.full_conversation[: len(first.full_conversation) - len(first.agent_response.messages)]
+        messages = [m for r in ranked for m in r.agent_response.messages]
+        await ctx.send_message(
+            AgentExecutorResponse(
+                executor_id=self.id,
+                agent_response=AgentResponse(messages=messages),
+                full_conversation=[*prefix, *messages],
+            )
+        )
+
+
+def _name(agent: Any) -> str:
+    return getattr(agent, "name", None) or getattr(agent, "id", "")
+
+
+def _executor_id(node: Any) -> str:
+    return node.id if isinstance(node, Executor) else _name(node)
+
+
+def _routes_to(router: SpecialistRouter, source: str | None, target: str) -> Any:
+    """Edge condition: `target` is the next specialist the router selected after `source`."""
+
+    def condition(_message: Any) -> bool:
+        return router.next_after(source) == target
+
+    condition.__name__ = f"routes_to_{target}"
+    return condition
+
+
+def build_event_planning_workflow(
+    coordinator: Any,
+    specialists: Sequence[Any],
+    budget_analyst: Any,
+    booking: Any,
+    *,
+    topology: str = CHAIN,
+    handoff: HandoffPolicy | None = None,
+    routing: bool = False,
+    speculation: SpeculationPolicy | None = None,
+    stream_agents: bool = False,
+) -> Workflow:
+    """Build the event-planning workflow from agents (or executors) in the given topology.
+
+    `specialists` are the agents between the coordinator and the budget analyst,
+    in chain order (e.g. `[venue, catering]`). With `handoff`, a `HandoffStage`
+    sits on every edge into an agent; with `routing`, a `SpecialistRouter` decides
+    which specialists run; with `speculation`, specialists after the first start
+    early (chain topology only; the parallel one already overlaps them). Only
+    booking's streamed updates reach the caller as `output` events unless
+    `stream_agents` makes every agent an output executor, behind a
+    `PromptIntake` start executor (see `runtime.executor_timing`).
+    """
+
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown workflow topology {topology!r}; use one of: {', '.join(TOPOLOGIES)}")
+    if not specialists:
+        raise ValueError("At least one specialist is required.")
+    if routing and speculation is not None and topology == CHAIN:
+        raise ValueError("Speculation and routing cannot be combined in the chain topology; pick one.")
+
+    if speculation is not None and topology == CHAIN:
+        from .speculation import SpeculativeAgentExecutor
+
+        # Later specialists also hear from the coordinator, which starts their speculation.
+        specialists = [
+            specialists[0],
+            *(SpeculativeAgentExecutor(s, speculate_from=_name(coordinator), policy=speculation)
+              for s in specialists[1:]),
+        ]
+    agents = [coordinator, *specialists, budget_analyst, booking]
+
+    # Agent Framework 1.2.2 requires `start_executor` and `output_executors` at builder construction.
+    intake = PromptIntake() if stream_agents else None
+    builder = WorkflowBuilder(
+        name=WORKFLOW_NAME,
+        max_iterations=30,
+        start_executor=intake or coordinator,
+        # Executors that declare no workflow output (e.g. speculative ones) cannot be output executors.
+        output_executors=[
+            a for a in agents if not isinstance(a, Executor) or a.workflow_output_types
+        ] if stream_agents else [booking],
+    )
+    if intake is not None:
+        builder.add_edge(intake, coordinator)
+
+    stages: dict[str, Any] = {}
+
+    def inbound(target: Any) -> Any:
+        """Where edges into `target` land: the target itself, or its (single) handoff stage."""
+
+        if handoff is None:
+            return target
+        name = _name(target)
+        if name not in stages:
+            from .handoff import HandoffStage
+
+            stages[name] = HandoffStage(name, handoff)
+            builder.add_edge(stages[name], target)
+        return stages[name]
+
+    names = [_name(s) for s in specialists]
+    router = SpecialistRouter(names) if routing else None
+
+    if topology == CHAIN and router is None:
+        if speculation is not None:
+            for specialist in specialists[1:]:
+                builder.add_edge(coordinator, inbound(specialist))
+        for upstream, downstream in zip(agents, agents[1:]):
+            builder.add_edge(upstream, inbound(downstream))
+        if speculation is not None:
+            from .speculation import cancel_speculations_after_runs
+
+            return cancel_speculations_after_runs(builder.build())
+        return builder.build()
+
+    if topology == CHAIN:
+        # From the router and from each specialist: on to the next selected specialist,
+        # or straight to the budget analyst when none is left.
+        builder.add_edge(coordinator, router)
+        for i, source in enumerate([router, *specialists]):
+            origin = None if source is router else names[i - 1]
+            cases = [Case(_routes_to(router, origin, names[j]), inbound(s)) for j, s in enumerate(specialists) if j >= i]
+            if cases:
+                builder.add_switch_case_edge_group(source, [*cases, Default(inbound(budget_analyst))])
+            else:
+                builder.add_edge(source, inbound(budget_analyst))
+        builder.add_edge(budget_analyst, inbound(booking))
+        return builder.build()
+
+    if router is None:
+        join = SpecialistJoin(names)
+        builder.add_fan_out_edges(coordinator, [inbound(s) for s in specialists])
+        builder.add_fan_in_edges(list(specialists), join)
+    else:
+        join = SpecialistJoin(names, router=router)
+        targets = {name: _executor_id(inbound(s)) for name, s in zip(names, specialists)}
+        skip_all = _executor_id(inbound(budget_analyst))
+
+        def select(_message: Any, _targets: list[str]) -> list[str]:
+            return [targets[name] for name in router.selected] or [skip_all]
+
+        builder.add_edge(coordinator, router)
+        builder.add_multi_selection_edge_group(
+            router, [*(inbound(s) for s in specialists), inbound(budget_analyst)], select
+        )
+        for specialist in specialists:
+            builder.add_edge(specialist, join)
+    builder.add_edge(join, inbound(budget_analyst))
+    builder.add_edge(budget_analyst, inbound(booking))
+    return builder.build()
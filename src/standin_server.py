@@ -0,0 +1,69 @@
+"""Run a local Foundry / Azure OpenAI stand-in server for offline load and latency tests.
+
+Start the server, then point any demo or DevUI entity at it:
+
+    python3 src/standin_server.py --latency lognormal:400:0.4 --tokens-per-sec 60
+    LOCAL_STANDIN_URL=http://127.0.0.1:8765 python3 -u src/demo1_run_agent.py
+
+With `LOCAL_STANDIN_URL` set, the Foundry and Azure OpenAI endpoints, auth and
+(when unset) model names come from the stand-in, and no `az login` is needed.
+See `src/runtime/standin.py` for what is emulated.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from runtime.standin import LatencyModel, StandInServer, StandInSettings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Time to first token in ms: fixed:MS, uniform:LO:HI, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA.",
+    )
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Streaming rate (0 = no pacing).")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Length of generated text replies.")
+    parser.add_argument(
+        "--tool-call-turns",
+        type=int,
+        default=0,
+        help="Answer the first N turns of a request that carries function tools with a tool call.",
+    )
+    parser.add_argument("--canned", type=Path, help="JSON file mapping response-format schema names to outputs.")
+    parser.add_argument("--seed", type=int, help="Seed for the latency distribution.")
+    args = parser.parse_args()
+
+    try:
+        latency = LatencyModel(args.latency, seed=args.seed)
+    except ValueError as ex:
+        parser.error(str(ex))
+    canned = json.loads(args.canned.read_text(encoding="utf-8")) if args.canned else {}
+    settings = StandInSettings(
+        latency=latency,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+        tool_call_turns=args.tool_call_turns,
+        canned=canned,
+    )
+
+    server = await StandInServer(settings).start(args.host, args.port)
+    print(f"Stand-in server listening on {server.url}")
+    print(f"  export LOCAL_STANDIN_URL={server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(f"Served {server.requests} request(s).")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass